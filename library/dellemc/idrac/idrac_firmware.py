@@ -174,6 +174,41 @@ update_status:
         'JobStartTime': 'NA',
         'Status': 'Success',
     }
+perf:
+  description:
+    - Summary of the HTTP requests made by the module, with the bytes sent and received, the time spent
+      connecting, waiting for the first byte, reading and decoding the responses, and the slowest requests.
+    - The records of all the requests are appended to the JSONL file named by the DELLEMC_PERF_TRACE
+      environment variable, when it is set.
+  returned: when the DELLEMC_PERF or DELLEMC_PERF_TRACE environment variable is set
+  type: dict
+  sample: {
+    "requests": 4,
+    "retries": 0,
+    "bytes_sent": 512,
+    "bytes_received": 20480,
+    "connect_ms": 12.1,
+    "first_byte_ms": 310.5,
+    "read_ms": 20.2,
+    "decode_ms": 1.3,
+    "total_ms": 344.1,
+    "slowest": [{
+      "client": "idrac",
+      "host": "192.168.0.1",
+      "method": "POST",
+      "path": "/redfish/v1/Dell/Systems/System.Embedded.1/DellSoftwareInstallationService",
+      "status": 200,
+      "sent": 512,
+      "received": 2048,
+      "retries": 0,
+      "start": 1591005600.0,
+      "connect_ms": 4.1,
+      "first_byte_ms": 200.3,
+      "read_ms": 2.2,
+      "decode_ms": 0.4,
+      "total_ms": 207.0
+    }]
+  }
 """
 
 
@@ -184,7 +219,7 @@ import json
 from xml.etree import ElementTree as ET
 from ansible.module_utils.remote_management.dellemc.dellemc_idrac import iDRACConnection
 from ansible.module_utils.remote_management.dellemc.idrac_redfish import iDRACRedfishAPI
-from ansible.module_utils.basic import AnsibleModule
+from ansible.module_utils.remote_management.dellemc.perf import PerfAnsibleModule
 from ansible.module_utils.six.moves.urllib.parse import urlparse
 from ansible.module_utils.urls import open_url, ConnectionError, SSLValidationError
 from ansible.module_utils.six.moves.urllib.error import URLError, HTTPError
@@ -337,7 +372,7 @@ def update_firmware(idrac, module):
 
 
 def main():
-    module = AnsibleModule(
+    module = PerfAnsibleModule(
         argument_spec={
             "idrac_ip": {"required": True, "type": 'str'},
             "idrac_user": {"required": True, "type": 'str'},
@@ -227,12 +227,47 @@ error_info:
       "message": "A general error has occurred. See ExtendedInfo for more information"
     }
   }
+perf:
+  description:
+    - Summary of the HTTP requests made by the module, with the bytes sent and received, the time spent
+      connecting, waiting for the first byte, reading and decoding the responses, and the slowest requests.
+    - The records of all the requests are appended to the JSONL file named by the DELLEMC_PERF_TRACE
+      environment variable, when it is set.
+  returned: when the DELLEMC_PERF or DELLEMC_PERF_TRACE environment variable is set
+  type: dict
+  sample: {
+    "requests": 4,
+    "retries": 0,
+    "bytes_sent": 512,
+    "bytes_received": 20480,
+    "connect_ms": 12.1,
+    "first_byte_ms": 310.5,
+    "read_ms": 20.2,
+    "decode_ms": 1.3,
+    "total_ms": 344.1,
+    "slowest": [{
+      "client": "redfish",
+      "host": "192.168.0.1",
+      "method": "POST",
+      "path": "/redfish/v1/Dell/Systems/System.Embedded.1/DellRaidService/Actions/DellRaidService.AssignSpare",
+      "status": 200,
+      "sent": 512,
+      "received": 2048,
+      "retries": 0,
+      "start": 1591005600.0,
+      "connect_ms": 4.1,
+      "first_byte_ms": 200.3,
+      "read_ms": 2.2,
+      "decode_ms": 0.4,
+      "total_ms": 207.0
+    }]
+  }
 '''
 
 
 import json
 from ansible.module_utils.remote_management.dellemc.redfish import Redfish
-from ansible.module_utils.basic import AnsibleModule
+from ansible.module_utils.remote_management.dellemc.perf import PerfAnsibleModule
 from ansible.module_utils.six.moves.urllib.error import URLError, HTTPError
 from ansible.module_utils.urls import ConnectionError, SSLValidationError
 
@@ -264,16 +299,16 @@ def check_id_exists(module, redfish_obj, item_id, uri):
 def check_volume_array_exists(module, redfish_obj):
     volume_array = module.params.get("volume_id")
     msg = "Unable to locate the virtual disk with the ID: {vol}"
-    for vol in volume_array:
-        try:
-            resp = redfish_obj.invoke_request('GET', VOLUME_ID_URI.format(system_id=SYSTEM_ID, id=vol))
-            if not resp.success:
-                module.fail_json(msg=msg.format(vol=vol))
-        except HTTPError as err:
-            module.fail_json(msg=msg.format(vol=vol), error_info=json.load(err))
-        except (RuntimeError, URLError, SSLValidationError, ConnectionError, KeyError, ImportError,
-                ValueError, TypeError) as err:
-            module.fail_json(msg=str(err))
+    try:
+        volumes = redfish_obj.get_resources(VOLUME_ID_URI.format(system_id=SYSTEM_ID, id=vol) for vol in volume_array)
+    except HTTPError as err:
+        module.fail_json(msg=msg.format(vol=",".join(volume_array)), error_info=json.load(err))
+    except (RuntimeError, URLError, SSLValidationError, ConnectionError, KeyError, ImportError,
+            ValueError, TypeError) as err:
+        module.fail_json(msg=str(err))
+    for vol, volume in zip(volume_array, volumes):
+        if volume is None:
+            module.fail_json(msg=msg.format(vol=vol))
 
 
 def check_raid_service(module, redfish_obj):
@@ -326,7 +361,7 @@ def main():
         'RemoveControllerKey': ["controller_id"],
         'ReKey': ["controller_id", "mode"]
     }
-    module = AnsibleModule(
+    module = PerfAnsibleModule(
         argument_spec={
             "baseuri": {"required": True, "type": 'str'},
             "username": {"required": True, "type": 'str'},
@@ -44,8 +44,38 @@ options:
   job_id:
     description: Unique ID of the job
     type: int
+  job_ids:
+    description:
+      - List of job IDs to fetch.
+      - The jobs are fetched with as few requests as possible by combining the IDs into C($filter) queries.
+      - I(job_ids) is mutually exclusive with I(job_id) and I(system_query_options).
+    type: list
+    elements: int
+  job_wait:
+    description:
+      - Wait until all the jobs in I(job_ids) reach a terminal state.
+      - Only the status of the jobs still running is polled, with an interval that backs off from 2 to 30 seconds.
+      - This is applicable only when I(job_ids) is provided.
+    type: bool
+    default: false
+  job_wait_timeout:
+    description:
+      - Maximum time in seconds to wait for the jobs when I(job_wait) is C(true).
+      - The module fails if any job is still running when the timeout expires.
+    type: int
+    default: 3600
+  cursor_file:
+    description:
+      - Path of a local state file used to fetch only the jobs which ran or changed since the previous run.
+      - The newest C(LastRun) or C(UpdatedDate) seen is persisted per user, appliance and filter, and the job
+        collection is paged through automatically. The first run returns all the jobs.
+      - Only I(filter) of I(system_query_options) is applied in this mode.
+      - I(cursor_file) is mutually exclusive with I(job_id) and I(job_ids).
+    type: path
   system_query_options:
-    description: Options for pagination of the output
+    description:
+      - Options for pagination of the output
+      - When neither I(top) nor I(skip) is specified, all the pages of the job collection are fetched.
     type: dict
     suboptions:
       top:
@@ -57,6 +87,14 @@ options:
       filter:
         description: Filter records by the values supported.
         type: str
+      select:
+        description: List of job properties to return, applied on the server with C($select).
+        type: list
+        elements: str
+  max_items:
+    description:
+      - Maximum number of jobs to return when all the pages of the job collection are fetched.
+    type: int
 requirements:
     - "python >= 2.7.5"
 author: "Jagadeesh N V(@jagadeeshnv)"
@@ -88,6 +126,45 @@ EXAMPLES = r'''
       skip: 1
       filter: "JobType/Id eq 8"
 
+- name: Get the name and status of the latest 500 jobs.
+  dellemc_ome_job_facts:
+    hostname:  "192.168.0.1"
+    username: "username"
+    password:  "password"
+    system_query_options:
+      select:
+        - Id
+        - JobName
+        - LastRunStatus
+    max_items: 500
+
+- name: Get job details for a list of ids.
+  dellemc_ome_job_facts:
+    hostname:  "192.168.0.1"
+    username: "username"
+    password:  "password"
+    job_ids:
+      - 12345
+      - 12346
+
+- name: Wait until all the jobs reach a terminal state.
+  dellemc_ome_job_facts:
+    hostname:  "192.168.0.1"
+    username: "username"
+    password:  "password"
+    job_ids: "{{ update_job_ids }}"
+    job_wait: true
+    job_wait_timeout: 7200
+
+- name: Get the jobs which ran or changed since the previous run.
+  dellemc_ome_job_facts:
+    hostname:  "192.168.0.1"
+    username: "username"
+    password:  "password"
+    cursor_file: "~/.ansible/ome_job_cursor.json"
+    system_query_options:
+      filter: "JobType/Id eq 5"
+
 '''
 
 RETURN = r'''
@@ -144,11 +221,72 @@ job_facts:
       "Visible": true
     }
   ]}
+job_summary:
+  description: Aggregate outcome of the jobs requested with I(job_ids).
+  returned: when I(job_ids) is provided
+  type: dict
+  sample: {
+    "total": 3,
+    "status_counts": {
+      "Completed": 2,
+      "Failed": 1
+    },
+    "missing": [],
+    "pending": [],
+    "failed": [12346],
+    "timed_out": false,
+    "polls": 6,
+    "elapsed_seconds": 84.2
+  }
+job_cursor:
+  description: Cursor of the incremental job feed before and after the run, and the number of jobs returned.
+  returned: when I(cursor_file) is provided
+  type: dict
+  sample: {
+    "previous": "2020-06-01 10:00:00.111",
+    "current": "2020-06-01 10:05:12.345",
+    "changed": 4
+  }
+perf:
+  description:
+    - Summary of the HTTP requests made by the module, with the bytes sent and received, the time spent
+      connecting, waiting for the first byte, reading and decoding the responses, and the slowest requests.
+    - The records of all the requests are appended to the JSONL file named by the DELLEMC_PERF_TRACE
+      environment variable, when it is set.
+  returned: when the DELLEMC_PERF or DELLEMC_PERF_TRACE environment variable is set
+  type: dict
+  sample: {
+    "requests": 4,
+    "retries": 0,
+    "bytes_sent": 512,
+    "bytes_received": 20480,
+    "connect_ms": 12.1,
+    "first_byte_ms": 310.5,
+    "read_ms": 20.2,
+    "decode_ms": 1.3,
+    "total_ms": 344.1,
+    "slowest": [{
+      "client": "ome",
+      "host": "192.168.0.1",
+      "method": "GET",
+      "path": "/api/JobService/Jobs?%24filter=Id+eq+10",
+      "status": 200,
+      "sent": 512,
+      "received": 2048,
+      "retries": 0,
+      "start": 1591005600.0,
+      "connect_ms": 4.1,
+      "first_byte_ms": 200.3,
+      "read_ms": 2.2,
+      "decode_ms": 0.4,
+      "total_ms": 207.0
+    }]
+  }
 '''
 
 import json
-from ansible.module_utils.basic import AnsibleModule
-from ansible.module_utils.remote_management.dellemc.ome import RestOME
+from ansible.module_utils.remote_management.dellemc.ome import RestOME, JobTracker
+from ansible.module_utils.remote_management.dellemc.perf import PerfAnsibleModule
 from ansible.module_utils.six.moves.urllib.error import URLError, HTTPError
 from ansible.module_utils.urls import ConnectionError, SSLValidationError
 
@@ -162,49 +300,96 @@ def _get_query_parameters(module_params):
     system_query_options_param = module_params.get("system_query_options")
     query_parameter = {}
     if system_query_options_param:
-        query_parameter = {'$' + k: v for k, v in system_query_options_param.items() if v is not None}
+        query_parameter = {'$' + k: v for k, v in system_query_options_param.items()
+                           if v is not None and k != "select"}
     return query_parameter
 
 
+def get_jobs_facts(module, rest_obj):
+    """Fetches the jobs in job_ids, optionally waiting until all of them reach a terminal state."""
+    job_ids = []
+    for job_id in module.params["job_ids"]:
+        if job_id not in job_ids:
+            job_ids.append(job_id)
+    tracker = JobTracker(rest_obj)
+    if module.params.get("job_wait"):
+        jobs, summary = tracker.wait_all(job_ids, timeout=module.params["job_wait_timeout"])
+    else:
+        jobs = tracker.get_jobs(job_ids)
+        summary = tracker.summarize(job_ids, jobs)
+    job_facts = {"value": [jobs[job_id] for job_id in job_ids if job_id in jobs]}
+    if summary.get("timed_out"):
+        module.fail_json(msg="Timed out after {0} seconds waiting for the jobs to complete."
+                         .format(module.params["job_wait_timeout"]), job_facts=job_facts, job_summary=summary)
+    module.exit_json(msg="Successfully fetched the job facts", job_facts=job_facts, job_summary=summary)
+
+
+def get_changed_jobs_facts(module, rest_obj):
+    """Fetches the jobs which changed since the cursor kept in cursor_file."""
+    query_filter = (module.params.get("system_query_options") or {}).get("filter")
+    jobs, cursor = JobTracker(rest_obj).get_changed_jobs(module.params["cursor_file"], query_filter=query_filter)
+    module.exit_json(msg="Successfully fetched the job facts", job_facts={"value": jobs}, job_cursor=cursor)
+
+
 def main():
-    module = AnsibleModule(
+    module = PerfAnsibleModule(
         argument_spec={
             "hostname": {"required": True, "type": 'str'},
             "username": {"required": True, "type": 'str'},
             "password": {"required": True, "type": 'str', "no_log": True},
             "port": {"required": False, "type": 'int', "default": 443},
             "job_id": {"required": False, "type": 'int'},
+            "job_ids": {"required": False, "type": 'list', "elements": 'int'},
+            "job_wait": {"required": False, "type": 'bool', "default": False},
+            "job_wait_timeout": {"required": False, "type": 'int', "default": 3600},
+            "cursor_file": {"required": False, "type": 'path'},
             "system_query_options": {"required": False, "type": 'dict', "options": {
                 "top": {"type": 'int', "required": False},
                 "skip": {"type": 'int', "required": False},
                 "filter": {"type": 'str', "required": False},
+                "select": {"type": 'list', "elements": 'str', "required": False},
             }},
+            "max_items": {"required": False, "type": 'int'},
         },
+        mutually_exclusive=[["job_id", "job_ids"], ["job_ids", "system_query_options"],
+                            ["cursor_file", "job_id"], ["cursor_file", "job_ids"]],
         supports_check_mode=False
     )
     joburi = "JobService/Jobs"
-    resp = None
+    status_code = None
+    if module.params.get("job_wait") and not module.params.get("job_ids"):
+        module.fail_json(msg="job_ids is required when job_wait is true.")
     try:
         with RestOME(module.params, req_session=True) as rest_obj:
+            if module.params.get("job_ids"):
+                get_jobs_facts(module, rest_obj)
+            if module.params.get("cursor_file"):
+                get_changed_jobs_facts(module, rest_obj)
             if module.params.get("job_id") is not None:
                 # Fetch specific job
                 job_id = module.params.get("job_id")
                 jpath = "{0}({1})".format(joburi, job_id)
-                query_param = None
+                resp = rest_obj.invoke_request('GET', jpath)
+                job_facts, status_code = resp.json_data, resp.status_code
             else:
                 # Fetch all jobs, filter and pagination options
                 # query applicable only for all jobs list fetching
                 query_param = _get_query_parameters(module.params)
-                jpath = joburi
-            resp = rest_obj.invoke_request('GET', jpath, query_param=query_param)
-            job_facts = resp.json_data
+                select = (module.params.get("system_query_options") or {}).get("select")
+                if "$top" in query_param or "$skip" in query_param:
+                    resp = rest_obj.invoke_request('GET', joburi, query_param=query_param, select=select)
+                    job_facts, status_code = resp.json_data, resp.status_code
+                else:
+                    job_facts = rest_obj.get_collection(joburi, query_param=query_param, select=select,
+                                                        max_items=module.params.get("max_items"))
+                    status_code = 200
     except HTTPError as httperr:
         module.fail_json(msg=str(httperr), job_facts=json.load(httperr))
     except (URLError, SSLValidationError, ConnectionError, TypeError, ValueError) as err:
         module.fail_json(msg=str(err))
 
     # check for 200 status as GET only returns this for success
-    if resp and resp.status_code == 200:
+    if status_code == 200:
         module.exit_json(msg="Successfully fetched the job facts", job_facts=job_facts)
     else:
         module.fail_json(msg="Failed to fetch the job facts")
@@ -26,6 +26,8 @@ short_description: Retrieves the information of devices inventoried by OpenManag
 version_added: "2.9"
 description:
    - This module retrieves the list of devices in the inventory of OpenManage Enterprise along with the details of each device.
+   - When the C(OME_INVENTORY_CACHE) environment variable names a directory, the I(basic_inventory) device list is
+     cached there per appliance and user, and later runs fetch only the devices which changed since the previous run.
 options:
     hostname:
         description:
@@ -205,10 +207,45 @@ device_info:
         }
     ]
   }
+perf:
+  description:
+    - Summary of the HTTP requests made by the module, with the bytes sent and received, the time spent
+      connecting, waiting for the first byte, reading and decoding the responses, and the slowest requests.
+    - The records of all the requests are appended to the JSONL file named by the DELLEMC_PERF_TRACE
+      environment variable, when it is set.
+  returned: when the DELLEMC_PERF or DELLEMC_PERF_TRACE environment variable is set
+  type: dict
+  sample: {
+    "requests": 4,
+    "retries": 0,
+    "bytes_sent": 512,
+    "bytes_received": 20480,
+    "connect_ms": 12.1,
+    "first_byte_ms": 310.5,
+    "read_ms": 20.2,
+    "decode_ms": 1.3,
+    "total_ms": 344.1,
+    "slowest": [{
+      "client": "ome",
+      "host": "192.168.0.1",
+      "method": "GET",
+      "path": "/api/DeviceService/Devices?%24top=100&%24skip=100",
+      "status": 200,
+      "sent": 512,
+      "received": 2048,
+      "retries": 0,
+      "start": 1591005600.0,
+      "connect_ms": 4.1,
+      "first_byte_ms": 200.3,
+      "read_ms": 2.2,
+      "decode_ms": 0.4,
+      "total_ms": 207.0
+    }]
+  }
 '''
 
-from ansible.module_utils.basic import AnsibleModule
 from ansible.module_utils.remote_management.dellemc.ome import RestOME
+from ansible.module_utils.remote_management.dellemc.perf import PerfAnsibleModule
 from ansible.module_utils.six.moves.urllib.error import URLError, HTTPError
 from ansible.module_utils.urls import ConnectionError, SSLValidationError
 
@@ -227,29 +264,6 @@ DEVICE_RESOURCE_COLLECTION = {
 }
 
 
-def update_device_details_with_filtering(missing_service_tags, service_tag_dict, rest_obj):
-    """
-    This is a workaround solutions.
-    Use filtering query, in case fetching all report list fails for some reason.
-    Updates service_tag_dict if filtering request is success.
-    :param missing_service_tags:  Service tags which are unable to fetch from pagination request.
-    :param service_tag_dict: this contains device id mapping with tags
-    :param rest_obj: ome connection object
-    :return: None.
-    """
-    try:
-        for tag in missing_service_tags:
-            query = "DeviceServiceTag eq '{0}'".format(tag)
-            query_param = {"$filter": query}
-            resp = rest_obj.invoke_request('GET', DEVICE_RESOURCE_COLLECTION[DEVICE_LIST]["resource"], query_param=query_param)
-            value = resp.json_data["value"]
-            if value and value[0]["DeviceServiceTag"] == tag:
-                service_tag_dict.update({value[0]["Id"]: value[0]["DeviceServiceTag"]})
-                missing_service_tags.remove(tag)
-    except (URLError, HTTPError, SSLValidationError, ConnectionError, TypeError, ValueError) as err:
-        raise err
-
-
 def _get_device_id_from_service_tags(service_tags, rest_obj):
     """
     Get device ids from device service tag
@@ -258,14 +272,8 @@ def _get_device_id_from_service_tags(service_tags, rest_obj):
     :arg rest_obj: RestOME class object in case of request with session.
     :returns: dict eg: {1345:"MXL1245"}
     """
-    device_list = rest_obj.get_all_report_details(DEVICE_RESOURCE_COLLECTION[DEVICE_LIST]["resource"])["report_list"]
-    service_tag_dict = {}
-    for item in device_list:
-        if item["DeviceServiceTag"] in service_tags:
-            service_tag_dict.update({item["Id"]: item["DeviceServiceTag"]})
-    available_service_tags = service_tag_dict.values()
-    missing_service_tags = list(set(service_tags) - set(available_service_tags))
-    update_device_details_with_filtering(missing_service_tags, service_tag_dict, rest_obj)
+    devices, missing_service_tags = rest_obj.resolve_devices(service_tags=service_tags)
+    service_tag_dict = dict((device["Id"], device["DeviceServiceTag"]) for device in devices.values())
     device_fact_error_report.update(dict((tag, DESC_HTTP_ERROR) for tag in missing_service_tags))
     return service_tag_dict
 
@@ -382,7 +390,7 @@ def main():
         "filter": {"type": 'str', "required": False},
     }}
 
-    module = AnsibleModule(
+    module = PerfAnsibleModule(
         argument_spec={
             "hostname": {"required": True, "type": 'str'},
             "username": {"required": True, "type": 'str'},
@@ -398,7 +406,7 @@ def main():
 
     try:
         _validate_inputs(module.params)
-        with RestOME(module.params, req_session=True) as rest_obj:
+        with RestOME(module.params, req_session=True, keep_alive=True) as rest_obj:
             device_facts = _get_resource_parameters(module.params, rest_obj)
             resp_status = []
             if device_facts.get("basic_inventory"):
@@ -408,10 +416,7 @@ def main():
                     device_facts = resp.json_data
                     resp_status.append(resp.status_code)
                 else:
-                    device_report = rest_obj.get_all_report_details(DEVICE_RESOURCE_COLLECTION[DEVICE_LIST]["resource"])
-                    device_facts = {"@odata.context": device_report["resp_obj"].json_data["@odata.context"],
-                                    "@odata.count": len(device_report["report_list"]),
-                                    "value": device_report["report_list"]}
+                    device_facts = rest_obj.get_device_inventory()
                     if device_facts["@odata.count"] > 0:
                         resp_status.append(200)
                     else:
@@ -60,9 +60,57 @@ options:
       - I(device_group_names) is mutually exclusive with I(device_id) and I(device_service_tag).
     type: list
   dup_file:
-    description: "Executable file to apply on the targets."
+    description:
+      - "Executable file to apply on the targets."
+      - The file is streamed to the appliance in chunks, with a timeout which grows with the size of the file.
     required: true
     type: str
+  upload_progress:
+    description:
+      - Include the progress of the DUP upload in the result as I(upload_progress).
+    type: bool
+    default: false
+  dup_upload_index:
+    description:
+      - Path of a local index of the DUPs uploaded to OME appliances, which maps the SHA-256 of each
+        package and the appliance to the file token returned by the upload.
+      - When the index has a token for I(dup_file) and I(hostname), the upload is skipped and the token
+        is used for the applicability report. The DUP is uploaded again when the appliance rejects the token.
+      - The index is created with permissions for its owner only.
+    type: path
+  job_wait:
+    description:
+      - Wait for the firmware update job to reach a terminal state within the same session.
+      - The job is polled with an interval that starts at 2 seconds and backs off to 60 seconds.
+      - The module fails if the job does not complete successfully or times out.
+    type: bool
+    default: false
+  job_wait_timeout:
+    description:
+      - Maximum time in seconds to wait for the job when I(job_wait) is C(true).
+    type: int
+    default: 3600
+  batch_size:
+    description:
+      - Number of devices updated by each wave of a rolling update.
+      - When given, the applicable components are split into waves of I(batch_size) devices with one
+        update job per wave, and the module waits for all the waves within the same session.
+      - I(job_wait_timeout) is the maximum time of the whole rolling update and I(job_wait) is not used.
+    type: int
+  max_concurrent_jobs:
+    description:
+      - Maximum number of wave jobs running at the same time during a rolling update.
+      - Applicable when I(batch_size) is given.
+    type: int
+    default: 1
+  max_failure_percentage:
+    description:
+      - Percentage of the targeted devices which may fail before the rolling update stops submitting waves.
+      - A device fails when the job of its wave does not complete successfully. The waves already
+        running when the threshold is crossed are tracked to a terminal state.
+      - Applicable when I(batch_size) is given.
+    type: int
+    default: 0
 requirements:
     - "python >= 2.7.5"
 author:
@@ -99,6 +147,30 @@ EXAMPLES = r'''
     device_group_names:
       - servers
     dup_file: "/path/BIOS_87V69_WN64_2.4.7.EXE"
+
+- name: "Update firmware from DUP file and wait for the job to complete."
+  ome_firmware:
+    hostname: "192.168.0.1"
+    username: "username"
+    password: "password"
+    device_service_tag:
+      - KLBR111
+    dup_file: "/path/BIOS_87V69_WN64_2.4.7.EXE"
+    job_wait: true
+    job_wait_timeout: 7200
+
+- name: "Rolling firmware update of a device group, 50 devices at a time with two waves running."
+  ome_firmware:
+    hostname: "192.168.0.1"
+    username: "username"
+    password: "password"
+    device_group_names:
+      - servers
+    dup_file: "/path/BIOS_87V69_WN64_2.4.7.EXE"
+    batch_size: 50
+    max_concurrent_jobs: 2
+    max_failure_percentage: 10
+    job_wait_timeout: 86400
 '''
 
 RETURN = r'''
@@ -111,7 +183,7 @@ msg:
 update_status:
   type: dict
   description: "Firmware Update job and progress details from the OME."
-  returned: success
+  returned: success, when I(batch_size) is not given
   sample: {
     'LastRun': None,
     'CreatedBy': 'user',
@@ -160,6 +232,74 @@ update_status:
       'Id': 5,
       'Name': 'Update_Task'}
 }
+job_tracking:
+  type: dict
+  description: "Summary of the job wait including the execution history of the latest run."
+  returned: when I(job_wait) is C(true)
+  sample: {
+    "job_id": 11117,
+    "status": "Completed",
+    "timed_out": false,
+    "polls": 14,
+    "elapsed_seconds": 512.3,
+    "execution_history": [{
+      "Id": 1111,
+      "JobName": "Firmware Update Task",
+      "Progress": "100",
+      "Status": {"Id": 2060, "Name": "Completed"},
+      "StartTime": "2020-06-01 10:00:00.111",
+      "EndTime": "2020-06-01 10:08:32.456",
+      "ExecutionHistoryDetails": [{
+        "Id": 1112,
+        "Key": "KLBR111",
+        "Progress": "100",
+        "Value": "Job completed successfully.",
+        "Status": {"Id": 2060, "Name": "Completed"}}]}]
+  }
+upload_progress:
+  type: dict
+  description:
+    - "Size of the DUP, bytes sent, timeout and elapsed time of the upload, with the time at which each
+      tenth of the file was sent."
+  returned: when I(upload_progress) is C(true)
+  sample: {
+    "file": "BIOS_87V69_WN64_2.4.7.EXE",
+    "size": 26214400,
+    "sent": 26214400,
+    "timeout": 200,
+    "elapsed_seconds": 4.2,
+    "checkpoints": [{"percent": 10, "elapsed_seconds": 0.4}, {"percent": 20, "elapsed_seconds": 0.8}]
+  }
+dup_upload:
+  type: dict
+  description: "SHA-256 of the DUP, its file token and whether the token was reused from I(dup_upload_index)."
+  returned: when I(dup_upload_index) is given
+  sample: {
+    "sha256": "9f86d081884c7d659a2feaa0c55ad015a3bf4f1b2b0b822cd15d6c15b0f00a08",
+    "token": "1577786112600",
+    "reused": true
+  }
+rolling_update:
+  type: dict
+  description:
+    - "Summary of a rolling update with the job, devices and final status of each submitted wave,
+      the devices of the waves which were not submitted and the failure percentage."
+    - "A wave whose job could not be created, or is no longer found on the appliance, fails with the
+      status C(NotSubmitted) or C(Missing) and a I(message)."
+  returned: when I(batch_size) is given
+  sample: {
+    "total_devices": 4,
+    "batch_size": 2,
+    "waves": [
+      {"wave": 1, "job_id": 11117, "device_ids": [11111, 22222], "status": "Completed"},
+      {"wave": 2, "job_id": 11118, "device_ids": [33333, 44444], "status": "Failed"}],
+    "skipped_devices": [],
+    "failed_devices": 2,
+    "failure_percentage": 50.0,
+    "stopped": false,
+    "timed_out": false,
+    "elapsed_seconds": 1805.2
+  }
 error_info:
   description: Details of the HTTP Error.
   returned: on HTTP error
@@ -180,16 +320,61 @@ error_info:
       ]
     }
   }
+perf:
+  description:
+    - Summary of the HTTP requests made by the module, with the bytes sent and received, the time spent
+      connecting, waiting for the first byte, reading and decoding the responses, and the slowest requests.
+    - The records of all the requests are appended to the JSONL file named by the DELLEMC_PERF_TRACE
+      environment variable, when it is set.
+  returned: when the DELLEMC_PERF or DELLEMC_PERF_TRACE environment variable is set
+  type: dict
+  sample: {
+    "requests": 4,
+    "retries": 0,
+    "bytes_sent": 512,
+    "bytes_received": 20480,
+    "connect_ms": 12.1,
+    "first_byte_ms": 310.5,
+    "read_ms": 20.2,
+    "decode_ms": 1.3,
+    "total_ms": 344.1,
+    "slowest": [{
+      "client": "ome",
+      "host": "192.168.0.1",
+      "method": "POST",
+      "path": "/api/UpdateService/Actions/UpdateService.UploadFile",
+      "status": 200,
+      "sent": 512,
+      "received": 2048,
+      "retries": 0,
+      "start": 1591005600.0,
+      "connect_ms": 4.1,
+      "first_byte_ms": 200.3,
+      "read_ms": 2.2,
+      "decode_ms": 0.4,
+      "total_ms": 207.0
+    }]
+  }
 '''
 
 
+import hashlib
 import json
+import os
+import time
 from ssl import SSLError
-from ansible.module_utils.basic import AnsibleModule
-from ansible.module_utils.remote_management.dellemc.ome import RestOME
+from ansible.module_utils.remote_management.dellemc.ome import RestOME, JobTracker, DupUploadIndex, MAX_WORKERS, \
+    JOB_STATUS_SELECT, JOB_TERMINAL_STATES
+from ansible.module_utils.remote_management.dellemc.perf import PerfAnsibleModule
+from ansible.module_utils.remote_management.dellemc.upload import StreamingBody
 from ansible.module_utils.urls import open_url, ConnectionError, SSLValidationError
 from ansible.module_utils.six.moves.urllib.error import URLError, HTTPError
 
+FIRMWARE_POLL_MAX_INTERVAL = 60
+DUP_UPLOAD_BASE_TIMEOUT = 100
+DUP_UPLOAD_MIN_RATE = 262144
+DUP_HASH_CHUNK_SIZE = 1048576
+
 
 def spawn_update_job(rest_obj, job_payload):
     """Spawns an update job and tracks it to completion."""
@@ -200,11 +385,30 @@ def spawn_update_job(rest_obj, job_payload):
     return job_details
 
 
-def job_payload_for_update(target_data):
+def wait_for_update_job(module, rest_obj, job_details, result=None):
+    """
+    Tracks the update job to a terminal state and exits with the final job details,
+    along with the values of I(result).
+    """
+    result = result or {}
+    tracker = JobTracker(rest_obj, max_interval=FIRMWARE_POLL_MAX_INTERVAL)
+    job, tracking = tracker.wait(job_details["Id"], timeout=module.params["job_wait_timeout"])
+    if tracking["timed_out"]:
+        module.fail_json(msg="The firmware update job did not complete within {0} seconds."
+                         .format(module.params["job_wait_timeout"]), update_status=job, job_tracking=tracking,
+                         **result)
+    elif tracking["status"] != "Completed":
+        module.fail_json(msg="The firmware update job completed with status '{0}'.".format(tracking["status"]),
+                         update_status=job, job_tracking=tracking, **result)
+    module.exit_json(msg="Successfully completed the firmware update job.", update_status=job,
+                     job_tracking=tracking, changed=True, **result)
+
+
+def job_payload_for_update(target_data, job_name="Firmware Update Task"):
     """Formulate the payload to initiate a firmware update job."""
     payload = {
-        "Id": 0, "JobName": "Firmware Update Task",
-        "JobDescription": "Firmware Update Task", "Schedule": "startnow",
+        "Id": 0, "JobName": job_name,
+        "JobDescription": job_name, "Schedule": "startnow",
         "State": "Enabled", "CreatedBy": "admin",
         "JobType": {"Id": 5, "Name": "Update_Task"},
         "Targets": target_data,
@@ -216,6 +420,103 @@ def job_payload_for_update(target_data):
     return payload
 
 
+def _wave_device_ids(targets):
+    """Ids of the devices of the targets, in the order of their first component."""
+    device_ids, seen = [], set()
+    for target in targets:
+        if target["Id"] not in seen:
+            seen.add(target["Id"])
+            device_ids.append(target["Id"])
+    return device_ids
+
+
+def split_waves(target_data, batch_size):
+    """Splits the targets into waves of the components of I(batch_size) devices, in the order of the devices."""
+    device_targets = {}
+    for target in target_data:
+        device_targets.setdefault(target["Id"], []).append(target)
+    device_ids = _wave_device_ids(target_data)
+    return [[target for device_id in device_ids[start:start + batch_size] for target in device_targets[device_id]]
+            for start in range(0, len(device_ids), batch_size)]
+
+
+def rolling_update(module, rest_obj, target_data, tracker=None):
+    """
+    Submits the targets in waves of I(batch_size) devices, with at most I(max_concurrent_jobs) wave jobs
+    running at once, and tracks them within the session. No more waves are submitted once the devices of
+    the failed waves exceed I(max_failure_percentage) of the targeted devices or I(job_wait_timeout) passes.
+    :returns: dict with the summary of the rolling update
+    """
+    params = module.params
+    tracker = tracker or JobTracker(rest_obj, max_interval=FIRMWARE_POLL_MAX_INTERVAL)
+    waves = list(enumerate(split_waves(target_data, params["batch_size"]), 1))
+    total = len(_wave_device_ids(target_data))
+    summary = {"total_devices": total, "batch_size": params["batch_size"], "waves": [], "skipped_devices": [],
+               "failed_devices": 0, "failure_percentage": 0.0, "stopped": False, "timed_out": False}
+    running, started, interval = {}, time.time(), tracker.min_interval
+
+    def finish(wave, status, message=None):
+        wave["status"] = status
+        if message:
+            wave["message"] = message
+        if status != "Completed":
+            summary["failed_devices"] += len(wave["device_ids"])
+            summary["failure_percentage"] = round(summary["failed_devices"] * 100.0 / total, 1)
+            summary["stopped"] = summary["failure_percentage"] > params["max_failure_percentage"]
+
+    while True:
+        while waves and len(running) < params["max_concurrent_jobs"] and not summary["stopped"]:
+            number, targets = waves.pop(0)
+            job = spawn_update_job(rest_obj, job_payload_for_update(
+                targets, job_name="Firmware Update Task - Wave {0}".format(number)))
+            wave = {"wave": number, "job_id": job.get("Id"), "device_ids": _wave_device_ids(targets), "status": None}
+            summary["waves"].append(wave)
+            if wave["job_id"] is None:
+                finish(wave, "NotSubmitted", "The update job of the wave could not be created.")
+            else:
+                running[wave["job_id"]] = wave
+                interval = tracker.min_interval
+        remaining = params["job_wait_timeout"] - (time.time() - started)
+        if not running or remaining <= 0:
+            break
+        tracker.sleep(min(interval, remaining))
+        interval = min(interval * tracker.growth, tracker.max_interval)
+        jobs = tracker.get_jobs(sorted(running), select=JOB_STATUS_SELECT)
+        for job_id in sorted(running):
+            if job_id not in jobs:
+                finish(running.pop(job_id), "Missing",
+                       "The update job {0} of the wave was not found on the appliance.".format(job_id))
+                continue
+            status = tracker.job_status(jobs[job_id])
+            running[job_id]["status"] = status
+            if status in JOB_TERMINAL_STATES:
+                finish(running.pop(job_id), status)
+    summary["timed_out"] = bool(running)
+    summary["skipped_devices"] = [device_id for number, targets in waves for device_id in _wave_device_ids(targets)]
+    summary["elapsed_seconds"] = round(time.time() - started, 1)
+    return summary
+
+
+def exit_rolling_update(module, summary, result=None):
+    """Exits with the summary of the rolling update, failing when it stopped early or timed out."""
+    result = result or {}
+    waves = len(summary["waves"])
+    changed = any(wave["job_id"] is not None for wave in summary["waves"])
+    if summary["timed_out"]:
+        module.fail_json(msg="The rolling firmware update did not complete within {0} seconds."
+                         .format(module.params["job_wait_timeout"]), rolling_update=summary, changed=changed, **result)
+    elif summary["stopped"]:
+        module.fail_json(msg="The rolling firmware update stopped after {0} wave(s) because {1}% of the devices "
+                             "failed.".format(waves, summary["failure_percentage"]),
+                         rolling_update=summary, changed=changed, **result)
+    elif summary["failed_devices"]:
+        msg = "Completed the rolling firmware update in {0} wave(s) with {1} failed device(s)."\
+            .format(waves, summary["failed_devices"])
+    else:
+        msg = "Successfully completed the rolling firmware update in {0} wave(s).".format(waves)
+    module.exit_json(msg=msg, rolling_update=summary, changed=changed, **result)
+
+
 def get_applicable_components(rest_obj, dup_payload, module):
     """Get the target array to be used in spawning jobs for update."""
     target_data = []
@@ -257,21 +558,50 @@ def get_dup_applicability_payload(file_token, device_ids=None, group_ids=None):
     return dup_applicability_payload
 
 
-def upload_dup_file(rest_obj, module):
-    """Upload DUP file to OME and get a file token."""
+def dup_upload_timeout(size):
+    """Timeout of the DUP upload, which allows for a transfer rate as low as DUP_UPLOAD_MIN_RATE bytes per second."""
+    return DUP_UPLOAD_BASE_TIMEOUT + size // DUP_UPLOAD_MIN_RATE
+
+
+def _record_upload_progress(progress):
+    """Returns the progress callback of a StreamingBody, which records each tenth of the upload in I(progress)."""
+    started = time.time()
+
+    def record(sent, length):
+        progress["sent"] = sent
+        progress["elapsed_seconds"] = round(time.time() - started, 1)
+        percent = sent * 100 // length if length else 100
+        if percent // 10 > len(progress["checkpoints"]):
+            progress["checkpoints"].append({"percent": percent // 10 * 10,
+                                            "elapsed_seconds": progress["elapsed_seconds"]})
+    return record
+
+
+def upload_dup_file(rest_obj, module, progress=None):
+    """
+    Upload DUP file to OME and get a file token.
+    The file is streamed in chunks with its Content-Length, and I(progress), when given,
+    is filled in with the size of the file, the bytes sent and the time taken.
+    """
     upload_uri = "UpdateService/Actions/UpdateService.UploadFile"
-    headers = {"Content-Type": "application/octet-stream",
-               "Accept": "application/octet-stream"}
     upload_success, token = False, None
     dup_file = module.params['dup_file']
     if not isinstance(dup_file, str):
         module.fail_json(
             msg="argument {0} is type of {1} and we were unable to convert to string: {1} cannot be "
                 "converted to a string".format("dup_file", type(dup_file)))
-    with open(module.params['dup_file'], 'rb') as payload:
-        payload = payload.read()
+    with open(module.params['dup_file'], 'rb') as dup:
+        payload = StreamingBody([dup])
+        timeout = dup_upload_timeout(len(payload))
+        if progress is not None:
+            progress.update({"file": os.path.basename(dup_file), "size": len(payload), "sent": 0,
+                             "timeout": timeout, "elapsed_seconds": 0.0, "checkpoints": []})
+            payload.progress = _record_upload_progress(progress)
+        headers = {"Content-Type": "application/octet-stream",
+                   "Accept": "application/octet-stream",
+                   "Content-Length": str(len(payload))}
         response = rest_obj.invoke_request("POST", upload_uri, data=payload, headers=headers,
-                                           api_timeout=100, dump=False)
+                                           api_timeout=timeout, dump=False)
         if response.status_code == 200:
             upload_success = True
             token = str(response.json_data)
@@ -281,34 +611,64 @@ def upload_dup_file(rest_obj, module):
     return upload_success, token
 
 
+def dup_sha256(dup_file):
+    """SHA-256 of the DUP, which is read in chunks."""
+    digest = hashlib.sha256()
+    with open(dup_file, 'rb') as dup:
+        for chunk in iter(lambda: dup.read(DUP_HASH_CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def get_dup_targets(rest_obj, module, device_ids=None, group_ids=None, result=None):
+    """
+    Uploads the DUP, or reuses the file token the upload index has for the same package and
+    appliance, and returns the components the DUP applies to. A token the appliance rejects
+    is dropped from the index and the DUP is uploaded again.
+    """
+    result = {} if result is None else result
+    index, key, entry = None, None, None
+    if module.params.get("dup_upload_index"):
+        index = DupUploadIndex(module.params["dup_upload_index"])
+        sha256 = dup_sha256(module.params["dup_file"])
+        key = "{0}@{1}:{2}".format(sha256, rest_obj.hostname, rest_obj.port)
+        entry = index.get(key)
+        result["dup_upload"] = {"sha256": sha256, "token": None, "reused": False}
+    if entry:
+        report_payload = get_dup_applicability_payload(entry["Token"], device_ids=device_ids, group_ids=group_ids)
+        try:
+            target_data = get_applicable_components(rest_obj, report_payload, module)
+        except HTTPError as err:
+            if err.code not in (400, 404):
+                raise err
+            index.remove(key)
+        else:
+            result["dup_upload"].update({"token": entry["Token"], "reused": True})
+            return target_data
+    upload_status, token = upload_dup_file(rest_obj, module, progress=result.get("upload_progress"))
+    if index is not None:
+        index.put(key, {"Token": token, "Uploaded": time.time(), "File": os.path.basename(module.params["dup_file"])})
+        result["dup_upload"]["token"] = token
+    report_payload = get_dup_applicability_payload(token, device_ids=device_ids, group_ids=group_ids)
+    return get_applicable_components(rest_obj, report_payload, module)
+
+
 def get_device_ids(rest_obj, module, device_id_tags):
     """Getting the list of device ids filtered from the device inventory."""
-    device_id = []
-    resp = rest_obj.get_all_report_details("DeviceService/Devices")
-    if resp["report_list"]:
-        device_resp = {str(device['Id']): device['DeviceServiceTag'] for device in resp["report_list"]}
-        device_tags = map(str, device_id_tags)
-        invalid_tags = []
-        for tag in device_tags:
-            if tag in device_resp.keys() or tag.isdigit():
-                device_id.append(tag)
-            elif tag in device_resp.values():
-                ids = list(device_resp.keys())[list(device_resp.values()).index(tag)]
-                device_id.append(ids)
-            else:
-                invalid_tags.append(tag)
-        if invalid_tags:
-            module.fail_json(
-                msg="Unable to complete the operation because the entered target device service"
-                    " tag(s) or device id(s) '{0}' are invalid.".format(",".join(set(invalid_tags))))
-    else:
-        module.fail_json(msg="Failed to fetch the device facts.")
-    return device_id
+    device_tags = list(map(str, device_id_tags))
+    devices, invalid_tags = rest_obj.resolve_devices(
+        device_ids=[tag for tag in device_tags if tag.isdigit()],
+        service_tags=[tag for tag in device_tags if not tag.isdigit()])
+    if invalid_tags:
+        module.fail_json(
+            msg="Unable to complete the operation because the entered target device service"
+                " tag(s) or device id(s) '{0}' are invalid.".format(",".join(set(invalid_tags))))
+    return [str(devices[tag]['Id']) for tag in device_tags]
 
 
 def get_group_ids(rest_obj, module):
     """Getting the list of group ids filtered from the groups."""
-    resp = rest_obj.get_all_report_details("GroupService/Groups")
+    resp = rest_obj.get_all_report_details("GroupService/Groups", max_workers=MAX_WORKERS)
     group_name = module.params.get('device_group_names')
     if resp["report_list"]:
         grp_ids = [grp['Id'] for grp in resp["report_list"] for grpname in group_name if grp['Name'] == grpname]
@@ -334,8 +694,18 @@ def _validate_device_attributes(module):
     return device_id_tags
 
 
+def _validate_rolling_options(module):
+    params = module.params
+    if params.get("batch_size") is None:
+        return
+    if params["batch_size"] < 1 or params["max_concurrent_jobs"] < 1:
+        module.fail_json(msg="batch_size and max_concurrent_jobs should be greater than zero.")
+    if not 0 <= params["max_failure_percentage"] <= 100:
+        module.fail_json(msg="max_failure_percentage should be between 0 and 100.")
+
+
 def main():
-    module = AnsibleModule(
+    module = PerfAnsibleModule(
         argument_spec={
             "hostname": {"required": True, "type": "str"},
             "username": {"required": True, "type": "str"},
@@ -345,35 +715,45 @@ def main():
             "device_id": {"required": False, "type": "list"},
             "dup_file": {"required": True, "type": "str"},
             "device_group_names": {"required": False, "type": "list"},
+            "job_wait": {"required": False, "type": "bool", "default": False},
+            "job_wait_timeout": {"required": False, "type": "int", "default": 3600},
+            "upload_progress": {"required": False, "type": "bool", "default": False},
+            "dup_upload_index": {"required": False, "type": "path"},
+            "batch_size": {"required": False, "type": "int"},
+            "max_concurrent_jobs": {"required": False, "type": "int", "default": 1},
+            "max_failure_percentage": {"required": False, "type": "int", "default": 0},
         },
         mutually_exclusive=[['device_group_names', 'device_id'], ["device_group_names", "device_service_tag"]],
     )
+    _validate_rolling_options(module)
     update_status, device_ids, group_ids = {}, None, None
+    result = {"upload_progress": {}} if module.params["upload_progress"] else {}
     try:
-        with RestOME(module.params, req_session=True) as rest_obj:
+        with RestOME(module.params, req_session=True, keep_alive=True) as rest_obj:
             if module.params.get("device_group_names") is not None:
                 group_ids = get_group_ids(rest_obj, module)
             else:
                 device_id_tags = _validate_device_attributes(module)
                 device_ids = get_device_ids(rest_obj, module, device_id_tags)
-            upload_status, token = upload_dup_file(rest_obj, module)
-            if upload_status:
-                report_payload = get_dup_applicability_payload(token, device_ids=device_ids,
-                                                               group_ids=group_ids)
-                if report_payload:
-                    target_data = get_applicable_components(rest_obj, report_payload, module)
-                    if target_data:
-                        job_payload = job_payload_for_update(target_data)
-                        update_status = spawn_update_job(rest_obj, job_payload)
-                    else:
-                        module.fail_json(msg="No components available for update.")
+            target_data = get_dup_targets(rest_obj, module, device_ids=device_ids, group_ids=group_ids,
+                                          result=result)
+            if target_data and module.params.get("batch_size"):
+                exit_rolling_update(module, rolling_update(module, rest_obj, target_data), result=result)
+            elif target_data:
+                job_payload = job_payload_for_update(target_data)
+                update_status = spawn_update_job(rest_obj, job_payload)
+                if module.params["job_wait"] and update_status:
+                    wait_for_update_job(module, rest_obj, update_status, result=result)
+            else:
+                module.fail_json(msg="No components available for update.")
     except HTTPError as err:
         module.fail_json(msg=str(err), error_info=json.load(err))
     except URLError as err:
         module.exit_json(msg=str(err), unreachable=True)
     except (IOError, ValueError, SSLError, TypeError, ConnectionError) as err:
         module.fail_json(msg=str(err))
-    module.exit_json(msg="Successfully submitted the firmware update job.", update_status=update_status, changed=True)
+    module.exit_json(msg="Successfully submitted the firmware update job.", update_status=update_status, changed=True,
+                     **result)
 
 
 if __name__ == "__main__":
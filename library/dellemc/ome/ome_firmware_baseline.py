@@ -181,12 +181,47 @@ error_info:
             "message": "A general error has occurred. See ExtendedInfo for more information."
         }
     }
+perf:
+  description:
+    - Summary of the HTTP requests made by the module, with the bytes sent and received, the time spent
+      connecting, waiting for the first byte, reading and decoding the responses, and the slowest requests.
+    - The records of all the requests are appended to the JSONL file named by the DELLEMC_PERF_TRACE
+      environment variable, when it is set.
+  returned: when the DELLEMC_PERF or DELLEMC_PERF_TRACE environment variable is set
+  type: dict
+  sample: {
+    "requests": 4,
+    "retries": 0,
+    "bytes_sent": 512,
+    "bytes_received": 20480,
+    "connect_ms": 12.1,
+    "first_byte_ms": 310.5,
+    "read_ms": 20.2,
+    "decode_ms": 1.3,
+    "total_ms": 344.1,
+    "slowest": [{
+      "client": "ome",
+      "host": "192.168.0.1",
+      "method": "POST",
+      "path": "/api/UpdateService/Baselines",
+      "status": 200,
+      "sent": 512,
+      "received": 2048,
+      "retries": 0,
+      "start": 1591005600.0,
+      "connect_ms": 4.1,
+      "first_byte_ms": 200.3,
+      "read_ms": 2.2,
+      "decode_ms": 0.4,
+      "total_ms": 207.0
+    }]
+  }
 '''
 
 import json
 from ssl import SSLError
-from ansible.module_utils.basic import AnsibleModule
 from ansible.module_utils.remote_management.dellemc.ome import RestOME
+from ansible.module_utils.remote_management.dellemc.perf import PerfAnsibleModule
 from ansible.module_utils.six.moves.urllib.error import URLError, HTTPError
 from ansible.module_utils.urls import ConnectionError, SSLValidationError
 
@@ -204,24 +239,23 @@ def get_catrepo_ids(cat_name, rest_obj):
 
 def get_dev_ids(module, rest_obj, param, devkey):
     paramlist = module.params[param]
-    resp = rest_obj.invoke_request('GET', "DeviceService/Devices")
+    if devkey == "Id":
+        devices, unresolved = rest_obj.resolve_devices(device_ids=paramlist)
+    else:
+        devices, unresolved = rest_obj.resolve_devices(service_tags=paramlist)
     targets = []
-    if resp.success:
-        devlist = resp.json_data['value']
-        device_resp = {device[devkey]: device for device in devlist}
-        for st in paramlist:
-            if st in device_resp:
-                djson = device_resp[st]
-                target = {}
-                device_type = {}
-                device_type['Id'] = djson['Type']
-                device_type['Name'] = "DEVICE"
-                target['Id'] = djson['Id']
-                target['Type'] = device_type
-                targets.append(target)
-            else:
-                module.fail_json(msg="Unable to complete the operation because the entered target"
-                                     " {0} '{1}' is invalid.".format(devkey, st))
+    for st in paramlist:
+        if str(st) in unresolved:
+            module.fail_json(msg="Unable to complete the operation because the entered target"
+                                 " {0} '{1}' is invalid.".format(devkey, st))
+        djson = devices[str(st)]
+        target = {}
+        device_type = {}
+        device_type['Id'] = djson['Type']
+        device_type['Name'] = "DEVICE"
+        target['Id'] = djson['Id']
+        target['Type'] = device_type
+        targets.append(target)
     return targets
 
 
@@ -290,7 +324,7 @@ def _get_baseline_payload(module, rest_obj):
 
 
 def main():
-    module = AnsibleModule(
+    module = PerfAnsibleModule(
         argument_spec={
             "hostname": {"required": True, "type": 'str'},
             "username": {"required": True, "type": 'str'},
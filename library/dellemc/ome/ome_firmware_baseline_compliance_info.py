@@ -232,11 +232,46 @@ error_info:
             "message": "A general error has occurred. See ExtendedInfo for more information."
         }
     }
+perf:
+  description:
+    - Summary of the HTTP requests made by the module, with the bytes sent and received, the time spent
+      connecting, waiting for the first byte, reading and decoding the responses, and the slowest requests.
+    - The records of all the requests are appended to the JSONL file named by the DELLEMC_PERF_TRACE
+      environment variable, when it is set.
+  returned: when the DELLEMC_PERF or DELLEMC_PERF_TRACE environment variable is set
+  type: dict
+  sample: {
+    "requests": 4,
+    "retries": 0,
+    "bytes_sent": 512,
+    "bytes_received": 20480,
+    "connect_ms": 12.1,
+    "first_byte_ms": 310.5,
+    "read_ms": 20.2,
+    "decode_ms": 1.3,
+    "total_ms": 344.1,
+    "slowest": [{
+      "client": "ome",
+      "host": "192.168.0.1",
+      "method": "GET",
+      "path": "/api/UpdateService/Baselines",
+      "status": 200,
+      "sent": 512,
+      "received": 2048,
+      "retries": 0,
+      "start": 1591005600.0,
+      "connect_ms": 4.1,
+      "first_byte_ms": 200.3,
+      "read_ms": 2.2,
+      "decode_ms": 0.4,
+      "total_ms": 207.0
+    }]
+  }
 '''
 
 import json
-from ansible.module_utils.basic import AnsibleModule
 from ansible.module_utils.remote_management.dellemc.ome import RestOME
+from ansible.module_utils.remote_management.dellemc.perf import PerfAnsibleModule
 from ansible.module_utils.six.moves.urllib.error import URLError, HTTPError
 from ansible.module_utils.urls import ConnectionError, SSLValidationError
 
@@ -257,16 +292,8 @@ def _get_device_id_from_service_tags(service_tags, rest_obj, module):
     :returns: dict eg: {1345:"MXL1245"}
     """
     try:
-        resp = rest_obj.invoke_request('GET', device_is_list_path)
-        if resp.success:
-            devices_list = resp.json_data["value"]
-            service_tag_dict = {}
-            for item in devices_list:
-                if item["DeviceServiceTag"] in service_tags:
-                    service_tag_dict.update({item["Id"]: item["DeviceServiceTag"]})
-            return service_tag_dict
-        else:
-            module.fail_json(msg="Failed to fetch the device information.")
+        devices, unresolved = rest_obj.resolve_devices(service_tags=service_tags)
+        return dict((item["Id"], item["DeviceServiceTag"]) for item in devices.values())
     except (URLError, HTTPError, SSLValidationError, ConnectionError, TypeError, ValueError) as err:
         raise err
 
@@ -384,7 +411,7 @@ def validate_inputs(module):
 
 
 def main():
-    module = AnsibleModule(
+    module = PerfAnsibleModule(
         argument_spec={
             "hostname": {"required": True, "type": 'str'},
             "username": {"required": True, "type": 'str'},
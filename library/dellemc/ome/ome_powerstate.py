@@ -49,14 +49,30 @@ options:
     choices: ['on', 'off', 'coldboot', 'warmboot', 'shutdown']
   device_service_tag:
     description:
-      - Targeted device service tag.
-      - I(device_service_tag) is mutually exclusive with I(device_id).
-    type: str
+      - Targeted device service tag, or list of targeted device service tags.
+      - Either I(device_id) or I(device_service_tag) can be used individually or together.
+      - All the targeted devices are resolved in one pass and the devices which are not already in
+        the desired power state are targeted by a single power state job.
+    type: list
   device_id:
     description:
-      - Targeted device id.
-      - I(device_id) is mutually exclusive with I(device_service_tag).
+      - Targeted device id, or list of targeted device ids.
+      - Each device id is looked up directly, and the service tags with a filtered device query.
+      - Either I(device_id) or I(device_service_tag) can be used individually or together.
+    type: list
+  job_wait:
+    description:
+      - Wait for the power state job to reach a terminal state within the same session.
+      - The final power state of each targeted device is returned as I(device_power_states).
+      - The module fails if the job does not complete successfully or times out.
+      - This option is not applicable in check mode.
+    type: bool
+    default: false
+  job_wait_timeout:
+    description:
+      - Maximum time in seconds to wait for the job when I(job_wait) is C(true).
     type: int
+    default: 1200
 requirements:
     - "python >= 2.7.5"
 author: "Felix Stephen (@felixs88)"
@@ -85,22 +101,31 @@ EXAMPLES = r'''
     hostname: "192.168.0.1"
     username: "username"
     password: "password"
-    device_id: "{{ item.device_id }}"
-    power_state: "{{ item.state }}"
-  with_items:
-    - { "device_id": 11111, "state": "on" }
-    - { "device_id": 22222, "state": "off" }
+    device_id:
+      - 11111
+      - 22222
+    power_state: "off"
 
 - name: Power state operation based on list of device service tags.
   ome_powerstate:
     hostname: "192.168.0.1"
     username: "username"
     password: "password"
-    device_service_tag: "{{ item.service_tag }}"
-    power_state: "{{ item.state }}"
-  with_items:
-    - { "service_tag": "KLBR111", "state": "on" }
-    - { "service_tag": "KLBR222", "state": "off" }
+    device_service_tag:
+      - KLBR111
+      - KLBR222
+    power_state: "on"
+
+- name: Power state operation and wait for the job to complete.
+  ome_powerstate:
+    hostname: "192.168.0.1"
+    username: "username"
+    password: "password"
+    device_service_tag:
+      - KLBR111
+      - KLBR222
+    power_state: "warmboot"
+    job_wait: true
 '''
 
 RETURN = r'''
@@ -113,7 +138,7 @@ msg:
 job_status:
   type: dict
   description: "Power state operation job and progress details from the OME."
-  returned: success
+  returned: when a power state job is submitted
   sample: {
     "Builtin": false,
     "CreatedBy": "user",
@@ -166,16 +191,87 @@ job_status:
     "UpdatedBy": null,
     "Visible": true
   }
+job_tracking:
+  type: dict
+  description: "Summary of the job wait including the execution history of the latest run."
+  returned: when I(job_wait) is C(true)
+  sample: {
+    "job_id": 11111,
+    "status": "Completed",
+    "timed_out": false,
+    "polls": 4,
+    "elapsed_seconds": 9.6,
+    "execution_history": [{
+      "Id": 1111,
+      "JobName": "DeviceAction_Task_PowerState",
+      "Progress": "100",
+      "Status": {"Id": 2060, "Name": "Completed"},
+      "ExecutionHistoryDetails": [{
+        "Id": 1112,
+        "Key": "KLBR111",
+        "Progress": "100",
+        "Value": "Power state changed successfully.",
+        "Status": {"Id": 2060, "Name": "Completed"}}]}]
+  }
+skipped_devices:
+  type: list
+  description: "Ids of the targeted devices which were already in the desired power state."
+  returned: success
+  sample: [22222]
+device_power_states:
+  type: list
+  description: "Power state of each targeted device after the job reached a terminal state."
+  returned: when I(job_wait) is C(true)
+  sample: [
+    {"Id": 11111, "DeviceServiceTag": "KLBR111", "PowerState": 17, "PowerStateName": "on"},
+    {"Id": 22222, "DeviceServiceTag": "KLBR222", "PowerState": 18, "PowerStateName": "off"}]
+perf:
+  description:
+    - Summary of the HTTP requests made by the module, with the bytes sent and received, the time spent
+      connecting, waiting for the first byte, reading and decoding the responses, and the slowest requests.
+    - The records of all the requests are appended to the JSONL file named by the DELLEMC_PERF_TRACE
+      environment variable, when it is set.
+  returned: when the DELLEMC_PERF or DELLEMC_PERF_TRACE environment variable is set
+  type: dict
+  sample: {
+    "requests": 4,
+    "retries": 0,
+    "bytes_sent": 512,
+    "bytes_received": 20480,
+    "connect_ms": 12.1,
+    "first_byte_ms": 310.5,
+    "read_ms": 20.2,
+    "decode_ms": 1.3,
+    "total_ms": 344.1,
+    "slowest": [{
+      "client": "ome",
+      "host": "192.168.0.1",
+      "method": "POST",
+      "path": "/api/JobService/Jobs",
+      "status": 200,
+      "sent": 512,
+      "received": 2048,
+      "retries": 0,
+      "start": 1591005600.0,
+      "connect_ms": 4.1,
+      "first_byte_ms": 200.3,
+      "read_ms": 2.2,
+      "decode_ms": 0.4,
+      "total_ms": 207.0
+    }]
+  }
 '''
 
 import json
-from ansible.module_utils.basic import AnsibleModule
-from ansible.module_utils.remote_management.dellemc.ome import RestOME
+from ansible.module_utils.remote_management.dellemc.ome import RestOME, JobTracker
+from ansible.module_utils.remote_management.dellemc.perf import PerfAnsibleModule
 from ansible.module_utils.six.moves.urllib.error import URLError, HTTPError
 from ansible.module_utils.urls import ConnectionError, SSLValidationError
 
 VALID_OPERATION = {"on": 2, "off": 12, "coldboot": 5, "warmboot": 10, "shutdown": 8}
 POWER_STATE_MAP = {"on": 17, "off": 18, "poweringon": 20, "poweringoff": 21}
+POWER_STATE_NAMES = dict((state, name) for name, state in POWER_STATE_MAP.items())
+DEVICE_SELECT = ["Id", "DeviceServiceTag", "Type", "PowerState"]
 
 
 def spawn_update_job(rest_obj, payload):
@@ -187,8 +283,40 @@ def spawn_update_job(rest_obj, payload):
     return job_details
 
 
-def build_power_state_payload(device_id, device_type, valid_option):
-    """Build the payload for requested device."""
+def get_device_power_states(rest_obj, device_ids):
+    """Fetches the power state of the devices, in the order of I(device_ids)."""
+    devices = rest_obj.get_devices_by_id(device_ids, select=DEVICE_SELECT)
+    power_states = []
+    for device_id in device_ids:
+        device = devices.get(str(device_id), {})
+        state = device.get("PowerState")
+        power_states.append({"Id": device_id, "DeviceServiceTag": device.get("DeviceServiceTag"),
+                             "PowerState": state, "PowerStateName": POWER_STATE_NAMES.get(state, "unknown")})
+    return power_states
+
+
+def wait_for_power_job(module, rest_obj, job_details, device_ids=None, result=None):
+    """
+    Tracks the power state job to a terminal state and exits with the final job details and the
+    power state of each of I(device_ids), along with the values of I(result).
+    """
+    result = dict(result or {})
+    job, tracking = JobTracker(rest_obj).wait(job_details["Id"], timeout=module.params["job_wait_timeout"])
+    if device_ids:
+        result["device_power_states"] = get_device_power_states(rest_obj, device_ids)
+    if tracking["timed_out"]:
+        module.fail_json(msg="The power state operation job did not complete within {0} seconds."
+                         .format(module.params["job_wait_timeout"]), job_status=job, job_tracking=tracking,
+                         **result)
+    elif tracking["status"] != "Completed":
+        module.fail_json(msg="The power state operation job completed with status '{0}'."
+                         .format(tracking["status"]), job_status=job, job_tracking=tracking, **result)
+    module.exit_json(msg="Power State operation job completed successfully.", job_status=job,
+                     job_tracking=tracking, changed=True, **result)
+
+
+def build_power_state_payload(devices, valid_option):
+    """Build the payload of a single job for the requested devices, given as (device id, device type) pairs."""
     payload = {
         "Id": 0,
         "JobName": "DeviceAction_Task_PowerState",
@@ -199,62 +327,75 @@ def build_power_state_payload(device_id, device_type, valid_option):
         "Params": [{"Key": "operationName", "Value": "POWER_CONTROL"},
                    {"Key": "powerState", "Value": str(valid_option)}],
         "Targets": [{"Id": device_id, "Data": "",
-                     "TargetType": {"Id": device_type, "Name": "DEVICE"}}],
+                     "TargetType": {"Id": device_type, "Name": "DEVICE"}} for device_id, device_type in devices],
     }
     return payload
 
 
-def get_device_state(module, resp, device_id):
-    """Get the current state and device type from response."""
-    current_state, device_type, invalid_device = None, None, True
-    for device in resp.json_data['value']:
-        if device['Id'] == device_id:
-            current_state = device.get('PowerState', None)
-            device_type = device['Type']
-            invalid_device = False
-            break
-    if invalid_device:
-        module.fail_json(msg="Unable to complete the operation because the entered target"
-                             " device id '{0}' is invalid.".format(device_id))
+def get_device_state(module, device):
+    """Get the current state and device type from the device record."""
+    current_state = device.get('PowerState', None)
+    device_type = device['Type']
     if device_type not in (1000, 2000):
         module.fail_json(msg="Unable to complete the operation because power"
                              " state supports device type 1000 and 2000.")
     return current_state, device_type
 
 
-def get_device_resource(module, rest_obj):
-    """Getting the device id filtered from the device inventory."""
+def is_in_power_state(power_state, current_state):
+    """Whether a device with I(current_state) is already in, or moving to, the desired power state."""
+    return (VALID_OPERATION[power_state] == current_state) or \
+        (power_state == "on" and current_state in (POWER_STATE_MAP["on"], POWER_STATE_MAP['poweringon'])) or \
+        (power_state in ("off", "shutdown") and
+         current_state in (POWER_STATE_MAP["off"], POWER_STATE_MAP['poweringoff']))
+
+
+def get_device_resource(module, rest_obj, result=None):
+    """
+    Resolves all the targeted devices in one pass and returns the payload of a single job for the
+    devices which are not already in the desired power state. Device ids are looked up with a GET
+    of their device entity and service tags with a filtered query, so neither reads the inventory.
+    The ids of the devices which are skipped are added to I(result).
+    """
+    result = {} if result is None else result
     power_state = module.params['power_state']
-    device_id = module.params['device_id']
-    service_tag = module.params['device_service_tag']
-    resp = rest_obj.invoke_request('GET', "DeviceService/Devices")
-    if resp.success and resp.json_data['value'] and service_tag is not None:
-        device_resp = {str(device['DeviceServiceTag']): device['Id'] for device in resp.json_data['value']}
-        if service_tag in device_resp:
-            device_id = device_resp[service_tag]
+    device_ids = [str(device_id) for device_id in module.params.get('device_id') or []]
+    service_tags = [str(tag) for tag in module.params.get('device_service_tag') or []]
+    devices = rest_obj.get_devices_by_id(device_ids, select=DEVICE_SELECT)
+    devices.update(rest_obj.get_devices_by_tag(service_tags, select=DEVICE_SELECT))
+    invalid_ids = [device_id for device_id in device_ids if device_id not in devices]
+    invalid_tags = [tag for tag in service_tags if tag not in devices]
+    if invalid_tags:
+        module.fail_json(msg="Unable to complete the operation because the entered target"
+                             " device service tag '{0}' is invalid.".format(",".join(invalid_tags)))
+    elif invalid_ids:
+        module.fail_json(msg="Unable to complete the operation because the entered target"
+                             " device id '{0}' is invalid.".format(",".join(invalid_ids)))
+    targets, skipped, seen = [], [], set()
+    for identifier in device_ids + service_tags:
+        device = devices[identifier]
+        if device['Id'] in seen:
+            continue
+        seen.add(device['Id'])
+        current_state, device_type = get_device_state(module, device)
+        if is_in_power_state(power_state, current_state):
+            skipped.append(device['Id'])
         else:
-            module.fail_json(msg="Unable to complete the operation because the entered target"
-                                 " device service tag '{0}' is invalid.".format(service_tag))
-    current_state, device_type = get_device_state(module, resp, device_id)
+            targets.append((device['Id'], device_type))
+    result["skipped_devices"] = skipped
 
     # For check mode changes.
-    valid_option, valid_operation = VALID_OPERATION[power_state], False
-    if (valid_option == current_state) or \
-            (power_state == "on" and current_state in (POWER_STATE_MAP["on"], POWER_STATE_MAP['poweringon'])) or \
-            (power_state in ("off", "shutdown") and
-             current_state in (POWER_STATE_MAP["off"], POWER_STATE_MAP['poweringoff'])):
-        valid_operation = True
-
-    if module.check_mode and valid_operation:
-        module.exit_json(msg="No changes found to commit.")
-    elif module.check_mode and not valid_operation:
-        module.exit_json(msg="Changes found to commit.", changed=True)
-    payload = build_power_state_payload(device_id, device_type, valid_option)
-    return payload
+    if module.check_mode and not targets:
+        module.exit_json(msg="No changes found to commit.", **result)
+    elif module.check_mode:
+        module.exit_json(msg="Changes found to commit.", changed=True, **result)
+    elif not targets:
+        module.exit_json(msg="The targeted device(s) are already in the desired power state.", **result)
+    return build_power_state_payload(targets, VALID_OPERATION[power_state])
 
 
 def main():
-    module = AnsibleModule(
+    module = PerfAnsibleModule(
         argument_spec={
             "hostname": {"required": True, "type": "str"},
             "username": {"required": True, "type": "str"},
@@ -262,26 +403,30 @@ def main():
             "port": {"required": False, "type": "int", "default": 443},
             "power_state": {"required": True, "type": "str",
                             "choices": ["on", "off", "coldboot", "warmboot", "shutdown"]},
-            "device_service_tag": {"required": False, "type": "str"},
-            "device_id": {"required": False, "type": "int"},
+            "device_service_tag": {"required": False, "type": "list"},
+            "device_id": {"required": False, "type": "list"},
+            "job_wait": {"required": False, "type": "bool", "default": False},
+            "job_wait_timeout": {"required": False, "type": "int", "default": 1200},
         },
         required_one_of=[["device_service_tag", "device_id"]],
-        mutually_exclusive=[["device_service_tag", "device_id"]],
         supports_check_mode=True
     )
     try:
-        if module.params['device_id'] is None and module.params['device_service_tag'] is None:
+        if not module.params['device_id'] and not module.params['device_service_tag']:
             module.fail_json(msg="device_id and device_service_tag attributes should not be None.")
-        job_status = {}
+        job_status, result = {}, {}
         with RestOME(module.params, req_session=True) as rest_obj:
-            payload = get_device_resource(module, rest_obj)
+            payload = get_device_resource(module, rest_obj, result)
             job_status = spawn_update_job(rest_obj, payload)
+            if module.params["job_wait"] and job_status:
+                device_ids = [target["Id"] for target in payload["Targets"]] + result["skipped_devices"]
+                wait_for_power_job(module, rest_obj, job_status, device_ids=device_ids, result=result)
     except HTTPError as err:
         module.fail_json(msg=str(err), job_status=json.load(err))
     except (URLError, SSLValidationError, ConnectionError, TypeError, ValueError) as err:
         module.fail_json(msg=str(err))
     module.exit_json(msg="Power State operation job submitted successfully.",
-                     job_status=job_status, changed=True)
+                     job_status=job_status, changed=True, **result)
 
 
 if __name__ == '__main__':
@@ -129,6 +129,19 @@ options:
         and servers. This is applicable when I(command) is C(create).
       - >-
         Refer OpenManage Enterprise API Reference Guide for more details.
+  job_wait:
+    description:
+      - Wait for the template-deployment job to reach a terminal state within the same session.
+      - The module fails if the job does not complete successfully or times out.
+      - This is applicable when I(command) is C(deploy) and the deployment is scheduled to run immediately.
+        The module does not wait when C(Schedule.RunNow) is C(false) in I(attributes).
+    type: bool
+    default: false
+  job_wait_timeout:
+    description:
+      - Maximum time in seconds to wait for the job when I(job_wait) is C(true).
+    type: int
+    default: 3600
 requirements:
     - "python >= 2.7.5"
 author: "Jagadeesh N V (@jagadeeshnv)"
@@ -178,6 +191,18 @@ EXAMPLES = r'''
       - 'SVTG123'
       - 'SVTG456'
 
+- name: "Deploy template and wait for the template-deployment job to complete."
+  ome_template:
+    hostname:  "192.168.0.1"
+    username: "username"
+    password: "password"
+    command: "deploy"
+    template_id: 12
+    device_service_tag:
+      - 'SVTG123'
+    job_wait: true
+    job_wait_timeout: 5400
+
 - name: "Deploy template on multiple devices along with the attributes values to be modified on the target devices."
   ome_template:
     hostname:  "192.168.0.1"
@@ -370,6 +395,28 @@ return_id:
   returned: success, when I(command) is C(create), C(modify), C(import), C(clone) and C(deploy)
   type: int
   sample: 12
+job_tracking:
+  description: Summary of the job wait including the execution history of the latest run.
+  returned: success, when I(command) is C(deploy), I(job_wait) is C(true) and the deployment runs immediately
+  type: dict
+  sample: {
+    "job_id": 12,
+    "status": "Completed",
+    "timed_out": false,
+    "polls": 21,
+    "elapsed_seconds": 1380.2,
+    "execution_history": [{
+      "Id": 1111,
+      "JobName": "Deploy Template",
+      "Progress": "100",
+      "Status": {"Id": 2060, "Name": "Completed"},
+      "ExecutionHistoryDetails": [{
+        "Id": 1112,
+        "Key": "SVTG123",
+        "Progress": "100",
+        "Value": "Template deployed successfully.",
+        "Status": {"Id": 2060, "Name": "Completed"}}]}]
+  }
 TemplateId:
   description: ID of the template for C(export).
   returned: success, when I(command) is C(export)
@@ -405,11 +452,47 @@ error_info:
       ]
     }
   }
+perf:
+  description:
+    - Summary of the HTTP requests made by the module, with the bytes sent and received, the time spent
+      connecting, waiting for the first byte, reading and decoding the responses, and the slowest requests.
+    - The records of all the requests are appended to the JSONL file named by the DELLEMC_PERF_TRACE
+      environment variable, when it is set.
+  returned: when the DELLEMC_PERF or DELLEMC_PERF_TRACE environment variable is set
+  type: dict
+  sample: {
+    "requests": 4,
+    "retries": 0,
+    "bytes_sent": 512,
+    "bytes_received": 20480,
+    "connect_ms": 12.1,
+    "first_byte_ms": 310.5,
+    "read_ms": 20.2,
+    "decode_ms": 1.3,
+    "total_ms": 344.1,
+    "slowest": [{
+      "client": "ome",
+      "host": "192.168.0.1",
+      "method": "POST",
+      "path": "/api/TemplateService/Actions/TemplateService.Deploy",
+      "status": 200,
+      "sent": 512,
+      "received": 2048,
+      "retries": 0,
+      "start": 1591005600.0,
+      "connect_ms": 4.1,
+      "first_byte_ms": 200.3,
+      "read_ms": 2.2,
+      "decode_ms": 0.4,
+      "total_ms": 207.0
+    }]
+  }
 '''
 
 import json
-from ansible.module_utils.basic import AnsibleModule
-from ansible.module_utils.remote_management.dellemc.ome import RestOME
+from ansible.module_utils.parsing.convert_bool import boolean
+from ansible.module_utils.remote_management.dellemc.ome import RestOME, JobTracker
+from ansible.module_utils.remote_management.dellemc.perf import PerfAnsibleModule
 from ansible.module_utils.six.moves.urllib.error import URLError, HTTPError
 from ansible.module_utils.urls import ConnectionError, SSLValidationError
 
@@ -418,6 +501,7 @@ TEMPLATES_URI = "TemplateService/Templates"
 TEMPLATE_PATH = "TemplateService/Templates({template_id})"
 TEMPALTE_ACTION = "TemplateService/Actions/TemplateService.{op}"
 DEVICE_URI = "DeviceService/Devices"
+DEPLOY_POLL_MAX_INTERVAL = 60
 
 
 def get_device_ids(module, rest_obj):
@@ -429,25 +513,17 @@ def get_device_ids(module, rest_obj):
     service_tags = module.params.get('device_service_tag')
     if not service_tags:
         return list(set(device_id))
-    device_list = rest_obj.get_all_report_details(DEVICE_URI)["report_list"]
-    if device_list:
-        device_resp = {device.get('DeviceServiceTag'): str(device.get('Id')) for device in device_list}
-        device_tags = list(map(str, service_tags))
-        invalid_tags = []
-        for tag in device_tags:
-            if device_resp.get(tag):
-                device_id.append(device_resp.get(tag))
-            else:
-                invalid_tags.append(tag)
-        if invalid_tags:
-            fail_module(module, msg="Unable to complete the operation because the entered target service"
-                                    " tag(s) '{0}' are invalid.".format(",".join(set(invalid_tags))))
-    else:
-        fail_module(module, msg="Failed to fetch the device ids.")
-    invalid_ids = set(device_id) - set(device_resp.values())
+    device_tags = list(map(str, service_tags))
+    devices, unresolved = rest_obj.resolve_devices(device_ids=device_id, service_tags=device_tags)
+    invalid_tags = [tag for tag in device_tags if tag in unresolved]
+    if invalid_tags:
+        fail_module(module, msg="Unable to complete the operation because the entered target service"
+                                " tag(s) '{0}' are invalid.".format(",".join(set(invalid_tags))))
+    invalid_ids = set(devid for devid in device_id if devid in unresolved)
     if invalid_ids:
         fail_module(module, msg="Unable to complete the operation because the entered target device"
-                                " id(s) '{0}' are invalid.".format(",".join(list(map(str, set(invalid_ids))))))
+                                " id(s) '{0}' are invalid.".format(",".join(list(map(str, invalid_ids)))))
+    device_id.extend(str(devices[tag].get('Id')) for tag in device_tags)
     return list(map(int, set(device_id)))
 
 
@@ -642,7 +718,7 @@ def fail_module(module, **failmsg):
     module.fail_json(**failmsg)
 
 
-def exit_module(module, response):
+def exit_module(module, response, job_tracking=None):
     password_no_log(module.params.get("attributes"))
     resp = None
     my_change = True
@@ -661,11 +737,35 @@ def exit_module(module, response):
                 'export': "Exported successfully",
                 'import': "Imported successfully",
                 'clone': "Cloned successfully"}
+    if job_tracking is not None:
+        result["job_tracking"] = job_tracking
+        msg_dict['deploy'] = "Successfully completed the template-deployment job with ID {0}".format(resp)
     module.exit_json(msg=msg_dict.get(command), changed=my_change, **result)
 
 
+def is_run_now(attributes):
+    """Whether the deployment in I(attributes) runs immediately rather than on a schedule."""
+    schedule = attributes.get("Schedule") if isinstance(attributes, dict) else None
+    if isinstance(schedule, dict) and schedule.get("RunNow") is not None:
+        return boolean(schedule["RunNow"], strict=False)
+    return True
+
+
+def wait_for_deploy_job(module, rest_obj, job_id):
+    """Tracks the template-deployment job to a terminal state and returns the tracking summary."""
+    tracker = JobTracker(rest_obj, max_interval=DEPLOY_POLL_MAX_INTERVAL)
+    job, tracking = tracker.wait(job_id, timeout=module.params["job_wait_timeout"])
+    if tracking["timed_out"]:
+        fail_module(module, msg="The template-deployment job with ID {0} did not complete within {1} seconds."
+                    .format(job_id, module.params["job_wait_timeout"]), return_id=job_id, job_tracking=tracking)
+    elif tracking["status"] != "Completed":
+        fail_module(module, msg="The template-deployment job with ID {0} completed with status '{1}'."
+                    .format(job_id, tracking["status"]), return_id=job_id, job_tracking=tracking)
+    return tracking
+
+
 def main():
-    module = AnsibleModule(
+    module = PerfAnsibleModule(
         argument_spec={
             "hostname": {"required": True, "type": 'str'},
             "username": {"required": True, "type": 'str'},
@@ -680,6 +780,8 @@ def main():
             "device_id": {"required": False, "type": 'list', "default": [], "elements": 'int'},
             "device_service_tag": {"required": False, "type": 'list', "default": [], "elements": 'str'},
             "attributes": {"required": False, "type": 'dict'},
+            "job_wait": {"required": False, "type": 'bool', "default": False},
+            "job_wait_timeout": {"required": False, "type": 'int', "default": 3600},
         },
         required_if=[
             ['command', 'create', ['attributes']],
@@ -692,11 +794,15 @@ def main():
 
     try:
         _validate_inputs(module)
-        with RestOME(module.params, req_session=True) as rest_obj:
+        with RestOME(module.params, req_session=True, keep_alive=True) as rest_obj:
             path, payload, rest_method = _get_resource_parameters(module, rest_obj)
             resp = rest_obj.invoke_request(rest_method, path, data=payload)
             if resp.success:
-                exit_module(module, resp)
+                job_tracking = None
+                if module.params["command"] == "deploy" and module.params["job_wait"] and \
+                        is_run_now(module.params.get("attributes")):
+                    job_tracking = wait_for_deploy_job(module, rest_obj, resp.json_data)
+                exit_module(module, resp, job_tracking=job_tracking)
     except HTTPError as err:
         fail_module(module, msg=str(err), error_info=json.load(err))
     except URLError as err:
@@ -53,6 +53,15 @@ options:
       filter:
         description: Filter records by the supported values.
         type: str
+      select:
+        description: List of template properties to return, applied on the server with C($select).
+        type: list
+        elements: str
+  max_items:
+    description:
+      - Maximum number of templates to return.
+      - All the pages of the template collection are fetched when this is not specified.
+    type: int
 requirements:
     - "python >= 2.7.5"
 author: "Sajna Shetty(@Sajna-Shetty)"
@@ -81,6 +90,17 @@ EXAMPLES = r'''
     password: "password"
     system_query_options:
       filter: "Name eq 'new template'"
+
+- name: Get the names and ids of all the deployment templates.
+  ome_template_info:
+    hostname: "192.168.0.1"
+    username: "username"
+    password: "password"
+    system_query_options:
+      filter: "ViewTypeId eq 2"
+      select:
+        - Id
+        - Name
 '''
 
 RETURN = r'''
@@ -115,11 +135,46 @@ template_info:
             "ViewTypeId": 4
         }
     }
+perf:
+  description:
+    - Summary of the HTTP requests made by the module, with the bytes sent and received, the time spent
+      connecting, waiting for the first byte, reading and decoding the responses, and the slowest requests.
+    - The records of all the requests are appended to the JSONL file named by the DELLEMC_PERF_TRACE
+      environment variable, when it is set.
+  returned: when the DELLEMC_PERF or DELLEMC_PERF_TRACE environment variable is set
+  type: dict
+  sample: {
+    "requests": 4,
+    "retries": 0,
+    "bytes_sent": 512,
+    "bytes_received": 20480,
+    "connect_ms": 12.1,
+    "first_byte_ms": 310.5,
+    "read_ms": 20.2,
+    "decode_ms": 1.3,
+    "total_ms": 344.1,
+    "slowest": [{
+      "client": "ome",
+      "host": "192.168.0.1",
+      "method": "GET",
+      "path": "/api/TemplateService/Templates",
+      "status": 200,
+      "sent": 512,
+      "received": 2048,
+      "retries": 0,
+      "start": 1591005600.0,
+      "connect_ms": 4.1,
+      "first_byte_ms": 200.3,
+      "read_ms": 2.2,
+      "decode_ms": 0.4,
+      "total_ms": 207.0
+    }]
+  }
 '''
 
 import json
-from ansible.module_utils.basic import AnsibleModule
 from ansible.module_utils.remote_management.dellemc.ome import RestOME
+from ansible.module_utils.remote_management.dellemc.perf import PerfAnsibleModule
 from ansible.module_utils.six.moves.urllib.error import URLError, HTTPError
 from ansible.module_utils.urls import ConnectionError, SSLValidationError
 
@@ -133,12 +188,12 @@ def _get_query_parameters(module_params):
     system_query_param = module_params.get("system_query_options")
     query_param = {}
     if system_query_param:
-        query_param = {"$" + k: v for k, v in system_query_param.items() if v is not None}
+        query_param = {"$" + k: v for k, v in system_query_param.items() if v is not None and k != "select"}
     return query_param
 
 
 def main():
-    module = AnsibleModule(
+    module = PerfAnsibleModule(
         argument_spec={
             "hostname": {"required": True, "type": 'str'},
             "username": {"required": True, "type": 'str'},
@@ -147,7 +202,9 @@ def main():
             "template_id": {"type": 'int', "required": False},
             "system_query_options": {"required": False, "type": 'dict', "options": {
               "filter": {"type": 'str', "required": False},
+              "select": {"type": 'list', "elements": 'str', "required": False},
             }},
+            "max_items": {"type": 'int', "required": False},
         },
         mutually_exclusive=[['template_id', 'system_query_options']],
         supports_check_mode=False
@@ -167,9 +224,15 @@ def main():
             else:
                 # Fetch all templates
                 template_path = template_uri
-            resp = rest_obj.invoke_request('GET', template_path, query_param=query_param)
-            template_facts = resp.json_data
-        if resp.status_code == 200:
+            if template_path == template_uri:
+                select = (module.params.get("system_query_options") or {}).get("select")
+                template_facts = rest_obj.get_collection(template_path, query_param=query_param, select=select,
+                                                         max_items=module.params.get("max_items"))
+                status_code = 200
+            else:
+                resp = rest_obj.invoke_request('GET', template_path, query_param=query_param)
+                template_facts, status_code = resp.json_data, resp.status_code
+        if status_code == 200:
             module.exit_json(template_info={module.params["hostname"]: template_facts})
         else:
             module.fail_json(msg="Failed to fetch the template facts")
@@ -52,6 +52,15 @@ options:
       filter:
         description: Filter records for the supported values.
         type: str
+      select:
+        description: List of account properties to return, applied on the server with C($select).
+        type: list
+        elements: str
+  max_items:
+    description:
+      - Maximum number of accounts to return.
+      - All the pages of the account collection are fetched when this is not specified.
+    type: int
 requirements:
     - "python >= 2.7.5"
 author: "Jagadeesh N V(@jagadeeshnv)"
@@ -79,6 +88,17 @@ EXAMPLES = r'''
     password: "password"
     system_query_options:
       filter: "UserName eq 'test'"
+
+- name: Get the user name and role of the first 500 accounts.
+  ome_user_info:
+    hostname: "192.168.0.1"
+    username: "username"
+    password: "password"
+    system_query_options:
+      select:
+        - UserName
+        - RoleId
+    max_items: 500
 '''
 
 RETURN = r'''
@@ -107,11 +127,46 @@ user_info:
             "Enabled": true
      }
   }
+perf:
+  description:
+    - Summary of the HTTP requests made by the module, with the bytes sent and received, the time spent
+      connecting, waiting for the first byte, reading and decoding the responses, and the slowest requests.
+    - The records of all the requests are appended to the JSONL file named by the DELLEMC_PERF_TRACE
+      environment variable, when it is set.
+  returned: when the DELLEMC_PERF or DELLEMC_PERF_TRACE environment variable is set
+  type: dict
+  sample: {
+    "requests": 4,
+    "retries": 0,
+    "bytes_sent": 512,
+    "bytes_received": 20480,
+    "connect_ms": 12.1,
+    "first_byte_ms": 310.5,
+    "read_ms": 20.2,
+    "decode_ms": 1.3,
+    "total_ms": 344.1,
+    "slowest": [{
+      "client": "ome",
+      "host": "192.168.0.1",
+      "method": "GET",
+      "path": "/api/AccountService/Accounts",
+      "status": 200,
+      "sent": 512,
+      "received": 2048,
+      "retries": 0,
+      "start": 1591005600.0,
+      "connect_ms": 4.1,
+      "first_byte_ms": 200.3,
+      "read_ms": 2.2,
+      "decode_ms": 0.4,
+      "total_ms": 207.0
+    }]
+  }
 '''
 
 import json
-from ansible.module_utils.basic import AnsibleModule
 from ansible.module_utils.remote_management.dellemc.ome import RestOME
+from ansible.module_utils.remote_management.dellemc.perf import PerfAnsibleModule
 from ansible.module_utils.six.moves.urllib.error import URLError, HTTPError
 from ansible.module_utils.urls import ConnectionError, SSLValidationError
 
@@ -125,12 +180,12 @@ def _get_query_parameters(module_params):
     system_query_param = module_params.get("system_query_options")
     query_param = {}
     if system_query_param:
-        query_param = {"$" + k: v for k, v in system_query_param.items() if v is not None}
+        query_param = {"$" + k: v for k, v in system_query_param.items() if v is not None and k != "select"}
     return query_param
 
 
 def main():
-    module = AnsibleModule(
+    module = PerfAnsibleModule(
         argument_spec={
             "hostname": {"required": True, "type": 'str'},
             "username": {"required": True, "type": 'str'},
@@ -139,7 +194,9 @@ def main():
             "account_id": {"type": 'int', "required": False},
             "system_query_options": {"required": False, "type": 'dict', "options": {
                 "filter": {"type": 'str', "required": False},
+                "select": {"type": 'list', "elements": 'str', "required": False},
             }},
+            "max_items": {"type": 'int', "required": False},
         },
         mutually_exclusive=[
             ('account_id', 'system_query_options')
@@ -148,6 +205,7 @@ def main():
     )
     account_uri = "AccountService/Accounts"
     query_param = None
+    select = (module.params.get("system_query_options") or {}).get("select")
     try:
         with RestOME(module.params, req_session=True) as rest_obj:
             if module.params.get("account_id") is not None:
@@ -161,13 +219,18 @@ def main():
             else:
                 # Fetch all users
                 account_path = account_uri
-            resp = rest_obj.invoke_request('GET', account_path, query_param=query_param)
-            user_facts = resp.json_data
+            if account_path == account_uri:
+                user_facts = rest_obj.get_collection(account_path, query_param=query_param, select=select,
+                                                     max_items=module.params.get("max_items"))
+                status_code = 200
+            else:
+                resp = rest_obj.invoke_request('GET', account_path, query_param=query_param)
+                user_facts, status_code = resp.json_data, resp.status_code
             user_exists = True
             if "value" in user_facts and len(user_facts["value"]) == 0:
                 user_exists = False
             # check for 200 status as GET only returns this for success
-        if resp.status_code == 200 and user_exists:
+        if status_code == 200 and user_exists:
             module.exit_json(user_info={module.params["hostname"]: user_facts})
         else:
             module.fail_json(msg="Unable to retrieve the account details.")
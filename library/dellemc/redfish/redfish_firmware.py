@@ -26,6 +26,8 @@ description:
     - This module allows the firmware update of only one component at a time.
       If the module is run for more than one component, an error message is returned.
     - Depending on the component, the firmware update is applied after an automatic or manual reboot.
+    - When the C(REDFISH_DISCOVERY_CACHE) environment variable names a file, the update service URIs are cached
+      there per host, and later runs against the same firmware version skip their lookup.
 options:
     baseuri:
         description: "IP Address of the target out-of-band controller. For example- <ipaddress>:<port>."
@@ -50,9 +52,20 @@ options:
         type: str
         default: HTTP
         choices: ["CIFS", "FTP", "HTTP", "HTTPS", "NSF", "OEM", "SCP", "SFTP", "TFTP"]
+    job_wait:
+        description:
+            - Wait for the firmware update task within the same session.
+            - The wait ends when the task completes, or when it is C(Pending) because the update is
+              scheduled to be applied on the next reboot.
+            - The module fails if the task does not complete successfully or times out.
+        type: bool
+        default: False
+    job_wait_timeout:
+        description: Maximum time in seconds to wait for the task when I(job_wait) is C(True).
+        type: int
+        default: 3600
 requirements:
     - "python >= 2.7.5"
-    - "urllib3"
 author:
     - "Felix Stephen (@felixs88)"
 """
@@ -73,6 +86,14 @@ EXAMPLES = """
     username: "user_name"
     password: "user_password"
     image_uri: "/home/firmware_repo/component.exe"
+
+- name: Update the firmware and wait for the update task.
+  redfish_firmware:
+    baseuri: "192.168.0.1"
+    username: "user_name"
+    password: "user_password"
+    image_uri: "http://192.168.0.2/firmware_repo/component.exe"
+    job_wait: True
 """
 
 RETURN = """
@@ -90,6 +111,27 @@ task:
         "id": "JID_XXXXXXXXXXXX",
         "uri": "/redfish/v1/TaskService/Tasks/JID_XXXXXXXXXXXX"
     }
+task_status:
+  description: Final state, status, progress and messages of the task.
+  returned: when I(job_wait) is C(True)
+  type: dict
+  sample: {
+        "id": "JID_XXXXXXXXXXXX",
+        "uri": "/redfish/v1/TaskService/Tasks/JID_XXXXXXXXXXXX",
+        "state": "Completed",
+        "status": "OK",
+        "percent_complete": 100,
+        "messages": [
+            {
+                "Message": "Job completed successfully.",
+                "MessageId": "PR19"
+            }
+        ],
+        "resource_uri": null,
+        "timed_out": false,
+        "polls": 12,
+        "elapsed_seconds": 301.7
+    }
 error_info:
   type: dict
   description: Details of http error.
@@ -116,51 +158,79 @@ error_info:
             "message": "A general error has occurred. See ExtendedInfo for more information."
         }
     }
+perf:
+  description:
+    - Summary of the HTTP requests made by the module, with the bytes sent and received, the time spent
+      connecting, waiting for the first byte, reading and decoding the responses, and the slowest requests.
+    - The records of all the requests are appended to the JSONL file named by the DELLEMC_PERF_TRACE
+      environment variable, when it is set.
+  returned: when the DELLEMC_PERF or DELLEMC_PERF_TRACE environment variable is set
+  type: dict
+  sample: {
+    "requests": 4,
+    "retries": 0,
+    "bytes_sent": 512,
+    "bytes_received": 20480,
+    "connect_ms": 12.1,
+    "first_byte_ms": 310.5,
+    "read_ms": 20.2,
+    "decode_ms": 1.3,
+    "total_ms": 344.1,
+    "slowest": [{
+      "client": "redfish",
+      "host": "192.168.0.1",
+      "method": "POST",
+      "path": "/redfish/v1/UpdateService/MultipartUpload",
+      "status": 200,
+      "sent": 512,
+      "received": 2048,
+      "retries": 0,
+      "start": 1591005600.0,
+      "connect_ms": 4.1,
+      "first_byte_ms": 200.3,
+      "read_ms": 2.2,
+      "decode_ms": 0.4,
+      "total_ms": 207.0
+    }]
+  }
 """
 
 
 import json
 import os
-from ansible.module_utils.remote_management.dellemc.redfish import Redfish
-from ansible.module_utils.basic import AnsibleModule, missing_required_lib
+from ansible.module_utils.remote_management.dellemc.redfish import Redfish, TaskMonitor
+from ansible.module_utils.remote_management.dellemc.perf import PerfAnsibleModule
+from ansible.module_utils.remote_management.dellemc.upload import multipart_file_body
 from ansible.module_utils.urls import ConnectionError, SSLValidationError
 from ansible.module_utils.six.moves.urllib.error import URLError, HTTPError
 
-try:
-    from urllib3.fields import RequestField
-    from urllib3.filepost import encode_multipart_formdata
-    HAS_LIB = True
-except ImportError:
-    HAS_LIB = False
-
 UPDATE_SERVICE = "UpdateService"
+FIRMWARE_POLL_MAX_INTERVAL = 60
 
 
-def _encode_form_data(payload_file):
-    """Encode multipart/form-data for file upload."""
-    fields = []
-    f_name, f_data, f_type = payload_file.get("file")
-    f_binary = f_data.read()
-    req_field = RequestField(name="file", data=f_binary, filename=f_name)
-    req_field.make_multipart(content_type=f_type)
-    fields.append(req_field)
-    data, content_type = encode_multipart_formdata(fields)
-    return data, content_type
+def _resolve_update_service(obj):
+    """Looks up the URIs and transfer protocols of the update service."""
+    action_resp = obj.invoke_request("GET", "{0}{1}".format(obj.root_uri, UPDATE_SERVICE))
+    action_attr = action_resp.json_data["Actions"]
+    update_service = action_attr.get("#UpdateService.SimpleUpdate")
+    return {"inventory_uri": action_resp.json_data.get('FirmwareInventory').get('@odata.id'),
+            "push_uri": action_resp.json_data.get('HttpPushUri'),
+            "simple_update": update_service is not None,
+            "update_uri": (update_service or {}).get('target'),
+            "protocols": (update_service or {}).get("TransferProtocol@Redfish.AllowableValues")}
 
 
 def _get_update_service_target(obj, module):
-    """Returns all the URI which is required for firmware update dynamically."""
-    action_resp = obj.invoke_request("GET", "{0}{1}".format(obj.root_uri, UPDATE_SERVICE))
-    action_attr = action_resp.json_data["Actions"]
+    """Returns all the URI which is required for firmware update, which are kept in the discovery cache if any."""
+    update_service = obj.discover("update_service", _resolve_update_service)
     protocol = module.params["transfer_protocol"]
     update_uri = None
-    push_uri = action_resp.json_data.get('HttpPushUri')
-    inventory_uri = action_resp.json_data.get('FirmwareInventory').get('@odata.id')
-    if "#UpdateService.SimpleUpdate" in action_attr:
-        update_service = action_attr.get("#UpdateService.SimpleUpdate")
-        proto = update_service.get("TransferProtocol@Redfish.AllowableValues")
-        if isinstance(proto, list) and protocol in proto and 'target' in update_service:
-            update_uri = update_service.get('target')
+    push_uri = update_service["push_uri"]
+    inventory_uri = update_service["inventory_uri"]
+    if update_service["simple_update"]:
+        proto = update_service["protocols"]
+        if isinstance(proto, list) and protocol in proto and update_service["update_uri"]:
+            update_uri = update_service["update_uri"]
         else:
             module.fail_json(msg="Target firmware version doesn't support {0} protocol.".format(protocol))
     if update_uri is None or push_uri is None or inventory_uri is None:
@@ -178,11 +248,12 @@ def firmware_update(obj, module):
         update_status = obj.invoke_request("POST", update_uri, data=payload)
     else:
         resp_inv = obj.invoke_request("GET", inventory_uri)
-        binary_payload = {"file": (image_path.split(os.sep)[-1], open(os.path.join(image_path), "rb"), "multipart/form-data")}
-        data, ctype = _encode_form_data(binary_payload)
-        headers = {"If-Match": resp_inv.headers.get("etag")}
-        headers.update({"Content-Type": ctype})
-        upload_status = obj.invoke_request("POST", push_uri, data=data, headers=headers, dump=False, api_timeout=100)
+        with open(image_path, "rb") as image:
+            data, ctype = multipart_file_body(image, image_path.split(os.sep)[-1], content_type="multipart/form-data")
+            headers = {"If-Match": resp_inv.headers.get("etag"), "Content-Type": ctype,
+                       "Content-Length": str(len(data))}
+            upload_status = obj.invoke_request("POST", push_uri, data=data, headers=headers, dump=False,
+                                               api_timeout=100)
         if upload_status.status_code == 201:
             payload = {"ImageURI": upload_status.headers.get("location")}
             update_status = obj.invoke_request("POST", update_uri, data=payload)
@@ -191,8 +262,26 @@ def firmware_update(obj, module):
     return update_status
 
 
+def wait_for_update_task(module, obj, task_uri):
+    """Tracks the update task until it completes or is scheduled, and exits with its final status."""
+    task = {"id": task_uri.split("/")[-1], "uri": task_uri}
+    monitor = TaskMonitor(obj, max_interval=FIRMWARE_POLL_MAX_INTERVAL)
+    task_status = monitor.wait(task_uri, timeout=module.params["job_wait_timeout"], stop_states=("Pending",))
+    if task_status["timed_out"]:
+        module.fail_json(msg="The firmware update task did not complete within {0} seconds."
+                         .format(module.params["job_wait_timeout"]), task=task, task_status=task_status)
+    elif task_status["state"] == "Pending":
+        module.exit_json(msg="Successfully scheduled the firmware update task, which is applied on the next reboot.",
+                         task=task, task_status=task_status, changed=True)
+    elif task_status["state"] != "Completed" or task_status["status"] != "OK":
+        module.fail_json(msg="The firmware update task ended with state '{0}' and status '{1}'."
+                         .format(task_status["state"], task_status["status"]), task=task, task_status=task_status)
+    module.exit_json(msg="Successfully completed the firmware update task.", task=task,
+                     task_status=task_status, changed=True)
+
+
 def main():
-    module = AnsibleModule(
+    module = PerfAnsibleModule(
         argument_spec={
             "baseuri": {"required": True, "type": "str"},
             "username": {"required": True, "type": "str"},
@@ -200,10 +289,10 @@ def main():
             "image_uri": {"required": True, "type": "str"},
             "transfer_protocol": {"type": "str", "default": "HTTP",
                                   "choices": ["CIFS", "FTP", "HTTP", "HTTPS", "NSF", "OEM", "SCP", "SFTP", "TFTP"]},
+            "job_wait": {"type": "bool", "default": False},
+            "job_wait_timeout": {"type": "int", "default": 3600},
         },
         supports_check_mode=False)
-    if not HAS_LIB:
-        module.fail_json(msg=missing_required_lib("urllib3"))
     try:
         message = "Failed to submit the firmware update task."
         with Redfish(module.params, req_session=True) as obj:
@@ -211,6 +300,8 @@ def main():
             if status.success:
                 message = "Successfully submitted the firmware update task."
                 task_uri = status.headers.get("Location")
+                if module.params["job_wait"]:
+                    wait_for_update_task(module, obj, task_uri)
                 task_id = task_uri.split("/")[-1]
                 module.exit_json(msg=message, task={"id": task_id, "uri": task_uri}, changed=True)
             module.fail_json(msg=message, error_info=json.loads(status))
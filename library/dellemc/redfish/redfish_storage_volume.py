@@ -24,6 +24,8 @@ short_description: Manages the storage volume configuration.
 version_added: "2.9"
 description:
    - This module allows to create, modify, initialize, or delete a single storage volume.
+   - When the C(REDFISH_DISCOVERY_CACHE) environment variable names a file, the storage collection URI is cached
+     there per host, and later runs against the same firmware version skip its lookup.
 options:
   baseuri:
     description: "IP address of the target out-of-band controller. For example- <ipaddress>:<port>"
@@ -152,6 +154,18 @@ options:
     required: False
     choices: [Fast, Slow]
     default: Fast
+  job_wait:
+    description:
+      - Wait for the storage configuration task within the same session.
+      - The wait ends when the task completes, or when it is C(Pending) because the operation is
+        scheduled to be applied on the next reboot.
+      - The module fails if the task does not complete successfully or times out.
+    type: bool
+    default: False
+  job_wait_timeout:
+    description: Maximum time in seconds to wait for the task when I(job_wait) is C(True).
+    type: int
+    default: 3600
 
 requirements:
   - "python >= 2.7.5"
@@ -215,6 +229,18 @@ EXAMPLES = r'''
     command: "initialize"
     volume_id: "Disk.Virtual.6:RAID.Slot.1-1"
     initialize_type: "Slow"
+
+- name: Create a volume and wait for the create volume task.
+  redfish_storage_volume:
+    baseuri: "192.168.0.1"
+    username: "username"
+    password: "password"
+    state: "present"
+    controller_id: "RAID.Slot.1-1"
+    volume_type: "NonRedundant"
+    drives:
+       - Disk.Bay.1:Enclosure.Internal.0-1:RAID.Slot.1-1
+    job_wait: true
 '''
 
 RETURNS = r'''
@@ -232,6 +258,27 @@ task:
     "id": "JID_XXXXXXXXXXXXX",
     "uri": "/redfish/v1/TaskService/Tasks/JID_XXXXXXXXXXXXX"
   }
+task_status:
+  type: dict
+  description: Final state, status, progress and messages of the task.
+  returned: when I(job_wait) is C(True)
+  sample: {
+    "id": "JID_XXXXXXXXXXXXX",
+    "uri": "/redfish/v1/TaskService/Tasks/JID_XXXXXXXXXXXXX",
+    "state": "Completed",
+    "status": "OK",
+    "percent_complete": 100,
+    "messages": [
+        {
+            "Message": "Job completed successfully.",
+            "MessageId": "PR19"
+        }
+    ],
+    "resource_uri": null,
+    "timed_out": false,
+    "polls": 5,
+    "elapsed_seconds": 18.2
+  }
 error_info:
   type: dict
   description: Details of a http error.
@@ -257,11 +304,46 @@ error_info:
         "message": "A general error has occurred. See ExtendedInfo for more information"
     }
   }
+perf:
+  description:
+    - Summary of the HTTP requests made by the module, with the bytes sent and received, the time spent
+      connecting, waiting for the first byte, reading and decoding the responses, and the slowest requests.
+    - The records of all the requests are appended to the JSONL file named by the DELLEMC_PERF_TRACE
+      environment variable, when it is set.
+  returned: when the DELLEMC_PERF or DELLEMC_PERF_TRACE environment variable is set
+  type: dict
+  sample: {
+    "requests": 4,
+    "retries": 0,
+    "bytes_sent": 512,
+    "bytes_received": 20480,
+    "connect_ms": 12.1,
+    "first_byte_ms": 310.5,
+    "read_ms": 20.2,
+    "decode_ms": 1.3,
+    "total_ms": 344.1,
+    "slowest": [{
+      "client": "redfish",
+      "host": "192.168.0.1",
+      "method": "POST",
+      "path": "/redfish/v1/Systems/System.Embedded.1/Storage/RAID.Slot.1-1/Volumes",
+      "status": 200,
+      "sent": 512,
+      "received": 2048,
+      "retries": 0,
+      "start": 1591005600.0,
+      "connect_ms": 4.1,
+      "first_byte_ms": 200.3,
+      "read_ms": 2.2,
+      "decode_ms": 0.4,
+      "total_ms": 207.0
+    }]
+  }
 '''
 
 import json
-from ansible.module_utils.remote_management.dellemc.redfish import Redfish
-from ansible.module_utils.basic import AnsibleModule
+from ansible.module_utils.remote_management.dellemc.redfish import Redfish, TaskMonitor
+from ansible.module_utils.remote_management.dellemc.perf import PerfAnsibleModule
 from ansible.module_utils.six.moves.urllib.error import URLError, HTTPError
 from ansible.module_utils.urls import ConnectionError, SSLValidationError
 
@@ -272,24 +354,33 @@ CONTROLLER_URI = "{storage_base_uri}/{controller_id}"
 SETTING_VOLUME_ID_URI = "{storage_base_uri}/Volumes/{volume_id}/Settings"
 CONTROLLER_VOLUME_URI = "{storage_base_uri}/{controller_id}/Volumes"
 VOLUME_ID_URI = "{storage_base_uri}/Volumes/{volume_id}"
+VOLUME_TASK_SUBMITTED_MSG = "Successfully submitted {action} volume task."
+VOLUME_TASK_SCHEDULED_MSG = "Successfully scheduled {action} volume task, which is applied on the next reboot."
+VOLUME_TASK_COMPLETED_MSG = "Successfully completed {action} volume task."
 storage_collection_map = {}
 
 
+def _resolve_storage_resource(session_obj):
+    """Looks up the storage collection of the first system."""
+    system_uri = "{0}{1}".format(session_obj.root_uri, "Systems")
+    system_resp = session_obj.invoke_request("GET", system_uri)
+    system_members = system_resp.json_data.get("Members")
+    if system_members:
+        system_id_res = system_members[0]["@odata.id"]
+        system_id_res_resp = session_obj.invoke_request("GET", system_id_res)
+        system_id_res_data = system_id_res_resp.json_data.get("Storage")
+        if system_id_res_data:
+            return {"storage_base_uri": system_id_res_data["@odata.id"]}
+    return {}
+
+
 def fetch_storage_resource(module, session_obj):
+    """Finds the storage collection, which is kept in the discovery cache of the session if any."""
     try:
-        system_uri = "{0}{1}".format(session_obj.root_uri, "Systems")
-        system_resp = session_obj.invoke_request("GET", system_uri)
-        system_members = system_resp.json_data.get("Members")
-        if system_members:
-            system_id_res = system_members[0]["@odata.id"]
-            system_id_res_resp = session_obj.invoke_request("GET", system_id_res)
-            system_id_res_data = system_id_res_resp.json_data.get("Storage")
-            if system_id_res_data:
-                storage_collection_map.update({"storage_base_uri": system_id_res_data["@odata.id"]})
-            else:
-                module.fail_json(msg="Target out-of-band controller does not support storage feature using Redfish API.")
-        else:
+        storage_resource = session_obj.discover("storage", _resolve_storage_resource)
+        if not storage_resource:
             module.fail_json(msg="Target out-of-band controller does not support storage feature using Redfish API.")
+        storage_collection_map.update(storage_resource)
     except HTTPError as err:
         if err.code in [404, 405]:
             module.fail_json(msg="Target out-of-band controller does not support storage feature using Redfish API.",
@@ -507,14 +598,34 @@ def get_success_message(action, task_uri):
     """
     message for different types of raid actions
     """
-    msg = "Successfully submitted {0} volume task.".format(action)
-    status_message = {"msg": msg}
+    msg = VOLUME_TASK_SUBMITTED_MSG.format(action=action)
+    status_message = {"msg": msg, "action": action}
     if task_uri is not None:
         task_id = task_uri.split("/")[-1]
         status_message.update({"task_uri": task_uri, "task_id": task_id})
     return status_message
 
 
+def wait_for_volume_task(module, session_obj, status_message):
+    """
+    track the volume task until it completes or is scheduled, and exit with its final status
+    """
+    task = {"uri": status_message.get("task_uri"), "id": status_message.get("task_id")}
+    task_status = TaskMonitor(session_obj).wait(task["uri"], timeout=module.params["job_wait_timeout"],
+                                                stop_states=("Pending",))
+    if task_status["timed_out"]:
+        module.fail_json(msg="The volume task did not complete within {0} seconds."
+                         .format(module.params["job_wait_timeout"]), task=task, task_status=task_status)
+    elif task_status["state"] == "Pending":
+        module.exit_json(msg=VOLUME_TASK_SCHEDULED_MSG.format(action=status_message["action"]),
+                         task=task, task_status=task_status, changed=True)
+    elif task_status["state"] != "Completed" or task_status["status"] != "OK":
+        module.fail_json(msg="The volume task ended with state '{0}' and status '{1}'."
+                         .format(task_status["state"], task_status["status"]), task=task, task_status=task_status)
+    module.exit_json(msg=VOLUME_TASK_COMPLETED_MSG.format(action=status_message["action"]), task=task,
+                     task_status=task_status, changed=True)
+
+
 def validate_inputs(module):
     """
     validation check for state and command input for null values.
@@ -532,7 +643,7 @@ def validate_inputs(module):
 
 
 def main():
-    module = AnsibleModule(
+    module = PerfAnsibleModule(
         argument_spec={
             "baseuri": {"required": True, "type": "str"},
             "username": {"required": True, "type": "str"},
@@ -555,6 +666,8 @@ def main():
             "volume_id": {"required": False, "type": "str"},
             "oem": {"required": False, "type": "dict"},
             "initialize_type": {"type": "str", "required": False, "choices": ['Fast', 'Slow'], "default": "Fast"},
+            "job_wait": {"required": False, "type": "bool", "default": False},
+            "job_wait_timeout": {"required": False, "type": "int", "default": 3600},
 
         },
         mutually_exclusive=[['state', 'command']],
@@ -568,6 +681,8 @@ def main():
         with Redfish(module.params, req_session=True) as session_obj:
             fetch_storage_resource(module, session_obj)
             status_message = configure_raid_operation(module, session_obj)
+            if module.params["job_wait"] and status_message.get("task_uri"):
+                wait_for_volume_task(module, session_obj, status_message)
             task_status = {"uri": status_message.get("task_uri"), "id": status_message.get("task_id")}
             module.exit_json(msg=status_message["msg"], task=task_status, changed=True)
     except HTTPError as err:
@@ -0,0 +1,122 @@
+# -*- coding: utf-8 -*-
+
+#
+# Dell EMC OpenManage Ansible Modules
+# Version 2.0.7
+# Copyright (C) 2020 Dell Inc.
+
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+# All rights reserved. Dell, EMC, and other trademarks are trademarks of Dell Inc. or its subsidiaries.
+# Other trademarks may be trademarks of their respective owners.
+#
+
+"""
+Microbenchmark of the JSON decoding of OpenURLResponse.json_data.
+
+Decodes device inventory pages, with nested DeviceManagement records, and reads json_data
+three times per response, as ome_device_info does. It compares the time per response of:
+  before  - json.loads of the body on every access, as json_data did before it was cached
+  json    - the cached json_data, decoded once with the standard json module
+  orjson  - the cached json_data, decoded once with orjson, when orjson is importable
+
+The modules must be installed with install.py, so that OpenURLResponse is importable from
+ansible.module_utils.remote_management.dellemc.
+
+Usage: python test/perf/bench_json_decode.py [--devices 50 5000] [--accesses 3]
+"""
+
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+import argparse
+import json
+import time
+from ansible.module_utils.remote_management.dellemc import ome
+from ansible.module_utils.remote_management.dellemc.ome import OpenURLResponse
+
+BATCHES = 3
+MIN_BATCH_SECONDS = 0.2
+
+
+class Body(object):
+    """HTTPResponse stand-in which returns a fixed body"""
+
+    def __init__(self, body):
+        self.body = body
+
+    def read(self):
+        return self.body
+
+
+def inventory_page(devices):
+    value = []
+    for index in range(devices):
+        value.append({
+            "Id": 10000 + index, "Type": 1000, "Identifier": "SVC{0:04d}".format(index),
+            "DeviceServiceTag": "SVC{0:04d}".format(index), "ChassisServiceTag": None,
+            "Model": "PowerEdge R740", "PowerState": 17, "ManagedState": 3000, "Status": 1000,
+            "ConnectionState": True, "AssetTag": None, "SystemId": 1894,
+            "DeviceName": "server-{0}.example.com".format(index),
+            "LastInventoryTime": "2020-06-01 10:00:00.000", "LastStatusTime": "2020-06-01 10:05:00.000",
+            "DeviceSubscription": None, "DeviceCapabilities": list(range(1, 40)),
+            "SlotConfiguration": {"ChassisName": None},
+            "DeviceManagement": [{
+                "ManagementId": 20000 + index, "NetworkAddress": "10.0.{0}.{1}".format(index // 250, index % 250),
+                "MacAddress": "4c:d9:8f:{0:02x}:{1:02x}:00".format(index // 256 % 256, index % 256),
+                "ManagementType": 2, "InstrumentationName": "server-{0}".format(index),
+                "DnsName": "idrac-svc{0:04d}".format(index),
+                "ManagementProfile": [{
+                    "ManagementProfileId": 20000 + index, "ProfileId": "WSMAN_OOB", "ManagementId": 20000 + index,
+                    "AgentName": "iDRAC", "Version": "4.20.20.20", "ManagementURL": "https://10.0.0.1:443",
+                    "HasCreds": 0, "Status": 1000, "StatusDateTime": "2020-06-01 10:05:00.000"}]}],
+            "Actions": None})
+    return json.dumps({"@odata.context": "/api/$metadata#Collection(DeviceService.Device)",
+                       "@odata.count": devices, "value": value}).encode()
+
+
+def before(body, accesses):
+    for access in range(accesses):
+        json.loads(body)
+
+
+def cached(body, accesses):
+    response = OpenURLResponse(Body(body))
+    for access in range(accesses):
+        response.json_data
+
+
+def ms_per_response(func, body, accesses):
+    """Best mean over BATCHES batches, each running for at least MIN_BATCH_SECONDS"""
+    best = None
+    for batch in range(BATCHES):
+        runs, start = 0, time.time()
+        while runs == 0 or time.time() - start < MIN_BATCH_SECONDS:
+            func(body, accesses)
+            runs += 1
+        mean = (time.time() - start) * 1000 / runs
+        best = mean if best is None else min(best, mean)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Microbenchmark of the JSON decoding of OpenURLResponse")
+    parser.add_argument("--devices", type=int, nargs="+", default=[50, 5000], help="devices per page")
+    parser.add_argument("--accesses", type=int, default=3, help="json_data accesses per response")
+    args = parser.parse_args()
+
+    has_orjson = ome.HAS_ORJSON
+    print("ms per response, {0} json_data accesses each".format(args.accesses))
+    for devices in args.devices:
+        body = inventory_page(devices)
+        timings = [("before", ms_per_response(before, body, args.accesses))]
+        ome.HAS_ORJSON = False
+        timings.append(("json", ms_per_response(cached, body, args.accesses)))
+        ome.HAS_ORJSON = has_orjson
+        if has_orjson:
+            timings.append(("orjson", ms_per_response(cached, body, args.accesses)))
+        print("  {0:>5} devices ({1:>7.1f} KB): {2}".format(
+            devices, len(body) / 1024, ", ".join("{0} {1:.2f}".format(name, ms) for name, ms in timings)))
+
+
+if __name__ == "__main__":
+    main()
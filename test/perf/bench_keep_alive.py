@@ -0,0 +1,136 @@
+# -*- coding: utf-8 -*-
+
+#
+# Dell EMC OpenManage Ansible Modules
+# Version 2.0.7
+# Copyright (C) 2020 Dell Inc.
+
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+# All rights reserved. Dell, EMC, and other trademarks are trademarks of Dell Inc. or its subsidiaries.
+# Other trademarks may be trademarks of their respective owners.
+#
+
+"""
+Benchmark of the RestOME keep-alive connection pool.
+
+Starts a threaded HTTP/1.1 stand-in for an OME appliance on localhost, which answers every
+GET with a page of device records over HTTPS, and measures the requests per second of
+sequential GETs sent through RestOME with and without keep_alive.
+
+The modules must be installed with install.py, so that RestOME is importable from
+ansible.module_utils.remote_management.dellemc. The self-signed certificate of the stand-in
+is created with the openssl command line tool, unless --http is given.
+
+Usage: python test/perf/bench_keep_alive.py [--requests 300] [--records 50] [--http]
+"""
+
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+import argparse
+import json
+import os
+import shutil
+import ssl
+import subprocess
+import tempfile
+import threading
+import time
+from ansible.module_utils.six.moves.BaseHTTPServer import HTTPServer, BaseHTTPRequestHandler
+from ansible.module_utils.six.moves.socketserver import ThreadingMixIn
+from ansible.module_utils.remote_management.dellemc.ome import RestOME
+
+
+class StandInServer(ThreadingMixIn, HTTPServer):
+    daemon_threads = True
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    """Answers every GET with the same page of device records over keep-alive connections."""
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def setup(self):
+        BaseHTTPRequestHandler.setup(self)
+        self.server.connections += 1
+
+    def do_GET(self):
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(self.server.page)))
+        self.end_headers()
+        self.wfile.write(self.server.page)
+
+    def log_message(self, *args):
+        pass
+
+
+def device_page(records):
+    devices = [{"Id": 10000 + index, "DeviceServiceTag": "SVC{0:04d}".format(index), "Type": 1000,
+                "PowerState": 17, "Status": 1000, "Model": "PowerEdge R740",
+                "DeviceName": "server-{0}".format(index)} for index in range(records)]
+    return json.dumps({"@odata.count": records, "value": devices}).encode()
+
+
+def self_signed_context(directory):
+    """Server SSL context with a self-signed certificate for localhost created in I(directory)"""
+    certfile, keyfile = os.path.join(directory, "cert.pem"), os.path.join(directory, "key.pem")
+    subprocess.check_call(["openssl", "req", "-x509", "-newkey", "rsa:2048", "-nodes", "-days", "1",
+                           "-subj", "/CN=localhost", "-keyout", keyfile, "-out", certfile],
+                          stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+    context = ssl.create_default_context(ssl.Purpose.CLIENT_AUTH)
+    context.load_cert_chain(certfile, keyfile)
+    return context
+
+
+def requests_per_second(server, protocol, keep_alive, requests):
+    """
+    Sends I(requests) sequential GETs through RestOME, after a few warm-up GETs.
+    :returns: requests per second, and the number of connections opened after the warm-up
+    """
+    module_params = {"hostname": "127.0.0.1", "username": "admin", "password": "password",
+                     "port": server.server_port}
+    rest_obj = RestOME(module_params, req_session=False, keep_alive=keep_alive)
+    rest_obj.protocol = protocol
+    with rest_obj:
+        for skip in range(5):
+            rest_obj.invoke_request("GET", "DeviceService/Devices", query_param={"$skip": skip})
+        server.connections = 0
+        start = time.time()
+        for skip in range(requests):
+            rest_obj.invoke_request("GET", "DeviceService/Devices", query_param={"$skip": skip}).json_data
+        elapsed = time.time() - start
+    return requests / elapsed, server.connections
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark of the RestOME keep-alive connection pool")
+    parser.add_argument("--requests", type=int, default=300, help="number of sequential GETs per run")
+    parser.add_argument("--records", type=int, default=50, help="number of device records per page")
+    parser.add_argument("--http", action="store_true", help="serve plain HTTP instead of HTTPS")
+    args = parser.parse_args()
+
+    server = StandInServer(("127.0.0.1", 0), StandInHandler)
+    server.connections, server.page = 0, device_page(args.records)
+    protocol = "http" if args.http else "https"
+    directory = tempfile.mkdtemp()
+    try:
+        if not args.http:
+            server.socket = self_signed_context(directory).wrap_socket(server.socket, server_side=True)
+        thread = threading.Thread(target=server.serve_forever)
+        thread.daemon = True
+        thread.start()
+        print("{0} sequential {1} GETs of a {2}-record page ({3} bytes)".format(
+            args.requests, protocol.upper(), args.records, len(server.page)))
+        for name, keep_alive in (("open_url", False), ("keep-alive", True)):
+            rate, connections = requests_per_second(server, protocol, keep_alive, args.requests)
+            print("  {0:<11} {1:8.0f} req/s  {2:6.2f} ms/req  {3} new connection(s)".format(
+                name + ":", rate, 1000 / rate, connections))
+    finally:
+        server.shutdown()
+        server.server_close()
+        shutil.rmtree(directory)
+
+
+if __name__ == "__main__":
+    main()
@@ -19,6 +19,7 @@ from units.modules.utils import set_module_args, exit_json, fail_json
 from units.modules.utils import AnsibleFailJson, AnsibleExitJson
 from units.compat.mock import MagicMock
 import json
+from ansible.module_utils.six.moves.urllib.parse import urlparse, parse_qsl
 
 
 @pytest.fixture(autouse=True)
@@ -43,6 +44,38 @@ def ome_response_mock(mocker):
     return response_class_mock
 
 
+@pytest.fixture
+def ome_appliance_mock(mocker):
+    """
+    Routes the open_url calls of RestOME to a fake appliance, which creates sessions and serves the
+    $top/$skip pages of the collections in 'collections'. The URL of every GET is kept in 'requests'.
+    """
+    appliance = {"collections": {}, "requests": []}
+
+    def open_url(url, data=None, method="GET", **kwargs):
+        path = urlparse(url).path.split("/api/", 1)[1]
+        resp = MagicMock()
+        resp.getcode.return_value = 200
+        resp.headers = {"X-Auth-Token": "token"}
+        if path == "SessionService/Sessions":
+            resp.getcode.return_value = 201
+            body = {"Id": "session"}
+        elif method == "DELETE":
+            resp.getcode.return_value = 204
+            body = {}
+        else:
+            appliance["requests"].append(url)
+            query = dict(parse_qsl(urlparse(url).query))
+            records = appliance["collections"][path]
+            skip, top = int(query.get("$skip", 0)), int(query.get("$top", len(records)))
+            body = {"@odata.context": "/api/$metadata#Collection({0})".format(path),
+                    "@odata.count": len(records), "value": records[skip:skip + top]}
+        resp.read.return_value = json.dumps(body).encode()
+        return resp
+    mocker.patch('ansible.module_utils.remote_management.dellemc.ome.open_url', side_effect=open_url)
+    return appliance
+
+
 @pytest.fixture
 def redfish_response_mock(mocker):
     set_method_result = {'json_data': {}}
@@ -0,0 +1,120 @@
+# -*- coding: utf-8 -*-
+
+#
+# Dell EMC OpenManage Ansible Modules
+# Version 2.0.7
+# Copyright (C) 2020 Dell Inc.
+
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+# All rights reserved. Dell, EMC, and other trademarks are trademarks of Dell Inc. or its subsidiaries.
+# Other trademarks may be trademarks of their respective owners.
+#
+
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+import pytest
+from ansible.modules.remote_management.dellemc import dellemc_ome_job_facts
+from units.modules.remote_management.dellemc.common import FakeAnsibleModule
+
+
+@pytest.fixture
+def ome_connection_job_facts_mock(mocker, ome_response_mock):
+    connection_class_mock = mocker.patch('ansible.modules.remote_management.dellemc.dellemc_ome_job_facts.RestOME')
+    ome_connection_mock_obj = connection_class_mock.return_value.__enter__.return_value
+    ome_connection_mock_obj.invoke_request.return_value = ome_response_mock
+    ome_connection_mock_obj._session_key.return_value = "username@192.168.0.1:443"
+    return ome_connection_mock_obj
+
+
+def job(job_id, status="Completed", last_run="2020-06-01 10:00:00.000"):
+    return {"Id": job_id, "JobName": "Job {0}".format(job_id), "LastRunStatus": {"Name": status},
+            "LastRun": last_run, "UpdatedDate": None}
+
+
+class TestOmeJobFacts(FakeAnsibleModule):
+    module = dellemc_ome_job_facts
+
+    def test_job_ids(self, ome_default_args, ome_connection_job_facts_mock):
+        jobs = {10: job(10), 11: job(11, "Failed")}
+        ome_connection_job_facts_mock.iter_collection.side_effect = lambda uri, select=None, query_param=None: [
+            jobs[int(clause.split()[-1])] for clause in query_param["$filter"].split(" or ")
+            if int(clause.split()[-1]) in jobs]
+        ome_default_args.update({"job_ids": [11, 10, 12, 11]})
+        result = self._run_module(ome_default_args)
+        assert [item["Id"] for item in result["job_facts"]["value"]] == [11, 10]
+        assert result["job_summary"]["missing"] == [12]
+        assert result["job_summary"]["failed"] == [11]
+        assert result["job_summary"]["status_counts"] == {"Completed": 1, "Failed": 1}
+        ome_connection_job_facts_mock.iter_collection.assert_called_once_with(
+            "JobService/Jobs", select=None, query_param={"$filter": "Id eq 11 or Id eq 10 or Id eq 12"})
+
+    def test_job_wait(self, mocker, ome_default_args, ome_connection_job_facts_mock):
+        states = {10: ["Running", "Completed"], 11: ["Completed"]}
+        polls = []
+
+        def iter_collection(uri, select=None, query_param=None):
+            job_ids = [int(clause.split()[-1]) for clause in query_param["$filter"].split(" or ")]
+            if select:
+                polls.append(job_ids)
+                return [job(job_id, states[job_id].pop(0)) for job_id in job_ids]
+            return [job(job_id) for job_id in job_ids]
+        ome_connection_job_facts_mock.iter_collection.side_effect = iter_collection
+        ome_default_args.update({"job_ids": [10, 11], "job_wait": True, "job_wait_timeout": 60})
+        sleep, job_tracker = [], self.module.JobTracker
+        mocker.patch('ansible.modules.remote_management.dellemc.dellemc_ome_job_facts.JobTracker',
+                     side_effect=lambda rest_obj: job_tracker(rest_obj, sleep=sleep.append))
+        result = self._run_module(ome_default_args)
+        assert sleep == [2]
+        assert polls == [[10, 11], [10]]
+        assert result["job_summary"]["timed_out"] is False
+        assert result["job_summary"]["polls"] == 2
+        assert result["job_summary"]["status_counts"] == {"Completed": 2}
+        assert [item["Id"] for item in result["job_facts"]["value"]] == [10, 11]
+
+    def test_job_wait_timed_out(self, mocker, ome_default_args, ome_connection_job_facts_mock):
+        tracker_mock = mocker.patch('ansible.modules.remote_management.dellemc.dellemc_ome_job_facts.JobTracker')
+        tracker_mock.return_value.wait_all.return_value = (
+            {10: job(10, "Running")}, {"total": 1, "pending": [10], "timed_out": True})
+        ome_default_args.update({"job_ids": [10], "job_wait": True, "job_wait_timeout": 60})
+        result = self._run_module_with_fail_json(ome_default_args)
+        assert result["msg"] == "Timed out after 60 seconds waiting for the jobs to complete."
+        assert result["job_summary"]["pending"] == [10]
+        tracker_mock.return_value.wait_all.assert_called_once_with([10], timeout=60)
+
+    def test_job_wait_without_job_ids(self, ome_default_args):
+        ome_default_args.update({"job_wait": True})
+        result = self._run_module_with_fail_json(ome_default_args)
+        assert result["msg"] == "job_ids is required when job_wait is true."
+
+    def test_cursor_file_round_trip(self, ome_default_args, ome_connection_job_facts_mock, tmpdir):
+        jobs = [job(10, last_run="2020-06-01 10:00:00.000"), job(11, last_run="2020-06-01 10:05:00.000")]
+        queries = []
+
+        def iter_collection(uri, query_param=None):
+            queries.append(query_param)
+            if query_param is None:
+                return list(jobs)
+            cursor = query_param["$filter"].split("'")[1]
+            return [item for item in jobs if item["LastRun"] >= cursor]
+        ome_connection_job_facts_mock.iter_collection.side_effect = iter_collection
+        ome_default_args.update({"cursor_file": str(tmpdir.join("cursor.json"))})
+        first = self._run_module(ome_default_args)
+        assert [item["Id"] for item in first["job_facts"]["value"]] == [10, 11]
+        assert first["job_cursor"] == {"previous": None, "current": "2020-06-01 10:05:00.000", "changed": 2}
+        jobs.append(job(12, last_run="2020-06-01 10:09:00.000"))
+        second = self._run_module(ome_default_args)
+        assert [item["Id"] for item in second["job_facts"]["value"]] == [12]
+        assert second["job_cursor"] == {"previous": "2020-06-01 10:05:00.000",
+                                        "current": "2020-06-01 10:09:00.000", "changed": 1}
+        assert queries[1] == {"$filter": "(LastRun ge '2020-06-01 10:05:00.000' or "
+                                         "UpdatedDate ge '2020-06-01 10:05:00.000')"}
+
+    def test_select_max_items(self, ome_default_args, ome_connection_job_facts_mock):
+        ome_connection_job_facts_mock.get_collection.return_value = {"value": [{"Id": 10, "JobName": "Job 10"}]}
+        ome_default_args.update({"system_query_options": {"filter": "JobType/Id eq 8", "select": ["Id", "JobName"]},
+                                 "max_items": 1})
+        result = self._run_module(ome_default_args)
+        assert result["job_facts"] == {"value": [{"Id": 10, "JobName": "Job 10"}]}
+        ome_connection_job_facts_mock.get_collection.assert_called_once_with(
+            "JobService/Jobs", query_param={"$filter": "JobType/Id eq 8"}, select=["Id", "JobName"], max_items=1)
@@ -74,4 +74,22 @@ class TestIdracRedfishStorageController(FakeAnsibleModule):
         idrac_connection_mock_for_redfish_storage_controller.invoke_request.side_effect = input["error"]
         with pytest.raises(Exception) as exc:
             self.module.check_raid_service(f_module, idrac_connection_mock_for_redfish_storage_controller)
-        assert exc.value.args[0] == input['msg']
\ No newline at end of file
+        assert exc.value.args[0] == input['msg']
+
+    @pytest.mark.parametrize("volumes,msg", [
+        ([{}, {}], None),
+        ([{}, None], "Unable to locate the virtual disk with the ID: Disk.Virtual.1:RAID.Slot.1-1")])
+    def test_check_volume_array_exists(self, idrac_connection_mock_for_redfish_storage_controller, volumes, msg):
+        volume_ids = ["Disk.Virtual.0:RAID.Slot.1-1", "Disk.Virtual.1:RAID.Slot.1-1"]
+        f_module = self.get_module_mock(params={"volume_id": volume_ids})
+        idrac_connection_mock_for_redfish_storage_controller.get_resources.return_value = volumes
+        if msg is None:
+            self.module.check_volume_array_exists(f_module, idrac_connection_mock_for_redfish_storage_controller)
+        else:
+            with pytest.raises(Exception) as exc:
+                self.module.check_volume_array_exists(f_module, idrac_connection_mock_for_redfish_storage_controller)
+            assert exc.value.args[0] == msg
+        uris = idrac_connection_mock_for_redfish_storage_controller.get_resources.call_args[0][0]
+        assert list(uris) == ["/redfish/v1/Systems/System.Embedded.1/Storage/Volumes/Disk.Virtual.0:RAID.Slot.1-1",
+                              "/redfish/v1/Systems/System.Embedded.1/Storage/Volumes/Disk.Virtual.1:RAID.Slot.1-1"]
+        idrac_connection_mock_for_redfish_storage_controller.get_members.assert_not_called()
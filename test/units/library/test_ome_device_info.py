@@ -39,10 +39,9 @@ class TestOmeDeviceInfo(FakeAnsibleModule):
 
     def test_main_basic_inventory_success_case(self, ome_default_args, module_mock, validate_device_inputs_mock, ome_connection_mock,
                                                get_device_resource_parameters_mock, ome_response_mock):
-        ome_response_mock.json_data = {"@odata.context": "/api/$metadata#Collection(DeviceService.Device)", "@odata.count": 1}
-        increment_device_details = {"resp_obj": ome_response_mock, "report_list": [{"DeviceServiceTag": Constants.service_tag1,
-                                                                                    "Id": Constants.device_id1}]}
-        ome_connection_mock.get_all_report_details.return_value = increment_device_details
+        ome_connection_mock.get_device_inventory.return_value = {
+            "@odata.context": "/api/$metadata#Collection(DeviceService.Device)", "@odata.count": 1,
+            "value": [{"DeviceServiceTag": Constants.service_tag1, "Id": Constants.device_id1}]}
         ome_response_mock.status_code = 200
         result = self._run_module(ome_default_args)
         assert result['changed'] is False
@@ -68,7 +67,8 @@ class TestOmeDeviceInfo(FakeAnsibleModule):
                                                get_device_resource_parameters_mock, ome_response_mock):
         ome_response_mock.status_code = 500
         ome_response_mock.json_data = {"@odata.context": "/api/$metadata#Collection(DeviceService.Device)", "@odata.count": 0}
-        ome_connection_mock.get_all_report_details.return_value = {"resp_obj": ome_response_mock, "report_list": []}
+        ome_connection_mock.get_device_inventory.return_value = {
+            "@odata.context": "/api/$metadata#Collection(DeviceService.Device)", "@odata.count": 0, "value": []}
         result = self._run_module_with_fail_json(ome_default_args)
         assert result['msg'] == 'Failed to fetch the device information'
 
@@ -136,6 +136,7 @@ class TestOmeDeviceInfo(FakeAnsibleModule):
 
     @pytest.mark.parametrize("module_params", params)
     def test_get_resource_parameters(self, module_params, ome_connection_mock):
+        ome_connection_mock.resolve_devices.return_value = ({}, [])
         self.module._get_resource_parameters(module_params, ome_connection_mock)
 
     @pytest.mark.parametrize("module_params,data", [({"system_query_options": None}, None), ({"system_query_options": {"fileter": None}}, None),
@@ -164,45 +165,21 @@ class TestOmeDeviceInfo(FakeAnsibleModule):
         actual_res = self.module.is_int(val)
         assert actual_res == expected_res
 
-    def test_get_device_id_from_service_tags(self, ome_connection_mock, ome_response_mock, mocker):
-        mocker.patch('ansible.modules.remote_management.dellemc.ome_device_info.update_device_details_with_filtering')
-        ome_response_mock.json_data.update({"@odata.context": "/api/$metadata#Collection(DeviceService.Device)"})
-        ome_response_mock.json_data.update({"@odata.count": 1})
-        ome_connection_mock.get_all_report_details.return_value = {"resp_obj": ome_response_mock, "report_list": [{"DeviceServiceTag": Constants.service_tag1,
-                                                                                                                   "Id": Constants.device_id1}]}
-        self.module._get_device_id_from_service_tags([Constants.service_tag1, "INVALID"], ome_connection_mock)
+    def test_get_device_id_from_service_tags(self, ome_connection_mock):
+        ome_connection_mock.resolve_devices.return_value = (
+            {Constants.service_tag1: {"DeviceServiceTag": Constants.service_tag1, "Id": Constants.device_id1}},
+            ["INVALID"])
+        service_tag_dict = self.module._get_device_id_from_service_tags([Constants.service_tag1, "INVALID"],
+                                                                        ome_connection_mock)
+        assert service_tag_dict == {Constants.device_id1: Constants.service_tag1}
+        assert self.module.device_fact_error_report["INVALID"] == "HTTP Error 404: Not Found"
+        ome_connection_mock.resolve_devices.assert_called_with(service_tags=[Constants.service_tag1, "INVALID"])
 
     def test_get_device_id_from_service_tags_error_case(self, ome_connection_mock, ome_response_mock):
-        ome_connection_mock.get_all_report_details.side_effect = HTTPError('http://testhost.com', 400, '', {}, None)
+        ome_connection_mock.resolve_devices.side_effect = HTTPError('http://testhost.com', 400, '', {}, None)
         with pytest.raises(HTTPError) as ex:
             self.module._get_device_id_from_service_tags(["INVALID"], ome_connection_mock)
 
-    def test_update_device_details_with_filtering_success_case_01(self, ome_connection_mock, ome_response_mock):
-        non_available_tags = [Constants.service_tag2]
-        service_tag_dict = {Constants.device_id1: Constants.service_tag1}
-        ome_response_mock.json_data = {"value":[{"DeviceServiceTag": Constants.service_tag2, "Id": Constants.device_id2}]}
-        self.module.update_device_details_with_filtering(non_available_tags, service_tag_dict, ome_connection_mock)
-        assert service_tag_dict[Constants.device_id1] == Constants.service_tag1
-        assert service_tag_dict[Constants.device_id2] == Constants.service_tag2
-        assert len(non_available_tags) == 0
-
-    def test_update_device_details_with_filtering_success_case_02(self, ome_connection_mock, ome_response_mock):
-        non_available_tags = ["MX700"]
-        service_tag_dict = {Constants.device_id1: Constants.service_tag1}
-        ome_response_mock.json_data = {"value":[{"DeviceServiceTag": "MX7000", "Id": Constants.device_id2}]}
-        self.module.update_device_details_with_filtering(non_available_tags, service_tag_dict, ome_connection_mock)
-        assert service_tag_dict[Constants.device_id1] == Constants.service_tag1
-        assert Constants.device_id2 not in service_tag_dict
-        assert len(non_available_tags) == 1
-
-    def test_update_device_details_with_filtering_failure_case_01(self, ome_connection_mock, ome_response_mock):
-        error_msg = '400: Bad Request'
-        service_tag_dict = {}
-        non_available_tags = [Constants.service_tag2]
-        ome_connection_mock.invoke_request.side_effect =  HTTPError('http://testhost.com', 400, error_msg, {}, None)
-        with pytest.raises(HTTPError, match=error_msg) as ex:
-            self.module.update_device_details_with_filtering(non_available_tags, service_tag_dict, ome_connection_mock)
-
     def test_main_detailed_inventory_device_fact_error_report_case_01(self, ome_default_args, module_mock, validate_device_inputs_mock, ome_connection_mock,
                                                                       get_device_resource_parameters_mock, ome_response_mock):
         ome_default_args.update({"fact_subset": "detailed_inventory", "system_query_options": {"device_id": [Constants.device_id1],
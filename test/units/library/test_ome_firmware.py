@@ -12,11 +12,10 @@
 
 from __future__ import absolute_import
 
-from units.compat.mock import patch, mock_open
+from units.compat.mock import mock_open
 
 import pytest
 import json
-import sys
 from ansible.modules.remote_management.dellemc import ome_firmware
 from ansible.module_utils.six.moves.urllib.error import HTTPError, URLError
 from ansible.module_utils.urls import ConnectionError, SSLValidationError
@@ -262,18 +261,83 @@ class TestOmeFirmware(FakeAnsibleModule):
         data = self.module.get_dup_applicability_payload("1577786112600", None, None)
         assert data == duppayload["out"]
 
-    def test_upload_dup_file_success_case01(self, ome_connection_firmware_mock, ome_response_mock):
+    def test_upload_dup_file_success_case01(self, ome_connection_firmware_mock, ome_response_mock, tmpdir):
         ome_response_mock.json_data = "1577786112600"
         ome_response_mock.success = True
         ome_response_mock.status_code = 200
-        f_module = self.get_module_mock(params={'dup_file': "/root1/Ansible_EXE/BIOS_87V69_WN64_2.4.7.EXE"})
-        if sys.version_info.major == 3:
-            builtin_module_name = 'builtins'
-        else:
-            builtin_module_name = '__builtin__'
-        with patch("{0}.open".format(builtin_module_name), mock_open(read_data="data")) as mock_file:
-            result = self.module.upload_dup_file(ome_connection_firmware_mock, f_module)
+        dup_file = tmpdir.join("BIOS_87V69_WN64_2.4.7.EXE")
+        dup_file.write("data")
+        f_module = self.get_module_mock(params={'dup_file': str(dup_file)})
+        result = self.module.upload_dup_file(ome_connection_firmware_mock, f_module)
+        assert result == (True, "1577786112600")
+
+    def test_upload_dup_file_streams_with_progress(self, ome_connection_firmware_mock, ome_response_mock, tmpdir):
+        ome_response_mock.json_data = "1577786112600"
+        ome_response_mock.status_code = 200
+        dup_file = tmpdir.join("BIOS_87V69_WN64_2.4.7.EXE")
+        dup_file.write("x" * 1000)
+        sent = []
+
+        def invoke_request(method, uri, data=None, headers=None, api_timeout=30, dump=True):
+            while True:
+                chunk = data.read(64)
+                if not chunk:
+                    break
+                sent.append(chunk)
+            assert headers["Content-Length"] == "1000" and dump is False
+            assert api_timeout == self.module.DUP_UPLOAD_BASE_TIMEOUT
+            return ome_response_mock
+        ome_connection_firmware_mock.invoke_request.side_effect = invoke_request
+        f_module = self.get_module_mock(params={'dup_file': str(dup_file)})
+        progress = {}
+        result = self.module.upload_dup_file(ome_connection_firmware_mock, f_module, progress=progress)
         assert result == (True, "1577786112600")
+        assert b"".join(sent) == b"x" * 1000 and len(sent) == 16
+        assert progress["file"] == "BIOS_87V69_WN64_2.4.7.EXE"
+        assert progress["size"] == progress["sent"] == 1000
+        assert [checkpoint["percent"] for checkpoint in progress["checkpoints"]] == list(range(10, 101, 10))
+
+    @pytest.mark.parametrize("size,timeout", [(0, 100), (262144 * 400, 500)])
+    def test_dup_upload_timeout(self, size, timeout):
+        assert self.module.dup_upload_timeout(size) == timeout
+
+    @pytest.mark.parametrize("cached,stale", [(False, False), (True, False), (True, True)])
+    def test_get_dup_targets_upload_index(self, cached, stale, mocker, ome_connection_firmware_mock, tmpdir):
+        dup_file = tmpdir.join("BIOS_87V69_WN64_2.4.7.EXE")
+        dup_file.write("data")
+        sha256 = "3a6eb0790f39ac87c94f3856b2dd2c5d110e6811602261a9a923d3bb23adc8b7"
+        index_path = str(tmpdir.join("dup_index.json"))
+        key = "{0}@192.168.0.1:443".format(sha256)
+        if cached:
+            ome_firmware.DupUploadIndex(index_path).put(key, {"Token": "1111", "Uploaded": 0})
+        ome_connection_firmware_mock.hostname, ome_connection_firmware_mock.port = "192.168.0.1", 443
+        upload_mock = mocker.patch('ansible.modules.remote_management.dellemc.ome_firmware.upload_dup_file',
+                                   return_value=(True, "2222"))
+        reports = [[{"Id": 10}]]
+        if stale:
+            reports.insert(0, HTTPError('http://testhost.com', 400, 'Bad Request', {}, None))
+        report_mock = mocker.patch('ansible.modules.remote_management.dellemc.ome_firmware.get_applicable_components',
+                                   side_effect=reports)
+        f_module = self.get_module_mock(params={'dup_file': str(dup_file), 'dup_upload_index': index_path})
+        result = {}
+        targets = self.module.get_dup_targets(ome_connection_firmware_mock, f_module, device_ids=[10], result=result)
+        assert targets == [{"Id": 10}]
+        token = "1111" if cached and not stale else "2222"
+        assert result["dup_upload"] == {"sha256": sha256, "token": token, "reused": cached and not stale}
+        assert upload_mock.called is not (cached and not stale)
+        assert [call[0][1]["SingleUpdateReportFileToken"] for call in report_mock.call_args_list][-1] == token
+        assert ome_firmware.DupUploadIndex(index_path).get(key)["Token"] == token
+
+    def test_get_dup_targets_without_index(self, mocker, ome_connection_firmware_mock):
+        mocker.patch('ansible.modules.remote_management.dellemc.ome_firmware.upload_dup_file',
+                     return_value=(True, "2222"))
+        mocker.patch('ansible.modules.remote_management.dellemc.ome_firmware.get_applicable_components',
+                     return_value=[{"Id": 10}])
+        f_module = self.get_module_mock(params={'dup_file': "/path/BIOS_87V69_WN64_2.4.7.EXE"})
+        result = {}
+        assert self.module.get_dup_targets(ome_connection_firmware_mock, f_module, group_ids=[1],
+                                           result=result) == [{"Id": 10}]
+        assert result == {}
 
     def test_upload_dup_file_failure_case01(self, ome_response_mock, ome_connection_firmware_mock):
         ome_response_mock.json_data = {'value': [{"device_id": 28628,
@@ -286,34 +350,37 @@ class TestOmeFirmware(FakeAnsibleModule):
                                     "cannot be converted to a string".format("dup_file", type(True))
 
     def test_upload_dup_file_failure_case02(self, ome_default_args,
-                                            ome_connection_firmware_mock, ome_response_mock):
+                                            ome_connection_firmware_mock, ome_response_mock, tmpdir):
         ome_response_mock.json_data = {"value": [{"Id": [1111, 2222, 3333], "DeviceServiceTag": "KLBR222",
                                                   "dup_file": "/root/Ansible_EXE/BIOS_87V69_WN64_2.4.7.EXE"}]}
         ome_response_mock.status_code = 500
 
-        if sys.version_info.major == 3:
-            builtin_module_name = 'builtins'
-        else:
-            builtin_module_name = '__builtin__'
-        f_module = self.get_module_mock(params={'dup_file': "/root1/Ansible_EXE/BIOS_87V69_WN64_2.4.7.EXE", 'hostname': '192.168.0.1'})
-        with patch("{0}.open".format(builtin_module_name), mock_open(read_data="data")) as mock_file:
-            with pytest.raises(Exception) as exc:
-                self.module.upload_dup_file(ome_connection_firmware_mock, f_module)
-        assert exc.value.args[0] == "Unable to upload {0} to {1}".format('/root1/Ansible_EXE/BIOS_87V69_WN64_2.4.7.EXE',
-                                '192.168.0.1')
+        dup_file = tmpdir.join("BIOS_87V69_WN64_2.4.7.EXE")
+        dup_file.write("data")
+        f_module = self.get_module_mock(params={'dup_file': str(dup_file), 'hostname': '192.168.0.1'})
+        with pytest.raises(Exception) as exc:
+            self.module.upload_dup_file(ome_connection_firmware_mock, f_module)
+        assert exc.value.args[0] == "Unable to upload {0} to {1}".format(str(dup_file), '192.168.0.1')
 
     def test_get_device_ids_success_case(self, ome_connection_firmware_mock, ome_response_mock, ome_default_args):
         ome_default_args.update()
         ome_response_mock.status_code = 200
         ome_response_mock.json_data = {'value': [{'Id': 'DeviceServiceTag'}]}
         ome_response_mock.success = True
+        ome_connection_firmware_mock.resolve_devices.return_value = (
+            {'1111': {'Id': 1111, 'DeviceServiceTag': "MXL1234"}, 'MXL2222': {'Id': 2222, 'DeviceServiceTag': "MXL2222"},
+             '3333': {'Id': 3333, 'DeviceServiceTag': "MXL3333"}}, [])
         f_module = self.get_module_mock()
-        data = self.module.get_device_ids(ome_connection_firmware_mock, f_module, [1111, 2222, 3333])
+        data = self.module.get_device_ids(ome_connection_firmware_mock, f_module, [1111, "MXL2222", 3333])
         assert data == ['1111', '2222', '3333']
+        ome_connection_firmware_mock.resolve_devices.assert_called_with(device_ids=['1111', '3333'],
+                                                                        service_tags=['MXL2222'])
 
     def test_get_device_ids_failure_case01(self, ome_connection_firmware_mock, ome_response_mock):
         ome_response_mock.json_data = {'value': [{'Id': 'DeviceServiceTag'}]}
         ome_response_mock.success = False
+        ome_connection_firmware_mock.resolve_devices.return_value = (
+            {'2222': {'Id': 2222}, '3333': {'Id': 3333}}, ["@#!1"])
         f_module = self.get_module_mock()
         with pytest.raises(Exception) as exc:
             self.module.get_device_ids(ome_connection_firmware_mock, f_module, ["@#!1", 2222, 3333])
@@ -377,6 +444,119 @@ class TestOmeFirmware(FakeAnsibleModule):
         assert data['msg'] == "Successfully submitted the firmware update job."
         assert data['update_status'] == "Success"
 
+    @pytest.mark.parametrize("status,timed_out,msg", [
+        ("Completed", False, "Successfully completed the firmware update job."),
+        ("Warning", False, "The firmware update job completed with status 'Warning'."),
+        ("Running", True, "The firmware update job did not complete within 600 seconds.")])
+    def test_wait_for_update_job(self, status, timed_out, msg, mocker, ome_connection_firmware_mock):
+        tracker_mock = mocker.patch('ansible.modules.remote_management.dellemc.ome_firmware.JobTracker')
+        job = {"Id": 29099, "LastRunStatus": {"Name": status}}
+        tracker_mock.return_value.wait.return_value = (job, {"status": status, "timed_out": timed_out})
+        f_module = self.get_module_mock(params={"job_wait": True, "job_wait_timeout": 600})
+
+        def exit_func(msg, **kwargs):
+            raise Exception(msg)
+        f_module.exit_json.side_effect = exit_func
+        with pytest.raises(Exception) as exc:
+            self.module.wait_for_update_job(f_module, ome_connection_firmware_mock, {"Id": 29099})
+        assert exc.value.args[0] == msg
+        tracker_mock.assert_called_once_with(ome_connection_firmware_mock, max_interval=60)
+        tracker_mock.return_value.wait.assert_called_once_with(29099, timeout=600)
+
+    def test_split_waves(self):
+        target_data = [{"Id": 1, "Data": "BIOS"}, {"Id": 2, "Data": "BIOS"}, {"Id": 1, "Data": "NIC"},
+                       {"Id": 3, "Data": "BIOS"}]
+        waves = self.module.split_waves(target_data, 2)
+        assert waves == [[{"Id": 1, "Data": "BIOS"}, {"Id": 1, "Data": "NIC"}, {"Id": 2, "Data": "BIOS"}],
+                         [{"Id": 3, "Data": "BIOS"}]]
+
+    @pytest.mark.parametrize("job_status,max_failure,timeout,waves,skipped,stopped,timed_out", [
+        ({}, 0, 600, [(1, [1, 2], "Completed"), (2, [3, 4], "Completed"), (3, [5], "Completed")],
+         [], False, False),
+        ({101: "Failed"}, 20, 600, [(1, [1, 2], "Failed"), (2, [3, 4], "Completed")], [5], True, False),
+        ({101: "Failed"}, 50, 600, [(1, [1, 2], "Failed"), (2, [3, 4], "Completed"), (3, [5], "Completed")],
+         [], False, False),
+        ({101: "Running", 102: "Running"}, 0, 0, [(1, [1, 2], None), (2, [3, 4], None)], [5], False, True)])
+    def test_rolling_update(self, job_status, max_failure, timeout, waves, skipped, stopped, timed_out, mocker,
+                            ome_connection_firmware_mock):
+        job_ids = iter(range(101, 110))
+        spawn_mock = mocker.patch('ansible.modules.remote_management.dellemc.ome_firmware.spawn_update_job',
+                                  side_effect=lambda rest_obj, payload: {"Id": next(job_ids)})
+        tracker = self.module.JobTracker(ome_connection_firmware_mock, sleep=lambda interval: None)
+        polled = []
+
+        def get_jobs(job_ids, select=None):
+            polled.append(job_ids)
+            return dict((job_id, {"Id": job_id, "LastRunStatus": {"Name": job_status.get(job_id, "Completed")}})
+                        for job_id in job_ids)
+        tracker.get_jobs = get_jobs
+        target_data = [{"Id": device_id, "Data": "BIOS=1234"} for device_id in range(1, 6)]
+        f_module = self.get_module_mock(params={"batch_size": 2, "max_concurrent_jobs": 2,
+                                                "max_failure_percentage": max_failure, "job_wait_timeout": timeout})
+        summary = self.module.rolling_update(f_module, ome_connection_firmware_mock, target_data, tracker=tracker)
+        assert [(wave["wave"], wave["device_ids"], wave["status"]) for wave in summary["waves"]] == waves
+        assert summary["skipped_devices"] == skipped
+        assert summary["stopped"] is stopped
+        assert summary["timed_out"] is timed_out
+        assert summary["failed_devices"] == (2 if 101 in job_status and not timed_out else 0)
+        assert all(len(job_ids) <= 2 for job_ids in polled)
+        assert spawn_mock.call_args_list[0][0][1]["JobName"] == "Firmware Update Task - Wave 1"
+        assert [target["Id"] for target in spawn_mock.call_args_list[0][0][1]["Targets"]] == [1, 2]
+
+    def test_rolling_update_missing_job(self, mocker, ome_connection_firmware_mock):
+        job_ids = iter(range(101, 110))
+        mocker.patch('ansible.modules.remote_management.dellemc.ome_firmware.spawn_update_job',
+                     side_effect=lambda rest_obj, payload: {"Id": next(job_ids)})
+        tracker = self.module.JobTracker(ome_connection_firmware_mock, sleep=lambda interval: None)
+        tracker.get_jobs = lambda job_ids, select=None: dict(
+            (job_id, {"Id": job_id, "LastRunStatus": {"Name": "Completed"}}) for job_id in job_ids if job_id != 101)
+        target_data = [{"Id": device_id, "Data": "BIOS=1234"} for device_id in range(1, 5)]
+        f_module = self.get_module_mock(params={"batch_size": 2, "max_concurrent_jobs": 1,
+                                                "max_failure_percentage": 50, "job_wait_timeout": 600})
+        summary = self.module.rolling_update(f_module, ome_connection_firmware_mock, target_data, tracker=tracker)
+        assert summary["waves"][0] == {"wave": 1, "job_id": 101, "device_ids": [1, 2], "status": "Missing",
+                                       "message": "The update job 101 of the wave was not found on the appliance."}
+        assert summary["waves"][1]["status"] == "Completed"
+        assert summary["failed_devices"] == 2
+        assert summary["timed_out"] is False
+
+    @pytest.mark.parametrize("summary,msg,changed", [
+        ({"waves": [{"job_id": 101}, {"job_id": 102}], "failed_devices": 0, "stopped": False, "timed_out": False},
+         "Successfully completed the rolling firmware update in 2 wave(s).", True),
+        ({"waves": [{"job_id": 101}, {"job_id": None}], "failed_devices": 1, "stopped": False, "timed_out": False},
+         "Completed the rolling firmware update in 2 wave(s) with 1 failed device(s).", True),
+        ({"waves": [{"job_id": None}, {"job_id": None}], "failed_devices": 2, "stopped": False, "timed_out": False},
+         "Completed the rolling firmware update in 2 wave(s) with 2 failed device(s).", False),
+        ({"waves": [{"job_id": 101}], "failed_devices": 2, "failure_percentage": 40.0, "stopped": True,
+          "timed_out": False},
+         "The rolling firmware update stopped after 1 wave(s) because 40.0% of the devices failed.", True),
+        ({"waves": [{"job_id": None}], "failed_devices": 2, "failure_percentage": 40.0, "stopped": True,
+          "timed_out": False},
+         "The rolling firmware update stopped after 1 wave(s) because 40.0% of the devices failed.", False),
+        ({"waves": [{"job_id": 101}], "failed_devices": 0, "stopped": False, "timed_out": True},
+         "The rolling firmware update did not complete within 600 seconds.", True)])
+    def test_exit_rolling_update(self, summary, msg, changed):
+        f_module = self.get_module_mock(params={"job_wait_timeout": 600})
+
+        def exit_func(msg, **kwargs):
+            raise Exception(msg, kwargs["changed"])
+        f_module.exit_json.side_effect = exit_func
+        f_module.fail_json.side_effect = exit_func
+        with pytest.raises(Exception) as exc:
+            self.module.exit_rolling_update(f_module, summary)
+        assert exc.value.args == (msg, changed)
+
+    @pytest.mark.parametrize("params,msg", [
+        ({"batch_size": 0, "max_concurrent_jobs": 1, "max_failure_percentage": 0},
+         "batch_size and max_concurrent_jobs should be greater than zero."),
+        ({"batch_size": 10, "max_concurrent_jobs": 1, "max_failure_percentage": 101},
+         "max_failure_percentage should be between 0 and 100.")])
+    def test_validate_rolling_options(self, params, msg):
+        f_module = self.get_module_mock(params=params)
+        with pytest.raises(Exception) as exc:
+            self.module._validate_rolling_options(f_module)
+        assert exc.value.args[0] == msg
+
     @pytest.mark.parametrize("exc_type",
                              [URLError, HTTPError, SSLValidationError, ConnectionError, TypeError, ValueError])
     def test_firmware_main_exception_case(self, exc_type, mocker, ome_default_args,
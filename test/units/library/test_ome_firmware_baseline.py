@@ -160,21 +160,24 @@ class TestOmeFirmwareCatalog(FakeAnsibleModule):
     def test_get_dev_ids(self, ome_connection_mock_for_firmware_baseline,
                               ome_response_mock, params):
         f_module = self.get_module_mock(params=params["inp"])
-        ome_response_mock.success = True
-        ome_response_mock.json_data = {"value": [{ "Id": 12,
-                                                    "Type": 1000,
-                                                    "DeviceServiceTag": "R840PT3"
-                                                },
-                                                 {
-                                                     "Id": 23,
-                                                     "Type": 1000,
-                                                     "DeviceServiceTag": "R940PT3"
-                                                 }]
-                                       }
+        inventory = {"R840PT3": {"Id": 12, "Type": 1000, "DeviceServiceTag": "R840PT3"},
+                     "R940PT3": {"Id": 23, "Type": 1000, "DeviceServiceTag": "R940PT3"}}
+        ome_connection_mock_for_firmware_baseline.resolve_devices.side_effect = lambda service_tags: (
+            dict((tag, inventory[tag]) for tag in service_tags if tag in inventory),
+            [tag for tag in service_tags if tag not in inventory])
         targets = self.module.get_dev_ids(f_module, ome_connection_mock_for_firmware_baseline,
                                           "device_service_tags", "DeviceServiceTag")
         assert targets == params["out"]
 
+    def test_get_dev_ids_invalid_device_id(self, ome_connection_mock_for_firmware_baseline):
+        f_module = self.get_module_mock(params={"device_ids": [12, 99]})
+        ome_connection_mock_for_firmware_baseline.resolve_devices.return_value = (
+            {"12": {"Id": 12, "Type": 1000, "DeviceServiceTag": "R840PT3"}}, ["99"])
+        with pytest.raises(Exception) as exc:
+            self.module.get_dev_ids(f_module, ome_connection_mock_for_firmware_baseline, "device_ids", "Id")
+        assert exc.value.args[0] == "Unable to complete the operation because the entered target Id '99' is invalid."
+        ome_connection_mock_for_firmware_baseline.resolve_devices.assert_called_with(device_ids=[12, 99])
+
     grp_param1 = {"group_names": ["group1", "group2"]}
     grp_out1 = [{
         "Id": 12,
@@ -31,45 +31,32 @@ def ome_connection_mock_for_firmware_baseline_compliance_info(mocker, ome_respon
     connection_class_mock = mocker.patch('ansible.modules.remote_management.dellemc.ome_firmware_baseline_compliance_info.RestOME')
     ome_connection_mock_obj = connection_class_mock.return_value.__enter__.return_value
     ome_connection_mock_obj.invoke_request.return_value = ome_response_mock
+    ome_connection_mock_obj.resolve_devices.return_value = ({}, [])
     return ome_connection_mock_obj
 
 class TestOmeFirmwareCatalog(FakeAnsibleModule):
     module = ome_firmware_baseline_compliance_info
 
     def test__get_device_id_from_service_tags_for_baseline_success_case(self, ome_response_mock, ome_connection_mock_for_firmware_baseline_compliance_info):
-        ome_response_mock.json_data= {"value": [{"DeviceServiceTag": Constants.service_tag1, "Id": Constants.device_id1}]}
-        ome_response_mock.status_code = 200
-        ome_response_mock.success = True
+        ome_connection_mock_for_firmware_baseline_compliance_info.resolve_devices.return_value = (
+            {Constants.service_tag1: {"DeviceServiceTag": Constants.service_tag1, "Id": Constants.device_id1}}, [])
         f_module = self.get_module_mock()
         data = self.module._get_device_id_from_service_tags([Constants.service_tag1], ome_connection_mock_for_firmware_baseline_compliance_info, f_module)
         assert data == {Constants.device_id1:Constants.service_tag1}
 
     def test__get_device_id_from_service_tags_empty_case(self, ome_response_mock, ome_connection_mock_for_firmware_baseline_compliance_info):
-        ome_response_mock.json_data= {"value": []}
-        ome_response_mock.status_code = 200
-        ome_response_mock.success = True
+        ome_connection_mock_for_firmware_baseline_compliance_info.resolve_devices.return_value = (
+            {}, [Constants.service_tag1])
         f_module = self.get_module_mock()
         data = self.module._get_device_id_from_service_tags([Constants.service_tag1], ome_connection_mock_for_firmware_baseline_compliance_info, f_module)
         assert data == {}
 
     def test_get_device_id_from_service_tags_for_baseline_error_case(self, ome_connection_mock_for_firmware_baseline_compliance_info, ome_response_mock):
-        ome_connection_mock_for_firmware_baseline_compliance_info.invoke_request.side_effect = HTTPError('http://testhost.com', 400, '', {}, None)
-        ome_response_mock.json_data = {"value": [{"DeviceServiceTag": Constants.service_tag1, "Id": Constants.device_id1}]}
-        ome_response_mock.status_code = 200
-        ome_response_mock.success = True
+        ome_connection_mock_for_firmware_baseline_compliance_info.resolve_devices.side_effect = HTTPError('http://testhost.com', 400, '', {}, None)
         f_module = self.get_module_mock()
         with pytest.raises(HTTPError) as ex:
             self.module._get_device_id_from_service_tags(["INVALID"], ome_connection_mock_for_firmware_baseline_compliance_info, f_module)
 
-    def test_get_device_id_from_service_tags_for_baseline_value_error_case(self, ome_connection_mock_for_firmware_baseline_compliance_info, ome_response_mock):
-        ome_response_mock.json_data = {"value": [{"DeviceServiceTag": Constants.service_tag1, "Id": Constants.device_id1}]}
-        ome_response_mock.status_code = 500
-        ome_response_mock.success = False
-        f_module = self.get_module_mock()
-        with pytest.raises(Exception) as exc:
-            self.module._get_device_id_from_service_tags(["#$%^&"], ome_connection_mock_for_firmware_baseline_compliance_info, f_module)
-        assert exc.value.args[0] == "Failed to fetch the device information."
-
     def test_get_device_ids_from_group_ids_success_case(self, ome_response_mock, ome_connection_mock_for_firmware_baseline_compliance_info):
         ome_response_mock.json_data = {"value": [{"DeviceServiceTag": Constants.service_tag1, "Id": Constants.device_id1}]}
         ome_response_mock.status_code = 200
@@ -260,6 +247,8 @@ class TestOmeFirmwareCatalog(FakeAnsibleModule):
             ome_connection_mock_for_firmware_baseline_compliance_info.invoke_request.side_effect = exc_type('test')
         else:
             ome_connection_mock_for_firmware_baseline_compliance_info.invoke_request.side_effect = exc_type('http://testhost.com', 400, '', {}, None)
+        ome_connection_mock_for_firmware_baseline_compliance_info.resolve_devices.side_effect = \
+            ome_connection_mock_for_firmware_baseline_compliance_info.invoke_request.side_effect
         ome_response_mock.status_code = 400
         ome_response_mock.success = False
         f_module = self.get_module_mock()
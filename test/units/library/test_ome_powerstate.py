@@ -0,0 +1,102 @@
+# -*- coding: utf-8 -*-
+
+#
+# Dell EMC OpenManage Ansible Modules
+# Version 2.0.7
+# Copyright (C) 2020 Dell Inc.
+
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+# All rights reserved. Dell, EMC, and other trademarks are trademarks of Dell Inc. or its subsidiaries.
+# Other trademarks may be trademarks of their respective owners.
+#
+
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+import pytest
+from ansible.modules.remote_management.dellemc import ome_powerstate
+from units.modules.remote_management.dellemc.common import FakeAnsibleModule
+
+DEVICES = {
+    "1234": {"Id": 1234, "DeviceServiceTag": "MXL1234", "Type": 1000, "PowerState": 17},
+    "4321": {"Id": 4321, "DeviceServiceTag": "MXL4321", "Type": 1000, "PowerState": 18},
+    "MXL5467": {"Id": 5467, "DeviceServiceTag": "MXL5467", "Type": 2000, "PowerState": 17},
+}
+
+
+@pytest.fixture
+def ome_connection_powerstate_mock(mocker, ome_response_mock):
+    connection_class_mock = mocker.patch('ansible.modules.remote_management.dellemc.ome_powerstate.RestOME')
+    ome_connection_mock_obj = connection_class_mock.return_value.__enter__.return_value
+    ome_connection_mock_obj.invoke_request.return_value = ome_response_mock
+
+    def get_devices(identifiers, select=None):
+        return dict((str(identifier), DEVICES[str(identifier)]) for identifier in identifiers
+                    if str(identifier) in DEVICES)
+    ome_connection_mock_obj.get_devices_by_id.side_effect = get_devices
+    ome_connection_mock_obj.get_devices_by_tag.side_effect = get_devices
+    return ome_connection_mock_obj
+
+
+class TestOmePowerState(FakeAnsibleModule):
+    module = ome_powerstate
+
+    def test_power_state_single_job(self, ome_default_args, ome_connection_powerstate_mock, ome_response_mock):
+        ome_default_args.update({"power_state": "off", "device_id": [1234, 4321], "device_service_tag": ["MXL5467"]})
+        ome_response_mock.status_code = 201
+        ome_response_mock.json_data = {"Id": 11111}
+        result = self._run_module(ome_default_args)
+        assert result["changed"] is True
+        assert result["job_status"] == {"Id": 11111}
+        assert result["skipped_devices"] == [4321]
+        ome_connection_powerstate_mock.get_devices_by_id.assert_called_once_with(["1234", "4321"],
+                                                                                 select=self.module.DEVICE_SELECT)
+        ome_connection_powerstate_mock.get_devices_by_tag.assert_called_once_with(["MXL5467"],
+                                                                                  select=self.module.DEVICE_SELECT)
+        ome_connection_powerstate_mock.resolve_devices.assert_not_called()
+        ome_connection_powerstate_mock.invoke_request.assert_called_once()
+        payload = ome_connection_powerstate_mock.invoke_request.call_args[1]["data"]
+        assert [(target["Id"], target["TargetType"]["Id"]) for target in payload["Targets"]] == \
+            [(1234, 1000), (5467, 2000)]
+        assert payload["Params"][1] == {"Key": "powerState", "Value": "12"}
+
+    @pytest.mark.parametrize("check_mode,msg,changed", [
+        (False, "The targeted device(s) are already in the desired power state.", False),
+        (True, "No changes found to commit.", False)])
+    def test_power_state_no_changes(self, check_mode, msg, changed, ome_default_args,
+                                    ome_connection_powerstate_mock):
+        ome_default_args.update({"power_state": "on", "device_id": ["1234"], "device_service_tag": ["MXL5467"]})
+        result = self._run_module(ome_default_args, check_mode=check_mode)
+        assert result["msg"] == msg
+        assert result["changed"] is changed
+        assert result["skipped_devices"] == [1234, 5467]
+        ome_connection_powerstate_mock.invoke_request.assert_not_called()
+
+    def test_power_state_check_mode_changes(self, ome_default_args, ome_connection_powerstate_mock):
+        ome_default_args.update({"power_state": "warmboot", "device_id": [1234]})
+        result = self._run_module(ome_default_args, check_mode=True)
+        assert result["msg"] == "Changes found to commit."
+        assert result["changed"] is True
+
+    @pytest.mark.parametrize("params,msg", [
+        ({"device_service_tag": ["MXL5467", "INVALID1"]},
+         "Unable to complete the operation because the entered target device service tag 'INVALID1' is invalid."),
+        ({"device_id": [1234, 99, 98]},
+         "Unable to complete the operation because the entered target device id '99,98' is invalid.")])
+    def test_power_state_invalid_targets(self, params, msg, ome_default_args, ome_connection_powerstate_mock):
+        ome_default_args.update(dict(params, power_state="off"))
+        result = self._run_module_with_fail_json(ome_default_args)
+        assert result["msg"] == msg
+
+    def test_power_state_job_wait(self, mocker, ome_default_args, ome_connection_powerstate_mock,
+                                  ome_response_mock):
+        tracker_mock = mocker.patch('ansible.modules.remote_management.dellemc.ome_powerstate.JobTracker')
+        tracker_mock.return_value.wait.return_value = ({"Id": 11111}, {"status": "Completed", "timed_out": False})
+        ome_default_args.update({"power_state": "off", "device_id": [1234, 4321], "job_wait": True})
+        ome_response_mock.status_code = 201
+        ome_response_mock.json_data = {"Id": 11111}
+        result = self._run_module(ome_default_args)
+        assert result["msg"] == "Power State operation job completed successfully."
+        assert result["device_power_states"] == [
+            {"Id": 1234, "DeviceServiceTag": "MXL1234", "PowerState": 17, "PowerStateName": "on"},
+            {"Id": 4321, "DeviceServiceTag": "MXL4321", "PowerState": 18, "PowerStateName": "off"}]
@@ -28,7 +28,7 @@ def ome_connection_mock_for_template(mocker, ome_response_mock):
     connection_class_mock = mocker.patch('ansible.modules.remote_management.dellemc.ome_template.RestOME')
     ome_connection_mock_obj = connection_class_mock.return_value.__enter__.return_value
     ome_connection_mock_obj.invoke_request.return_value = ome_response_mock
-    ome_connection_mock_obj.get_all_report_details.return_value = {"report_list": []}
+    ome_connection_mock_obj.resolve_devices.return_value = ({}, [])
     return ome_connection_mock_obj
 
 TEMPLATE_RESOURCE= {"TEMPLATE_RESOURCE":"TemplateService/Templates"}
@@ -43,8 +43,8 @@ class TestOmeTemplate(FakeAnsibleModule):
         return response_class_mock
 
     def test_get_service_tags_success_case(self, ome_connection_mock_for_template, ome_response_mock):
-        ome_connection_mock_for_template.get_all_report_details.return_value = {"report_list": [{"Id": Constants.device_id1,
-                                                                                 "DeviceServiceTag": Constants.service_tag1}]}
+        ome_connection_mock_for_template.resolve_devices.return_value = (
+            {Constants.service_tag1: {"Id": Constants.device_id1, "DeviceServiceTag": Constants.service_tag1}}, [])
         f_module = self.get_module_mock({'device_id': [], 'device_service_tag': [Constants.service_tag1]})
         data = self.module.get_device_ids(f_module, ome_connection_mock_for_template)
         assert data == [Constants.device_id1]
@@ -66,11 +66,8 @@ class TestOmeTemplate(FakeAnsibleModule):
         assert '1111' in device_ids and '2222' in device_ids
 
     def test_get_device_ids_failure_case_02(self, ome_connection_mock_for_template, ome_response_mock, ome_default_args):
-        ome_connection_mock_for_template.get_all_report_details.return_value = {"report_list": [{"Id": Constants.device_id1,
-                                                                                 "DeviceServiceTag": Constants.service_tag1},
-                                                                                {"Id": Constants.device_id2,
-                                                                                 "DeviceServiceTag": "tag2"}
-                                                                                ]}
+        ome_connection_mock_for_template.resolve_devices.return_value = (
+            {str(Constants.device_id2): {"Id": Constants.device_id2, "DeviceServiceTag": "tag2"}}, ["abcd"])
         f_module = self.get_module_mock(params={'device_id': [Constants.device_id2], 'device_service_tag': ["abcd"]})
         with pytest.raises(Exception) as exc:
             self.module.get_device_ids(f_module, ome_connection_mock_for_template)
@@ -78,15 +75,21 @@ class TestOmeTemplate(FakeAnsibleModule):
                                      "'{0}' are invalid.".format('abcd')
 
     def test_get_device_ids_for_no_device_failue_case_03(self, ome_connection_mock_for_template, ome_response_mock, ome_default_args):
-        ome_connection_mock_for_template.get_all_report_details.return_value = {"report_list":[{"Id": Constants.device_id1,
-                                                                                 "DeviceServiceTag": Constants.service_tag1}
-                                                                                ], "resp_obj": ome_response_mock}
+        ome_connection_mock_for_template.resolve_devices.return_value = ({}, [Constants.service_tag1])
         f_module = self.get_module_mock(params={'device_service_tag': [Constants.service_tag1], 'device_id': []})
-        #import pdb
-        #pdb.set_trace()
         with pytest.raises(Exception) as exc:
-            device_ids = self.module.get_device_ids(f_module, ome_connection_mock_for_template)
-            assert exc.value.args[0] == "Failed to fetch the device ids."
+            self.module.get_device_ids(f_module, ome_connection_mock_for_template)
+        assert exc.value.args[0] == "Unable to complete the operation because the entered target service tag(s) " \
+                                    "'{0}' are invalid.".format(Constants.service_tag1)
+
+    def test_get_device_ids_invalid_device_id_case_04(self, ome_connection_mock_for_template):
+        ome_connection_mock_for_template.resolve_devices.return_value = (
+            {Constants.service_tag1: {"Id": Constants.device_id1, "DeviceServiceTag": Constants.service_tag1}}, ["9999"])
+        f_module = self.get_module_mock(params={'device_service_tag': [Constants.service_tag1], 'device_id': [9999]})
+        with pytest.raises(Exception) as exc:
+            self.module.get_device_ids(f_module, ome_connection_mock_for_template)
+        assert exc.value.args[0] == "Unable to complete the operation because the entered target device " \
+                                    "id(s) '9999' are invalid."
 
 
 
@@ -277,6 +280,50 @@ class TestOmeTemplate(FakeAnsibleModule):
         assert result['changed'] is True
         assert result['msg'] == "Successfully created a template with ID {0}".format(ome_response_mock.json_data)
 
+    @pytest.mark.parametrize("status,msg", [
+        ("Completed", "Successfully completed the template-deployment job with ID 1234"),
+        ("Failed", "The template-deployment job with ID 1234 completed with status 'Failed'.")])
+    def test_main_template_deploy_job_wait(self, status, msg, ome_default_args, mocker, module_mock,
+                                           ome_connection_mock_for_template, ome_response_mock):
+        ome_connection_mock_for_template.__enter__.return_value = ome_connection_mock_for_template
+        ome_connection_mock_for_template.invoke_request.return_value = ome_response_mock
+        ome_response_mock.json_data = 1234
+        ome_response_mock.success = True
+        ome_default_args.update({"command": "deploy", "template_id": 12, "job_wait": True})
+        mocker.patch('ansible.modules.remote_management.dellemc.ome_template._get_resource_parameters',
+                     return_value=(TEMPLATE_RESOURCE, "template_payload", "POST"))
+        tracker_mock = mocker.patch('ansible.modules.remote_management.dellemc.ome_template.JobTracker')
+        tracking = {"job_id": 1234, "status": status, "timed_out": False}
+        tracker_mock.return_value.wait.return_value = ({"Id": 1234}, tracking)
+        if status == "Completed":
+            result = self._run_module(ome_default_args)
+            assert result['changed'] is True
+        else:
+            result = self._run_module_with_fail_json(ome_default_args)
+        assert result['msg'] == msg
+        assert result['return_id'] == 1234
+        assert result['job_tracking'] == tracking
+        tracker_mock.return_value.wait.assert_called_once_with(1234, timeout=3600)
+
+    @pytest.mark.parametrize("run_now", [False, "false"])
+    def test_main_template_deploy_job_wait_scheduled(self, run_now, ome_default_args, mocker, module_mock,
+                                                     ome_connection_mock_for_template, ome_response_mock):
+        ome_connection_mock_for_template.__enter__.return_value = ome_connection_mock_for_template
+        ome_response_mock.json_data = 1234
+        ome_response_mock.success = True
+        ome_default_args.update({"command": "deploy", "template_id": 12, "job_wait": True,
+                                 "attributes": {"Schedule": {"RunNow": run_now, "RunLater": True,
+                                                             "Cron": "0 0 0 * * ? *"}}})
+        mocker.patch('ansible.modules.remote_management.dellemc.ome_template._get_resource_parameters',
+                     return_value=(TEMPLATE_RESOURCE, "template_payload", "POST"))
+        tracker_mock = mocker.patch('ansible.modules.remote_management.dellemc.ome_template.JobTracker')
+        result = self._run_module(ome_default_args)
+        assert result['changed'] is True
+        assert result['msg'] == "Successfully created the template-deployment job with ID 1234"
+        assert result['return_id'] == 1234
+        assert 'job_tracking' not in result
+        tracker_mock.assert_not_called()
+
     @pytest.mark.parametrize("exc_type",
                              [URLError, HTTPError, SSLValidationError, ConnectionError, TypeError, ValueError])
     def test_main_template_exception_case(self, exc_type, mocker, ome_default_args, ome_connection_mock_for_template,
@@ -0,0 +1,38 @@
+# -*- coding: utf-8 -*-
+
+#
+# Dell EMC OpenManage Ansible Modules
+# Version 2.0.7
+# Copyright (C) 2020 Dell Inc.
+
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+# All rights reserved. Dell, EMC, and other trademarks are trademarks of Dell Inc. or its subsidiaries.
+# Other trademarks may be trademarks of their respective owners.
+#
+
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+from ansible.modules.remote_management.dellemc import ome_user_info
+from ansible.module_utils.six.moves.urllib.parse import urlparse, parse_qsl
+from units.modules.remote_management.dellemc.common import FakeAnsibleModule
+
+
+class TestOmeUserInfo(FakeAnsibleModule):
+    module = ome_user_info
+
+    def test_select_max_items(self, ome_default_args, ome_appliance_mock):
+        ome_appliance_mock["collections"]["AccountService/Accounts"] = [
+            {"Id": str(index), "UserName": "user{0}".format(index), "RoleId": "10", "Enabled": True}
+            for index in range(5)]
+        ome_default_args.update({"system_query_options": {"filter": "UserName ne 'root'", "select": ["Id", "UserName"]},
+                                 "max_items": 3})
+        result = self._run_module(ome_default_args)
+        facts = result["user_info"]["192.168.0.1"]
+        assert facts["@odata.count"] == 5
+        assert [sorted(item) for item in facts["value"]] == [["Id", "UserName"]] * 3
+        assert len(ome_appliance_mock["requests"]) == 1
+        url = ome_appliance_mock["requests"][0]
+        assert urlparse(url).path == "/api/AccountService/Accounts"
+        assert dict(parse_qsl(urlparse(url).query)) == {"$select": "Id,UserName", "$top": "3", "$skip": "0",
+                                                        "$filter": "UserName ne 'root'"}
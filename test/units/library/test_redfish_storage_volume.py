@@ -32,6 +32,7 @@ def redfish_connection_mock_for_storage_volume(mocker, redfish_response_mock):
     connection_class_mock = mocker.patch('ansible.modules.remote_management.dellemc.redfish_storage_volume.Redfish')
     redfish_connection_mock_obj = connection_class_mock.return_value.__enter__.return_value
     redfish_connection_mock_obj.invoke_request.return_value = redfish_response_mock
+    redfish_connection_mock_obj.discover.side_effect = lambda name, resolve: resolve(redfish_connection_mock_obj)
     return redfish_connection_mock_obj
 
 
@@ -124,6 +125,7 @@ class TestStorageVolume(FakeAnsibleModule):
         assert message["msg"] == "Successfully submitted {0} volume task.".format(action)
         assert message["task_uri"] == "JobService/Jobs/JID_1234"
         assert message["task_id"] == "JID_1234"
+        assert message["action"] == action
 
     def test_get_success_message_case_02(self):
         action = "create"
@@ -480,3 +482,25 @@ class TestStorageVolume(FakeAnsibleModule):
         redfish_connection_mock_for_storage_volume.invoke_request.side_effect = URLError(msg)
         with pytest.raises(Exception, match=msg) as exc:
             self.module.fetch_storage_resource(f_module, redfish_connection_mock_for_storage_volume)
+
+    @pytest.mark.parametrize("state,status,timed_out,msg", [
+        ("Completed", "OK", False, "Successfully completed create volume task."),
+        ("Pending", "OK", False, "Successfully scheduled create volume task, which is applied on the next reboot."),
+        ("Exception", "Critical", False, "The volume task ended with state 'Exception' and status 'Critical'."),
+        ("Running", "OK", True, "The volume task did not complete within 300 seconds.")])
+    def test_wait_for_volume_task(self, state, status, timed_out, msg, mocker,
+                                  redfish_connection_mock_for_storage_volume):
+        monitor_mock = mocker.patch('ansible.modules.remote_management.dellemc.redfish_storage_volume.TaskMonitor')
+        monitor_mock.return_value.wait.return_value = {"state": state, "status": status, "timed_out": timed_out}
+        f_module = self.get_module_mock(params={"job_wait": True, "job_wait_timeout": 300})
+
+        def exit_func(msg, **kwargs):
+            raise Exception(msg)
+        f_module.exit_json.side_effect = exit_func
+        status_message = {"msg": "Successfully submitted create volume task.", "action": "create",
+                          "task_uri": "/redfish/v1/TaskService/Tasks/JID_1", "task_id": "JID_1"}
+        with pytest.raises(Exception) as exc:
+            self.module.wait_for_volume_task(f_module, redfish_connection_mock_for_storage_volume, status_message)
+        assert exc.value.args[0] == msg
+        monitor_mock.return_value.wait.assert_called_once_with("/redfish/v1/TaskService/Tasks/JID_1", timeout=300,
+                                                               stop_states=("Pending",))
@@ -13,13 +13,97 @@
 from __future__ import absolute_import
 
 import pytest
+import socket
+import threading
+import time
+from io import BytesIO
+from multiprocessing.pool import ThreadPool
 from ansible.module_utils.urls import ConnectionError, SSLValidationError
 from ansible.module_utils.six.moves.urllib.error import URLError, HTTPError
-from ansible.module_utils.remote_management.dellemc.ome import RestOME
+from ansible.module_utils.six.moves import http_client
+from ansible.module_utils.six.moves.urllib.parse import urlencode
+from ansible.module_utils.six.moves.BaseHTTPServer import HTTPServer, BaseHTTPRequestHandler
+from ansible.module_utils.remote_management.dellemc.ome import RestOME, OpenURLResponse, JobTracker, ConnectionPool
+from ansible.module_utils.remote_management.dellemc.perf import PerfRecorder
+from ansible.module_utils.remote_management.dellemc.retry import RetryPolicy
+from ansible.module_utils.remote_management.dellemc.upload import StreamingBody
 from units.compat.mock import MagicMock
 import json
 
 
+class OMEStandInHandler(BaseHTTPRequestHandler):
+    """Answers every GET with a small JSON body over HTTP/1.1 keep-alive connections."""
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def setup(self):
+        BaseHTTPRequestHandler.setup(self)
+        self.server.connections += 1
+
+    def do_GET(self):
+        if self.path.endswith("/moved"):
+            self.send_response(302)
+            self.send_header("Location", "/api/DeviceService/Devices")
+            self.send_header("Content-Length", "0")
+            self.send_header("Connection", "close")
+            self.end_headers()
+            self.close_connection = True
+            return
+        if self.path.endswith("/missing"):
+            body = json.dumps({"error": {"message": "Not Found"}}).encode()
+            self.send_response(404)
+        else:
+            body = json.dumps({"value": "data", "path": self.path}).encode()
+            self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+        if self.path.endswith("/close"):
+            self.close_connection = True
+
+    def do_POST(self):
+        data = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        self.server.posts.append((dict(self.headers.items()), data))
+        if self.path.endswith("/slow"):
+            time.sleep(1)
+        body = json.dumps({"received": len(data)}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class OneShotBody(object):
+    """File-like body which can only be read once."""
+
+    def __init__(self, data):
+        self._data = BytesIO(data)
+        self._length = len(data)
+
+    def __len__(self):
+        return self._length
+
+    def read(self, size=-1):
+        return self._data.read(size)
+
+
+@pytest.fixture
+def ome_stand_in():
+    server = HTTPServer(("127.0.0.1", 0), OMEStandInHandler)
+    server.connections, server.posts = 0, []
+    thread = threading.Thread(target=server.serve_forever)
+    thread.daemon = True
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
 class TestRestOME(object):
     @pytest.fixture
     def mock_response(self):
@@ -41,6 +125,21 @@ class TestRestOME(object):
         assert response.json_data == {"value": "data"}
         assert response.success is True
 
+    def test_json_data_decoded_once(self, mock_response, mocker):
+        loads_mock = mocker.patch('ansible.module_utils.remote_management.dellemc.ome.json_loads',
+                                  return_value={"value": "data"})
+        response = OpenURLResponse(mock_response)
+        assert response.json_data == {"value": "data"}
+        assert response.json_data["value"] == "data"
+        assert loads_mock.call_count == 1
+
+    def test_json_data_invalid_body(self, mock_response):
+        mock_response.read.return_value = "<html></html>"
+        response = OpenURLResponse(mock_response)
+        with pytest.raises(ValueError) as err:
+            response.json_data
+        assert str(err.value) == "Unable to parse json"
+
     def test_invoke_request_without_session(self, mock_response, mocker):
         mocker.patch('ansible.module_utils.remote_management.dellemc.ome.open_url',
                      return_value=mock_response)
@@ -89,6 +188,82 @@ class TestRestOME(object):
             reports = obj.get_all_report_details("DeviceService/Devices")
         assert reports == {"resp_obj": mock_response, "report_list": list(range(51))}
 
+    def test_get_all_report_details_concurrent_pages(self, mocker):
+        def invoke_request(method, uri, query_param=None, select=None):
+            skip = query_param["$skip"] if query_param else 0
+            top = query_param["$top"] if query_param else 10
+            response = MagicMock()
+            response.json_data = {"@odata.count": 95, "value": list(range(skip, min(skip + top, 95)))}
+            return response
+        invoke_mock = mocker.patch('ansible.module_utils.remote_management.dellemc.ome.RestOME.invoke_request',
+                                   side_effect=invoke_request)
+        module_params = {'hostname': '192.168.0.1', 'username': 'username',
+                         'password': 'password', "port": 443}
+        with RestOME(module_params, False) as obj:
+            reports = obj.get_all_report_details("DeviceService/Devices", max_workers=4)
+        assert reports["report_list"] == list(range(95))
+        assert invoke_mock.call_count == 10
+
+    def test_iter_collection(self, mocker):
+        def invoke_request(method, uri, query_param=None, select=None):
+            skip, top = query_param["$skip"], query_param["$top"]
+            response = MagicMock()
+            response.json_data = {"@odata.count": 25, "value": list(range(skip, min(skip + top, 25)))}
+            return response
+        invoke_mock = mocker.patch('ansible.module_utils.remote_management.dellemc.ome.RestOME.invoke_request',
+                                   side_effect=invoke_request)
+        module_params = {'hostname': '192.168.0.1', 'username': 'username',
+                         'password': 'password', "port": 443}
+        with RestOME(module_params, False) as obj:
+            records = obj.iter_collection("DeviceService/Devices", page_size=10, select=["Id"])
+            assert next(records) == 0
+            assert invoke_mock.call_count == 1
+            assert list(records) == list(range(1, 25))
+        assert invoke_mock.call_count == 3
+        invoke_mock.assert_called_with('GET', "DeviceService/Devices",
+                                       query_param={"$top": 10, "$skip": 20}, select=["Id"])
+
+    @pytest.mark.parametrize("max_items,pages,count", [(None, [(0, 10), (10, 10), (20, 10)], 25),
+                                                       (15, [(0, 10), (10, 5)], 15)])
+    def test_get_collection(self, max_items, pages, count, mocker):
+        def invoke_request(method, uri, query_param=None, select=None):
+            skip, top = query_param["$skip"], query_param["$top"]
+            response = MagicMock()
+            response.json_data = {"@odata.context": "/api/$metadata#Collection(JobService.Job)",
+                                  "@odata.count": 25, "value": list(range(skip, min(skip + top, 25)))}
+            return response
+        invoke_mock = mocker.patch('ansible.module_utils.remote_management.dellemc.ome.RestOME.invoke_request',
+                                   side_effect=invoke_request)
+        module_params = {'hostname': '192.168.0.1', 'username': 'username',
+                         'password': 'password', "port": 443}
+        with RestOME(module_params, False) as obj:
+            collection = obj.get_collection("JobService/Jobs", query_param={"$filter": "JobType/Id eq 5"},
+                                            select=["Id"], max_items=max_items, page_size=10)
+        assert collection == {"@odata.context": "/api/$metadata#Collection(JobService.Job)",
+                              "@odata.count": 25, "value": list(range(count))}
+        assert [(call[1]["query_param"]["$skip"], call[1]["query_param"]["$top"])
+                for call in invoke_mock.call_args_list] == pages
+        assert all(call[1]["query_param"]["$filter"] == "JobType/Id eq 5" and call[1]["select"] == ["Id"]
+                   for call in invoke_mock.call_args_list)
+
+    def test_invoke_request_select_projection(self, mock_response, mocker):
+        mock_response.read.return_value = json.dumps({
+            "@odata.count": 1,
+            "value": [{"@odata.id": "/api/DeviceService/Devices(10)", "Id": 10, "DeviceServiceTag": "ABC1234",
+                       "Type": 1000, "DeviceManagement": [{"NetworkAddress": "192.168.0.2"}]}]})
+        open_url_mock = mocker.patch('ansible.module_utils.remote_management.dellemc.ome.open_url',
+                                     return_value=mock_response)
+        module_params = {'hostname': '192.168.0.1', 'username': 'username',
+                         'password': 'password', "port": 443}
+        with RestOME(module_params, False) as obj:
+            response = obj.invoke_request("GET", "DeviceService/Devices", query_param={"$top": 1},
+                                          select=["Id", "DeviceServiceTag", "Type"])
+        assert "%24select=Id%2CDeviceServiceTag%2CType" in open_url_mock.call_args[0][0]
+        assert response.json_data == {
+            "@odata.count": 1,
+            "value": [{"@odata.id": "/api/DeviceService/Devices(10)", "Id": 10, "DeviceServiceTag": "ABC1234",
+                       "Type": 1000}]}
+
     def test_get_report_list_error_case(self, mock_response, mocker, ome_connection_mock):
         mocker.patch('ansible.module_utils.remote_management.dellemc.ome.open_url',
                      return_value=mock_response)
@@ -99,3 +274,529 @@ class TestRestOME(object):
         with pytest.raises(HTTPError) as e:
             with RestOME(module_params, False) as obj:
                 obj.get_all_report_details("DeviceService/Devices")
+
+    def test_invoke_request_keep_alive_reuses_connection(self, ome_stand_in, mocker):
+        open_url_mock = mocker.patch('ansible.module_utils.remote_management.dellemc.ome.open_url')
+        module_params = {'hostname': '127.0.0.1', 'username': 'username',
+                         'password': 'password', "port": ome_stand_in.server_port}
+        obj = RestOME(module_params, False, keep_alive=True)
+        obj.protocol = 'http'
+        with obj:
+            for skip in range(5):
+                response = obj.invoke_request("GET", "DeviceService/Devices", query_param={"$skip": skip})
+                assert response.status_code == 200
+                assert response.json_data["path"] == "/api/DeviceService/Devices?%24skip={0}".format(skip)
+        assert ome_stand_in.connections == 1
+        assert obj._pool is None
+        assert open_url_mock.called is False
+
+    def test_invoke_request_keep_alive_streaming_body(self, ome_stand_in, tmpdir):
+        module_params = {'hostname': '127.0.0.1', 'username': 'username',
+                         'password': 'password', "port": ome_stand_in.server_port}
+        dup_file = tmpdir.join("dup.exe")
+        dup_file.write("firmware" * 50000)
+        obj = RestOME(module_params, False, keep_alive=True)
+        obj.protocol = 'http'
+        with obj, open(str(dup_file), "rb") as dup:
+            payload = StreamingBody([dup])
+            headers = {"Content-Type": "application/octet-stream", "Content-Length": str(len(payload))}
+            response = obj.invoke_request("POST", "UpdateService/Actions/UpdateService.UploadFile", data=payload,
+                                          headers=headers, dump=False)
+            assert response.json_data == {"received": 400000}
+            obj.invoke_request("POST", "JobService/Jobs", data={"Id": 0})
+        (upload_headers, upload), (job_headers, job) = ome_stand_in.posts
+        assert upload == b"firmware" * 50000 and upload_headers["Content-Type"] == "application/octet-stream"
+        assert job == b'{"Id": 0}' and job_headers["Content-Type"] == "application/json"
+        assert ome_stand_in.connections == 1
+
+    def test_invoke_request_keep_alive_stale_connection(self, ome_stand_in):
+        module_params = {'hostname': '127.0.0.1', 'username': 'username',
+                         'password': 'password', "port": ome_stand_in.server_port}
+        obj = RestOME(module_params, False, keep_alive=True)
+        obj.protocol = 'http'
+        with obj:
+            obj.invoke_request("GET", "DeviceService/close")
+            response = obj.invoke_request("POST", "JobService/Jobs", data={"Id": 0})
+        assert response.json_data == {"received": 9}
+        assert len(ome_stand_in.posts) == 1
+        assert ome_stand_in.connections == 2
+
+    def test_invoke_request_keep_alive_no_resend_after_timeout(self, ome_stand_in):
+        module_params = {'hostname': '127.0.0.1', 'username': 'username',
+                         'password': 'password', "port": ome_stand_in.server_port}
+        obj = RestOME(module_params, False, keep_alive=True)
+        obj.protocol = 'http'
+        with pytest.raises(URLError):
+            with obj:
+                obj.invoke_request("GET", "DeviceService/Devices")
+                obj.invoke_request("POST", "JobService/slow", data={"Id": 0}, api_timeout=0.2)
+        assert len(ome_stand_in.posts) == 1
+
+    @pytest.mark.parametrize("method,err,sent,resend", [
+        ("GET", socket.timeout(), True, True),
+        ("POST", socket.timeout(), True, False),
+        ("POST", socket.error(32, "Broken pipe"), False, True),
+        ("POST", http_client.BadStatusLine("''"), True, True),
+        ("POST", socket.error(104, "Connection reset by peer"), True, False)])
+    def test_pool_can_resend(self, method, err, sent, resend):
+        assert ConnectionPool._can_resend(method, err, sent, None) is resend
+
+    def test_invoke_request_keep_alive_redirect(self, ome_stand_in):
+        module_params = {'hostname': '127.0.0.1', 'username': 'username',
+                         'password': 'password', "port": ome_stand_in.server_port}
+        obj = RestOME(module_params, False, keep_alive=True)
+        obj.protocol = 'http'
+        with obj:
+            response = obj.invoke_request("GET", "DeviceService/moved")
+        assert response.status_code == 200
+        assert response.json_data["path"] == "/api/DeviceService/Devices"
+
+    def test_invoke_request_keep_alive_http_error(self, ome_stand_in):
+        module_params = {'hostname': '127.0.0.1', 'username': 'username',
+                         'password': 'password', "port": ome_stand_in.server_port}
+        obj = RestOME(module_params, False, keep_alive=True)
+        obj.protocol = 'http'
+        with pytest.raises(HTTPError) as err:
+            with obj:
+                obj.invoke_request("GET", "DeviceService/missing")
+        assert err.value.code == 404
+        assert json.load(err.value) == {"error": {"message": "Not Found"}}
+
+    def test_invoke_request_keep_alive_idle_timeout(self, ome_stand_in):
+        module_params = {'hostname': '127.0.0.1', 'username': 'username',
+                         'password': 'password', "port": ome_stand_in.server_port}
+        obj = RestOME(module_params, False, keep_alive=True, pool_idle_timeout=0)
+        obj.protocol = 'http'
+        with obj:
+            obj.invoke_request("GET", "DeviceService/Devices")
+            obj.invoke_request("GET", "DeviceService/Devices")
+        assert ome_stand_in.connections == 2
+
+    def test_invoke_request_keep_alive_proxy_fallback(self, mock_response, mocker):
+        mocker.patch('ansible.module_utils.remote_management.dellemc.ome.getproxies',
+                     return_value={"https": "http://proxy:3128"})
+        mocker.patch('ansible.module_utils.remote_management.dellemc.ome.proxy_bypass', return_value=False)
+        open_url_mock = mocker.patch('ansible.module_utils.remote_management.dellemc.ome.open_url',
+                                     return_value=mock_response)
+        module_params = {'hostname': '192.168.0.1', 'username': 'username',
+                         'password': 'password', "port": 443}
+        with RestOME(module_params, False, keep_alive=True) as obj:
+            response = obj.invoke_request("GET", "/testpath")
+            assert obj._pool is None
+        assert response.json_data == {"value": "data"}
+        assert open_url_mock.called is True
+
+    @pytest.fixture
+    def session_appliance(self, mocker):
+        """Routes open_url calls to a fake appliance which accepts only the tokens of its live sessions."""
+        appliance = {"sessions": {}, "calls": [], "on_reject": None}
+
+        def open_url(url, data=None, method=None, headers=None, **kwargs):
+            appliance["calls"].append((method, url))
+            response = MagicMock()
+            response.getcode.return_value = 200
+            if url.endswith("SessionService/Sessions") and method == "POST":
+                session_id = str(len(appliance["calls"]))
+                appliance["sessions"][session_id] = "token_" + session_id
+                response.headers = {"X-Auth-Token": "token_" + session_id}
+                response.read.return_value = json.dumps({"Id": session_id})
+                return response
+            if headers.get("X-Auth-Token") not in appliance["sessions"].values():
+                if appliance["on_reject"] is not None:
+                    appliance["on_reject"]()
+                raise HTTPError(url, 401, "Unauthorized", {}, None)
+            if method == "DELETE":
+                appliance["sessions"] = dict((k, v) for k, v in appliance["sessions"].items()
+                                             if v != headers["X-Auth-Token"])
+            response.headers = {}
+            response.read.return_value = json.dumps({"value": "data"})
+            return response
+        mocker.patch('ansible.module_utils.remote_management.dellemc.ome.open_url', side_effect=open_url)
+        return appliance
+
+    def test_session_cache_reuses_session(self, session_appliance, tmpdir):
+        import os
+        import stat
+        cache_path = str(tmpdir.join("ome_sessions.json"))
+        module_params = {'hostname': '192.168.0.1', 'username': 'username',
+                         'password': 'password', "port": 443}
+        with RestOME(module_params, True, session_cache=cache_path) as obj:
+            obj.invoke_request("GET", "DeviceService/Devices")
+        assert stat.S_IMODE(os.stat(cache_path).st_mode) == 0o600
+        with open(cache_path) as cache_file:
+            cached = json.load(cache_file)["username@192.168.0.1:443"]
+        assert cached["Token"] in session_appliance["sessions"].values()
+        session_appliance["calls"] = []
+        with RestOME(module_params, True, session_cache=cache_path) as obj:
+            obj.invoke_request("GET", "DeviceService/Devices")
+            assert obj.session_id == cached["Id"]
+        assert [call[0] for call in session_appliance["calls"]] == ["GET", "GET"]
+        obj.logout()
+        assert session_appliance["sessions"] == {}
+        with open(cache_path) as cache_file:
+            assert json.load(cache_file) == {}
+
+    def test_session_cache_reauthenticates_rejected_token(self, session_appliance, tmpdir, monkeypatch):
+        cache_path = str(tmpdir.join("ome_sessions.json"))
+        monkeypatch.setenv("OME_SESSION_CACHE", cache_path)
+        module_params = {'hostname': '192.168.0.1', 'username': 'username',
+                         'password': 'password', "port": 443}
+        with RestOME(module_params, True) as obj:
+            first_id = obj.session_id
+        with RestOME(module_params, True) as obj:
+            assert obj.session_id == first_id
+            session_appliance["sessions"].clear()
+            response = obj.invoke_request("GET", "DeviceService/Devices")
+            assert response.json_data == {"value": "data"}
+            assert obj.session_id != first_id
+        second_id = obj.session_id
+        with RestOME(module_params, True, session_ttl=-1) as obj:
+            assert obj.session_id != second_id
+        assert list(session_appliance["sessions"]) == [obj.session_id]
+
+    def test_session_cache_reauthenticates_once_for_concurrent_requests(self, session_appliance, tmpdir):
+        cache_path = str(tmpdir.join("ome_sessions.json"))
+        module_params = {'hostname': '192.168.0.1', 'username': 'username',
+                         'password': 'password', "port": 443}
+        with RestOME(module_params, True, session_cache=cache_path) as obj:
+            first_id = obj.session_id
+        rejected, count = threading.Condition(), [0]
+
+        def on_reject():
+            with rejected:
+                count[0] += 1
+                rejected.notify_all()
+                while count[0] < 4:
+                    rejected.wait(5)
+        with RestOME(module_params, True, session_cache=cache_path) as obj:
+            assert obj.session_id == first_id
+            session_appliance["sessions"].clear()
+            session_appliance["calls"], session_appliance["on_reject"] = [], on_reject
+            pool = ThreadPool(4)
+            try:
+                responses = pool.map(lambda index: obj.invoke_request("GET", "DeviceService/Devices"), range(4))
+            finally:
+                pool.close()
+                pool.join()
+        assert [response.json_data for response in responses] == [{"value": "data"}] * 4
+        assert [call[0] for call in session_appliance["calls"]].count("POST") == 1
+        assert list(session_appliance["sessions"]) == [obj.session_id]
+
+    def test_resolve_devices_filter_chunks(self, mocker):
+        inventory = [{"Id": 1000 + index, "DeviceServiceTag": "TAG{0:04d}".format(index), "Type": 1000}
+                     for index in range(120)]
+
+        def iter_collection(uri, select=None, query_param=None):
+            clauses = query_param["$filter"].split(" or ")
+            for device in inventory:
+                if "DeviceServiceTag eq '{0}'".format(device["DeviceServiceTag"]) in clauses or \
+                        "Id eq {0}".format(device["Id"]) in clauses:
+                    yield device
+        iter_mock = mocker.patch('ansible.module_utils.remote_management.dellemc.ome.RestOME.iter_collection',
+                                 side_effect=iter_collection)
+        module_params = {'hostname': '192.168.0.1', 'username': 'username',
+                         'password': 'password', "port": 443}
+        tags = ["TAG{0:04d}".format(index) for index in range(100)] + ["MISSING"]
+        with RestOME(module_params, False) as obj:
+            devices, unresolved = obj.resolve_devices(device_ids=[1105, 99], service_tags=tags)
+        assert unresolved == ["99", "MISSING"]
+        assert devices["1105"]["DeviceServiceTag"] == "TAG0105"
+        assert devices["TAG0042"]["Id"] == 1042
+        assert iter_mock.call_count > 1
+        for call in iter_mock.call_args_list:
+            assert len(urlencode(call[1]["query_param"])) <= 1500
+            assert call[1]["select"] == ["Id", "DeviceServiceTag", "Type"]
+
+    @pytest.mark.parametrize("max_workers", [1, 4])
+    def test_get_devices_by_id(self, max_workers, mocker):
+        def invoke_request(method, uri, select=None):
+            if uri == "DeviceService/Devices(99)":
+                raise HTTPError("https://192.168.0.1:443/api/" + uri, 404, "Not Found", {}, None)
+            return MagicMock(json_data={"Id": int(uri[len("DeviceService/Devices("):-1]), "Type": 1000})
+        invoke_mock = mocker.patch('ansible.module_utils.remote_management.dellemc.ome.RestOME.invoke_request',
+                                   side_effect=invoke_request)
+        module_params = {'hostname': '192.168.0.1', 'username': 'username',
+                         'password': 'password', "port": 443}
+        with RestOME(module_params, False) as obj:
+            devices = obj.get_devices_by_id([1105, "99", 1106, "1105", "TAG"], max_workers=max_workers)
+        assert devices == {"1105": {"Id": 1105, "Type": 1000}, "1106": {"Id": 1106, "Type": 1000}}
+        assert sorted(call[0][1] for call in invoke_mock.call_args_list) == \
+            ["DeviceService/Devices(1105)", "DeviceService/Devices(1106)", "DeviceService/Devices(99)"]
+        assert all(call[1]["select"] == ["Id", "DeviceServiceTag", "Type"] for call in invoke_mock.call_args_list)
+
+    def test_get_device_error(self, mocker):
+        mocker.patch('ansible.module_utils.remote_management.dellemc.ome.RestOME.invoke_request',
+                     side_effect=HTTPError("https://192.168.0.1:443/api/", 500, "Server Error", {}, None))
+        module_params = {'hostname': '192.168.0.1', 'username': 'username',
+                         'password': 'password', "port": 443}
+        with RestOME(module_params, False) as obj:
+            with pytest.raises(HTTPError):
+                obj.get_device(1105)
+
+    def test_get_devices_by_tag(self, mocker):
+        iter_mock = mocker.patch('ansible.module_utils.remote_management.dellemc.ome.RestOME.iter_collection',
+                                 return_value=iter([{"Id": 1001, "DeviceServiceTag": "TAG0001"}]))
+        module_params = {'hostname': '192.168.0.1', 'username': 'username',
+                         'password': 'password', "port": 443}
+        with RestOME(module_params, False) as obj:
+            assert obj.get_devices_by_tag([]) == {}
+            devices = obj.get_devices_by_tag(["TAG0001", "NONE"], select=["Id", "PowerState"])
+        assert devices == {"TAG0001": {"Id": 1001, "DeviceServiceTag": "TAG0001"}}
+        iter_mock.assert_called_once_with("DeviceService/Devices", select=["Id", "PowerState", "DeviceServiceTag"],
+                                          query_param={"$filter": "DeviceServiceTag eq 'NONE' or "
+                                                                  "DeviceServiceTag eq 'TAG0001'"})
+
+    def test_resolve_devices_sweep(self, mocker):
+        inventory = [{"Id": 1000 + index, "DeviceServiceTag": "TAG{0:04d}".format(index)} for index in range(10)]
+        iter_mock = mocker.patch('ansible.module_utils.remote_management.dellemc.ome.RestOME.iter_collection',
+                                 return_value=iter(inventory))
+        module_params = {'hostname': '192.168.0.1', 'username': 'username',
+                         'password': 'password', "port": 443}
+        with RestOME(module_params, False) as obj:
+            devices, unresolved = obj.resolve_devices(service_tags=["TAG0001", "TAG0003", "NONE"],
+                                                      select=None, sweep_threshold=2)
+        iter_mock.assert_called_once_with("DeviceService/Devices", select=None)
+        assert sorted(devices) == ["TAG0001", "TAG0003"]
+        assert unresolved == ["NONE"]
+
+    def test_get_device_inventory_incremental_cache(self, mocker, tmpdir):
+        inventory = [{"Id": 10 + index, "DeviceServiceTag": "TAG{0}".format(index), "PowerState": 17,
+                      "LastInventoryTime": "2020-05-11 06:00:00.000", "LastStatusTime": "2020-05-11 07:00:00.000"}
+                     for index in range(5)]
+        requests = []
+
+        def invoke_request(method, uri, query_param=None, select=None):
+            query_param = query_param or {}
+            requests.append(query_param.get("$filter"))
+            devices = inventory
+            if query_param.get("$filter", "").startswith("LastInventoryTime ge "):
+                watermark = query_param["$filter"].split("'")[1]
+                devices = [device for device in inventory if (device["LastInventoryTime"] or "") >= watermark or
+                           (device["LastStatusTime"] or "") >= watermark]
+            elif query_param.get("$filter"):
+                devices = [device for device in inventory
+                           if "Id eq {0}".format(device["Id"]) in query_param["$filter"].split(" or ")]
+            skip = query_param.get("$skip", 0)
+            response = MagicMock()
+            response.json_data = {"@odata.context": "/api/$metadata#Collection(DeviceService.Device)",
+                                  "@odata.count": len(devices),
+                                  "value": devices[skip:skip + query_param.get("$top", 2)]}
+            return response
+        mocker.patch('ansible.module_utils.remote_management.dellemc.ome.RestOME.invoke_request',
+                     side_effect=invoke_request)
+        module_params = {'hostname': '192.168.0.1', 'username': 'username',
+                         'password': 'password', "port": 443}
+        cache_dir = str(tmpdir)
+        with RestOME(module_params, False, inventory_cache=cache_dir) as obj:
+            facts = obj.get_device_inventory()
+        assert facts["@odata.count"] == 5
+        assert tmpdir.join("ome_inventory_username@192.168.0.1_443.json").check()
+
+        inventory[1] = dict(inventory[1], PowerState=18, LastStatusTime="2020-05-11 08:00:00.000")
+        del inventory[3]
+        inventory.append({"Id": 99, "DeviceServiceTag": "TAG99", "PowerState": 17,
+                          "LastInventoryTime": "2020-05-11 08:30:00.000", "LastStatusTime": None})
+        del requests[:]
+        with RestOME(module_params, False, inventory_cache=cache_dir) as obj:
+            devices, unresolved = obj.resolve_devices(service_tags=["TAG1", "TAG3", "TAG99"])
+            facts = obj.get_device_inventory()
+        assert [device["Id"] for device in facts["value"]] == [10, 11, 12, 14, 99]
+        assert devices["TAG1"]["PowerState"] == 18
+        assert unresolved == ["TAG3"]
+        assert requests[0] == "LastInventoryTime ge '2020-05-11 07:00:00.000' or " \
+                              "LastStatusTime ge '2020-05-11 07:00:00.000'"
+        assert len(requests) == 3
+
+    def test_invoke_request_perf_record(self, ome_stand_in):
+        recorder = PerfRecorder(enabled=True)
+        module_params = {'hostname': '127.0.0.1', 'username': 'username',
+                         'password': 'password', "port": ome_stand_in.server_port}
+        obj = RestOME(module_params, False, keep_alive=True, perf_recorder=recorder)
+        obj.protocol = 'http'
+        with obj:
+            obj.invoke_request("GET", "DeviceService/Devices").json_data
+            obj.invoke_request("GET", "DeviceService/Devices", query_param={"$top": 1}).json_data
+            with pytest.raises(HTTPError):
+                obj.invoke_request("GET", "DeviceService/missing")
+        first, second, third = recorder.records
+        assert first["connect_ms"] > 0 and second["connect_ms"] == 0
+        assert first["first_byte_ms"] > 0 and first["decode_ms"] > 0
+        assert first["received"] == len(json.dumps({"value": "data", "path": "/api/DeviceService/Devices"}))
+        assert second["path"] == "/api/DeviceService/Devices?%24top=1"
+        assert [record["status"] for record in recorder.records] == [200, 200, 404]
+
+    def test_invoke_request_retries_transient_errors(self, mock_response, mocker):
+        busy = HTTPError('http://testhost.com/', 503, 'Service Unavailable', {"Retry-After": "2"}, None)
+        open_url_mock = mocker.patch('ansible.module_utils.remote_management.dellemc.ome.open_url',
+                                     side_effect=[busy, URLError("connection reset"), mock_response])
+        sleep_mock = MagicMock()
+        module_params = {'hostname': '192.168.0.1', 'username': 'username',
+                         'password': 'password', "port": 443}
+        with RestOME(module_params, False, retry_policy=RetryPolicy(sleep=sleep_mock, backoff_factor=0)) as obj:
+            response = obj.invoke_request("GET", "DeviceService/Devices")
+        assert response.json_data == {"value": "data"}
+        assert open_url_mock.call_count == 3
+        assert [call[0][0] for call in sleep_mock.call_args_list] == [2, 0]
+
+    @pytest.mark.parametrize("method,retry,calls", [("POST", None, 1), ("POST", True, 2), ("GET", False, 1)])
+    def test_invoke_request_retry_override(self, method, retry, calls, mock_response, mocker):
+        busy = HTTPError('http://testhost.com/', 503, 'Service Unavailable', {}, None)
+        open_url_mock = mocker.patch('ansible.module_utils.remote_management.dellemc.ome.open_url',
+                                     side_effect=[busy, mock_response])
+        module_params = {'hostname': '192.168.0.1', 'username': 'username',
+                         'password': 'password', "port": 443}
+        with RestOME(module_params, False, retry_policy=RetryPolicy(sleep=MagicMock())) as obj:
+            if calls == 1:
+                with pytest.raises(HTTPError):
+                    obj.invoke_request(method, "JobService/Jobs", retry=retry)
+            else:
+                obj.invoke_request(method, "JobService/Jobs", retry=retry)
+        assert open_url_mock.call_count == calls
+
+    @pytest.mark.parametrize("rewindable", [True, False])
+    def test_invoke_request_retry_rewinds_body(self, rewindable, mock_response, mocker, tmpdir):
+        dup_file = tmpdir.join("dup.exe")
+        dup_file.write("firmware" * 1000)
+        bodies = []
+
+        def open_url(url, data=None, **kwargs):
+            bodies.append(data.read())
+            if len(bodies) == 1:
+                raise URLError("connection reset")
+            return mock_response
+        open_url_mock = mocker.patch('ansible.module_utils.remote_management.dellemc.ome.open_url',
+                                     side_effect=open_url)
+        module_params = {'hostname': '192.168.0.1', 'username': 'username',
+                         'password': 'password', "port": 443}
+        with RestOME(module_params, False, retry_policy=RetryPolicy(sleep=MagicMock())) as obj, \
+                open(str(dup_file), "rb") as dup:
+            data = StreamingBody([dup]) if rewindable else OneShotBody(dup.read())
+            if rewindable:
+                obj.invoke_request("POST", "UpdateService/Actions/UpdateService.UploadFile", data=data,
+                                   dump=False, retry=True)
+            else:
+                with pytest.raises(URLError):
+                    obj.invoke_request("POST", "UpdateService/Actions/UpdateService.UploadFile", data=data,
+                                       dump=False, retry=True)
+        assert open_url_mock.call_count == (2 if rewindable else 1)
+        assert all(body == b"firmware" * 1000 for body in bodies)
+
+
+class TestJobTracker(object):
+
+    @pytest.fixture
+    def job_rest_obj(self):
+        def job_resp(json_data):
+            resp = MagicMock()
+            resp.json_data = json_data
+            return resp
+
+        def invoke_request(method, path):
+            if path.endswith("ExecutionHistoryDetails"):
+                return job_resp({"value": [{"Key": "SVCTAG1", "Value": "Done"}]})
+            if path.endswith("ExecutionHistories"):
+                return job_resp({"value": [{"Id": 1}, {"Id": 2}]})
+            return job_resp({"Id": 10, "LastRunStatus": {"Name": statuses.pop(0)}})
+        statuses = []
+        rest_obj = MagicMock()
+        rest_obj.invoke_request.side_effect = invoke_request
+        return rest_obj, statuses
+
+    def test_wait_adaptive_intervals(self, job_rest_obj):
+        rest_obj, statuses = job_rest_obj
+        statuses.extend(["Running"] * 5 + ["Completed"])
+        sleep_mock = MagicMock()
+        job, tracking = JobTracker(rest_obj, min_interval=2, max_interval=6, sleep=sleep_mock).wait(10)
+        assert job["LastRunStatus"]["Name"] == "Completed"
+        assert [call[0][0] for call in sleep_mock.call_args_list] == [2, 3, 4.5, 6, 6]
+        assert tracking["status"] == "Completed" and tracking["polls"] == 6
+        assert tracking["timed_out"] is False
+        assert [history["Id"] for history in tracking["execution_history"]] == [2, 1]
+        assert tracking["execution_history"][0]["ExecutionHistoryDetails"] == [{"Key": "SVCTAG1", "Value": "Done"}]
+        assert "ExecutionHistoryDetails" not in tracking["execution_history"][1]
+        rest_obj.invoke_request.assert_any_call(
+            "GET", "JobService/Jobs(10)/ExecutionHistories(2)/ExecutionHistoryDetails")
+
+    def test_wait_timeout(self, job_rest_obj):
+        rest_obj, statuses = job_rest_obj
+        statuses.extend(["Running", "Failed"])
+        sleep_mock = MagicMock()
+        job, tracking = JobTracker(rest_obj, sleep=sleep_mock).wait(10, timeout=0, history=False)
+        assert tracking["timed_out"] is True and tracking["status"] == "Running"
+        assert "execution_history" not in tracking
+        assert sleep_mock.called is False
+
+    def test_get_jobs_chunked_filters(self):
+        rest_obj = MagicMock()
+        rest_obj.iter_collection.side_effect = lambda uri, select, query_param: [
+            {"Id": int(clause.split()[-1])} for clause in query_param["$filter"].split(" or ")]
+        jobs = JobTracker(rest_obj).get_jobs(list(range(1000, 1300)))
+        assert sorted(jobs) == list(range(1000, 1300))
+        assert rest_obj.iter_collection.call_count > 1
+        for call in rest_obj.iter_collection.call_args_list:
+            assert call[0][0] == "JobService/Jobs"
+            assert len(urlencode(call[1]["query_param"])) <= 1500 + len("%24filter=")
+
+    def test_wait_all_polls_pending_jobs(self):
+        states = {1: ["Completed"], 2: ["Running", "Running", "Failed"], 3: ["Running", "Completed"]}
+        polled = []
+
+        def iter_collection(uri, select, query_param):
+            ids = [int(clause.split()[-1]) for clause in query_param["$filter"].split(" or ")]
+            if select:
+                polled.append(ids)
+                return [{"Id": job_id, "LastRunStatus": {"Name": states[job_id].pop(0)}}
+                        for job_id in ids if job_id in states]
+            return [{"Id": job_id, "LastRunStatus": {"Name": "Completed"}, "Targets": []}
+                    for job_id in ids if job_id in states]
+        rest_obj = MagicMock()
+        rest_obj.iter_collection.side_effect = iter_collection
+        sleep_mock = MagicMock()
+        jobs, summary = JobTracker(rest_obj, sleep=sleep_mock).wait_all([1, 2, 3, 4])
+        assert polled == [[1, 2, 3, 4], [2, 3], [2]]
+        assert sorted(jobs) == [1, 2, 3]
+        assert all("Targets" in job for job in jobs.values())
+        assert summary["missing"] == [4] and summary["polls"] == 3
+        assert summary["timed_out"] is False
+        assert sleep_mock.call_count == 2
+
+    def test_summarize(self):
+        jobs = {1: {"LastRunStatus": {"Name": "Completed"}}, 2: {"LastRunStatus": {"Name": "Warning"}},
+                3: {"LastRunStatus": {"Name": "Running"}}, 5: {"LastRunStatus": {"Name": "Completed"}}}
+        summary = JobTracker.summarize([1, 2, 3, 4, 5], jobs)
+        assert summary == {"total": 5, "status_counts": {"Completed": 2, "Warning": 1, "Running": 1},
+                           "missing": [4], "pending": [3], "failed": [2]}
+
+    def test_get_changed_jobs_cursor(self, tmpdir):
+        feed = [{"Id": 1, "LastRun": "2020-06-01 10:00:00.000", "UpdatedDate": None},
+                {"Id": 2, "LastRun": "2020-06-01 10:05:00.000", "UpdatedDate": "2020-06-01 09:00:00.000"},
+                {"Id": 3, "LastRun": None, "UpdatedDate": "2020-06-01 10:05:00.000"}]
+        queries = []
+
+        def iter_collection(uri, query_param=None):
+            queries.append(query_param)
+            since = ""
+            if query_param and " ge " in query_param["$filter"]:
+                since = query_param["$filter"].split("ge '")[1][:23]
+            return [dict(job) for job in feed if JobTracker.job_stamp(job) >= since]
+        rest_obj = MagicMock()
+        rest_obj._session_key.return_value = "username@192.168.0.1:443"
+        rest_obj.iter_collection.side_effect = iter_collection
+        cursor_path = str(tmpdir.join("ome_job_cursor.json"))
+        tracker = JobTracker(rest_obj)
+        jobs, cursor = tracker.get_changed_jobs(cursor_path)
+        assert [job["Id"] for job in jobs] == [1, 2, 3]
+        assert cursor == {"previous": None, "current": "2020-06-01 10:05:00.000", "changed": 3}
+        assert queries[-1] is None
+        assert oct(tmpdir.join("ome_job_cursor.json").stat().mode & 0o777)[-3:] == "600"
+
+        feed.append({"Id": 4, "LastRun": "2020-06-01 10:05:00.000"})
+        jobs, cursor = tracker.get_changed_jobs(cursor_path)
+        assert [job["Id"] for job in jobs] == [4]
+        assert queries[-1] == {"$filter": "(LastRun ge '2020-06-01 10:05:00.000' or "
+                                          "UpdatedDate ge '2020-06-01 10:05:00.000')"}
+        assert cursor["previous"] == cursor["current"] == "2020-06-01 10:05:00.000"
+
+        jobs, cursor = tracker.get_changed_jobs(cursor_path, query_filter="JobType/Id eq 5")
+        assert len(jobs) == 4 and cursor["previous"] is None
+        assert queries[-1] == {"$filter": "(JobType/Id eq 5)"}
@@ -0,0 +1,69 @@
+# -*- coding: utf-8 -*-
+
+#
+# Dell EMC OpenManage Ansible Modules
+# Version 2.0.7
+# Copyright (C) 2020 Dell Inc.
+
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+# All rights reserved. Dell, EMC, and other trademarks are trademarks of Dell Inc. or its subsidiaries.
+# Other trademarks may be trademarks of their respective owners.
+#
+
+from __future__ import absolute_import
+
+import json
+import pytest
+from ansible.module_utils.basic import AnsibleModule
+from ansible.module_utils.remote_management.dellemc.perf import PerfAnsibleModule, PerfRecorder, TIMINGS
+from units.compat.mock import patch
+
+
+class TestPerfRecorder(object):
+    def test_disabled_recorder(self):
+        recorder = PerfRecorder()
+        assert recorder.start("ome", "GET", "https://192.168.0.1:443/api/DeviceService/Devices") is None
+        assert recorder.summary()["requests"] == 0
+
+    def test_summary_and_trace(self, tmpdir):
+        trace_path = str(tmpdir.join("trace.jsonl"))
+        recorder = PerfRecorder(trace_path=trace_path, slowest=1)
+        assert recorder.enabled is True
+        first = recorder.start("ome", "GET", "https://192.168.0.1:443/api/DeviceService/Devices?%24top=1")
+        first.update({"status": 200, "received": 100, "first_byte_ms": 5.0, "read_ms": 1.0, "decode_ms": 0.5})
+        second = recorder.start("redfish", "POST", "https://192.168.0.2/redfish/v1/Sessions", sent=50)
+        second.update({"status": 201, "received": 10, "connect_ms": 2.0, "first_byte_ms": 20.0, "retries": 1})
+        summary = recorder.summary()
+        assert summary["requests"] == 2
+        assert summary["retries"] == 1
+        assert summary["bytes_sent"] == 50
+        assert summary["bytes_received"] == 110
+        assert summary["total_ms"] == 28.5
+        assert [call["path"] for call in summary["slowest"]] == ["/redfish/v1/Sessions"]
+        recorder.flush_trace()
+        recorder.flush_trace()
+        with open(trace_path) as trace_file:
+            lines = [json.loads(line) for line in trace_file]
+        assert [line["path"] for line in lines] == ["/api/DeviceService/Devices?%24top=1", "/redfish/v1/Sessions"]
+        assert lines[0]["host"] == "192.168.0.1"
+        assert lines[0]["total_ms"] == 6.5
+        assert all(key in lines[1] for key in TIMINGS)
+
+    @pytest.mark.parametrize("result_func", ["exit_json", "fail_json"])
+    def test_perf_ansible_module(self, result_func):
+        recorder = PerfRecorder(enabled=True)
+        recorder.start("idrac", "GET", "https://192.168.0.1:443/redfish/v1")
+        module = PerfAnsibleModule.__new__(PerfAnsibleModule)
+        module.perf_recorder = recorder
+        with patch.object(AnsibleModule, result_func) as base_func:
+            getattr(module, result_func)(msg="done")
+        args = base_func.call_args[1]
+        assert args["msg"] == "done"
+        assert args["perf"]["requests"] == 1
+
+    def test_perf_ansible_module_disabled(self):
+        module = PerfAnsibleModule.__new__(PerfAnsibleModule)
+        module.perf_recorder = PerfRecorder()
+        with patch.object(AnsibleModule, "exit_json") as exit_json:
+            module.exit_json(msg="done")
+        exit_json.assert_called_once_with(msg="done")
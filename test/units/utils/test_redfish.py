@@ -0,0 +1,450 @@
+# -*- coding: utf-8 -*-
+
+#
+# Dell EMC OpenManage Ansible Modules
+# Version 2.0.7
+# Copyright (C) 2020 Dell Inc.
+
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+# All rights reserved. Dell, EMC, and other trademarks are trademarks of Dell Inc. or its subsidiaries.
+# Other trademarks may be trademarks of their respective owners.
+#
+
+from __future__ import absolute_import
+
+import json
+import threading
+import time
+import pytest
+from ansible.module_utils.six.moves.urllib.error import HTTPError, URLError
+from ansible.module_utils.six.moves.BaseHTTPServer import HTTPServer, BaseHTTPRequestHandler
+from ansible.module_utils.six.moves.socketserver import ThreadingMixIn
+from ansible.module_utils.six.moves.urllib.parse import parse_qsl
+from ansible.module_utils.remote_management.dellemc.redfish import Redfish, TaskMonitor
+from ansible.module_utils.remote_management.dellemc.retry import RetryPolicy
+from ansible.module_utils.remote_management.dellemc.upload import multipart_file_body
+from units.compat.mock import MagicMock
+
+VOLUME_URI = "/redfish/v1/Systems/System.Embedded.1/Storage/RAID.Slot.1-1/Volumes/Disk.Virtual.0:RAID.Slot.1-1"
+
+
+class RedfishStandInHandler(BaseHTTPRequestHandler):
+    """
+    Simulates a Redfish service with asynchronous tasks. Unless an event stream is open,
+    each GET of a task advances its progress by one step of the script registered in the
+    server's tasks. Each connection to the Server-Sent Events stream plays the next script
+    of the server's streams, which waits for tasks to be polled, advances them and sends events.
+    """
+    protocol_version = "HTTP/1.1"
+
+    def _send(self, code, body=None, headers=None):
+        data = json.dumps(body).encode() if body is not None else b""
+        self.send_response(code)
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        if self.path != "/redfish/v1/Sessions":
+            self.server.uploads.append((self.path, dict(self.headers.items()), body))
+            return self._send(201, {}, {"Location": "/redfish/v1/UpdateService/FirmwareInventory/Available-1"})
+        self._send(201, {"Id": "1"}, {"X-Auth-Token": "token", "Location": "/redfish/v1/Sessions/1"})
+
+    def do_DELETE(self):
+        self._send(200, {})
+
+    def do_GET(self):
+        self.server.requests.append(self.path)
+        if self.path == VOLUME_URI:
+            return self._send(200, {"@odata.id": VOLUME_URI, "Name": "VD0"})
+        path, sep, query = self.path.partition("?")
+        if path in self.server.resources:
+            return self._send(200, self._collection_page(path, dict(parse_qsl(query))))
+        if self.path == "/redfish/v1/EventService":
+            sse = {"ServerSentEventUri": "/redfish/v1/SSE"} if self.server.streams is not None else {}
+            return self._send(200, dict(sse, Id="EventService"))
+        if self.path == "/redfish/v1/SSE" and self.server.streams:
+            return self._stream(self.server.streams.pop(0))
+        steps = self.server.tasks.get(self.path)
+        if not steps:
+            return self._send(404, {"error": {"message": "Not Found"}})
+        advance = len(steps) > 1 and not self.server.streaming
+        code, body, headers = steps.pop(0) if advance else steps[0]
+        self._send(code, body, headers)
+
+    def _collection_page(self, path, query):
+        """Pages collections by the server's page_size, with next links unless the server has no_next_link"""
+        body, page_size = self.server.resources[path], self.server.page_size
+        if "Members" in body and page_size:
+            skip, members = int(query.get("$skip", 0)), body["Members"]
+            body = dict(body, Members=members[skip:skip + page_size])
+            body["Members@odata.count"] = len(members)
+            if skip + page_size < len(members) and not self.server.no_next_link:
+                body["Members@odata.nextLink"] = "{0}?$skip={1}".format(path, skip + page_size)
+        if "$expand" in query:
+            body = dict(body, Members=[self.server.resources.get(member["@odata.id"], member)
+                                       for member in body.get("Members", [])])
+        return body
+
+    def _stream(self, script):
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Connection", "close")
+        self.end_headers()
+        self.server.streaming += 1
+        try:
+            for action, arg in script:
+                if action == "advance":
+                    self.server.tasks[arg].pop(0)
+                elif action == "event":
+                    self.wfile.write("id: 1\ndata: {0}\n\n".format(json.dumps(arg)).encode())
+                elif action == "comment":
+                    self.wfile.write(b": keep-alive\n\n")
+                elif action == "hold":
+                    time.sleep(arg)
+                elif action == "polled":
+                    deadline = time.time() + 5
+                    while arg not in self.server.requests and time.time() < deadline:
+                        time.sleep(0.01)
+                self.wfile.flush()
+        except (IOError, OSError):
+            pass
+        finally:
+            self.server.streaming -= 1
+        self.close_connection = True
+
+    def log_message(self, *args):
+        pass
+
+
+def task_event(task_id, message_id="TaskEvent.1.0.TaskCompletedOK"):
+    return {"@odata.type": "#Event.v1_4_0.Event", "Events": [
+        {"EventType": "Alert", "MessageId": message_id, "MessageArgs": [task_id],
+         "OriginOfCondition": {"@odata.id": "/redfish/v1/TaskService/Tasks/{0}".format(task_id)}}]}
+
+
+class ThreadingHTTPServer(ThreadingMixIn, HTTPServer):
+    daemon_threads = True
+
+
+def task_step(state, percent, status="OK", message=None, code=202, headers=None):
+    body = {"@odata.type": "#Task.v1_4_2.Task", "TaskState": state, "TaskStatus": status,
+            "PercentComplete": percent, "Messages": [{"Message": message}] if message else []}
+    return code, body, headers
+
+
+@pytest.fixture
+def redfish_stand_in():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), RedfishStandInHandler)
+    server.tasks, server.requests, server.streams, server.streaming = {}, [], None, 0
+    server.resources, server.page_size, server.no_next_link = {}, None, False
+    server.uploads = []
+    thread = threading.Thread(target=server.serve_forever)
+    thread.daemon = True
+    thread.start()
+    module_params = {"baseuri": "127.0.0.1:{0}".format(server.server_address[1]),
+                     "username": "username", "password": "password"}
+    obj = Redfish(module_params, req_session=False)
+    obj.protocol = "http"
+    yield server, obj
+    server.shutdown()
+    server.server_close()
+
+
+class TestTaskMonitor(object):
+
+    def test_wait_reports_progress_until_completed(self, redfish_stand_in):
+        server, obj = redfish_stand_in
+        task_uri = "/redfish/v1/TaskService/Tasks/JID_1"
+        server.tasks[task_uri] = [task_step("New", 0), task_step("Running", 40, headers={"Retry-After": "7"}),
+                                  task_step("Running", 80),
+                                  task_step("Completed", 100, message="Job completed successfully.", code=200)]
+        sleep_mock = MagicMock()
+        result = TaskMonitor(obj, min_interval=2, max_interval=3, sleep=sleep_mock).wait(
+            "https://{0}{1}".format(obj.hostname, task_uri))
+        assert result["id"] == "JID_1" and result["uri"] == task_uri
+        assert result["state"] == "Completed" and result["status"] == "OK"
+        assert result["percent_complete"] == 100
+        assert result["messages"] == [{"Message": "Job completed successfully."}]
+        assert result["timed_out"] is False and result["polls"] == 4
+        assert result["resource_uri"] is None
+        assert [call[0][0] for call in sleep_mock.call_args_list] == [2, 7, 3]
+
+    def test_wait_follows_redirect_to_resource(self, redfish_stand_in):
+        server, obj = redfish_stand_in
+        monitor_uri = "/redfish/v1/TaskMonitors/JID_2"
+        server.tasks[monitor_uri] = [task_step("Running", 50), (303, None, {"Location": VOLUME_URI})]
+        result = TaskMonitor(obj, sleep=MagicMock()).wait(monitor_uri)
+        assert result["state"] == "Completed" and result["status"] == "OK"
+        assert result["resource_uri"] == VOLUME_URI
+        assert server.requests == [monitor_uri, monitor_uri, VOLUME_URI]
+
+    def test_wait_falls_back_to_task_service(self, redfish_stand_in):
+        server, obj = redfish_stand_in
+        server.tasks["/redfish/v1/TaskService/Tasks/JID_3"] = [task_step("Exception", 30, status="Critical",
+                                                                         message="Job failed.", code=200)]
+        result = TaskMonitor(obj, sleep=MagicMock()).wait("/redfish/v1/TaskMonitors/JID_3")
+        assert result["state"] == "Exception" and result["status"] == "Critical"
+        assert server.requests == ["/redfish/v1/TaskMonitors/JID_3", "/redfish/v1/TaskService/Tasks/JID_3"]
+
+    def test_wait_stop_states_and_timeout(self, redfish_stand_in):
+        server, obj = redfish_stand_in
+        server.tasks["/redfish/v1/TaskService/Tasks/JID_4"] = [task_step("Pending", 0,
+                                                                         message="Task successfully scheduled.")]
+        monitor = TaskMonitor(obj, sleep=MagicMock())
+        result = monitor.wait("/redfish/v1/TaskService/Tasks/JID_4", stop_states=("Pending",))
+        assert result["state"] == "Pending" and result["timed_out"] is False and result["polls"] == 1
+        result = monitor.wait("/redfish/v1/TaskService/Tasks/JID_4", timeout=0)
+        assert result["state"] == "Pending" and result["timed_out"] is True
+
+    def test_wait_unknown_task(self, redfish_stand_in):
+        server, obj = redfish_stand_in
+        with pytest.raises(HTTPError) as err:
+            TaskMonitor(obj, sleep=MagicMock()).wait("/redfish/v1/TaskService/Tasks/JID_5")
+        assert err.value.code == 404
+
+    def test_wait_for_events(self, redfish_stand_in):
+        server, obj = redfish_stand_in
+        task_uri = "/redfish/v1/TaskService/Tasks/JID_6"
+        server.tasks[task_uri] = [task_step("Running", 10), task_step("Completed", 100, code=200)]
+        server.streams = [[("polled", task_uri), ("comment", None), ("event", task_event("JID_7")),
+                           ("advance", task_uri),
+                           ("event", task_event("JID_6")), ("hold", 0.5)]]
+        sleep_mock = MagicMock()
+        result = TaskMonitor(obj, sleep=sleep_mock, events=True).wait(task_uri)
+        assert result["state"] == "Completed" and result["wait_mode"] == "events"
+        assert result["polls"] == 2 and result["events"] == 1
+        assert sleep_mock.called is False
+        assert server.requests == ["/redfish/v1/EventService", "/redfish/v1/SSE", task_uri, task_uri]
+
+    def test_wait_for_events_reconnects_when_idle(self, redfish_stand_in):
+        server, obj = redfish_stand_in
+        task_uri = "/redfish/v1/TaskService/Tasks/JID_8"
+        server.tasks[task_uri] = [task_step("Running", 10), task_step("Completed", 100, code=200)]
+        server.streams = [[("hold", 1)], [("polled", task_uri), ("advance", task_uri),
+                                          ("event", task_event("JID_8")), ("hold", 0.5)]]
+        result = TaskMonitor(obj, sleep=MagicMock(), events=True, idle_timeout=0.3).wait(task_uri)
+        assert result["state"] == "Completed" and result["wait_mode"] == "events"
+        assert server.requests.count("/redfish/v1/SSE") == 2
+
+    @pytest.mark.parametrize("streams", [None, [[("comment", None)]], []])
+    def test_wait_for_events_falls_back_to_polling(self, streams, redfish_stand_in):
+        server, obj = redfish_stand_in
+        task_uri = "/redfish/v1/TaskService/Tasks/JID_9"
+        server.tasks[task_uri] = [task_step("Running", 10), task_step("Completed", 100, code=200)]
+        server.streams = streams
+        sleep_mock = MagicMock()
+        result = TaskMonitor(obj, sleep=sleep_mock, events=True).wait(task_uri)
+        assert result["state"] == "Completed" and result["wait_mode"] == "polling"
+        assert result["events"] == 0
+
+    def test_events_from_environment(self, redfish_stand_in, monkeypatch):
+        server, obj = redfish_stand_in
+        monkeypatch.setenv("REDFISH_TASK_EVENTS", "1")
+        assert TaskMonitor(obj).events is True
+        assert TaskMonitor(obj, events=False).events is False
+        monkeypatch.delenv("REDFISH_TASK_EVENTS")
+        assert TaskMonitor(obj).events is False
+
+
+def resolve_storage(obj):
+    system = obj.invoke_request("GET", "/redfish/v1/Systems").json_data["Members"][0]["@odata.id"]
+    return {"storage_base_uri": obj.invoke_request("GET", system).json_data["Storage"]["@odata.id"]}
+
+
+class TestDiscovery(object):
+
+    @pytest.fixture
+    def service(self, redfish_stand_in):
+        server, obj = redfish_stand_in
+        server.resources.update({
+            "/redfish/v1/": {"RedfishVersion": "1.6.0", "UUID": "4c4c4544"},
+            "/redfish/v1/Systems": {"Members": [{"@odata.id": "/redfish/v1/Systems/System.Embedded.1"}]},
+            "/redfish/v1/Systems/System.Embedded.1": {
+                "Storage": {"@odata.id": "/redfish/v1/Systems/System.Embedded.1/Storage"}}})
+        return server, obj.module_params
+
+    def test_discover_without_cache(self, service, monkeypatch):
+        server, module_params = service
+        monkeypatch.delenv("REDFISH_DISCOVERY_CACHE", raising=False)
+        obj = Redfish(module_params)
+        obj.protocol = "http"
+        for count in range(2):
+            assert obj.discover("storage", resolve_storage) == {
+                "storage_base_uri": "/redfish/v1/Systems/System.Embedded.1/Storage"}
+        assert obj.discovery_cache is None
+        assert server.requests.count("/redfish/v1/Systems") == 2
+
+    def test_discover_reuses_cache_across_runs(self, service, tmpdir):
+        server, module_params = service
+        cache_path = str(tmpdir.join("discovery.json"))
+        for run in range(3):
+            obj = Redfish(module_params, discovery_cache=cache_path)
+            obj.protocol = "http"
+            endpoints = obj.discover("storage", resolve_storage)
+            assert endpoints == {"storage_base_uri": "/redfish/v1/Systems/System.Embedded.1/Storage"}
+        assert server.requests == ["/redfish/v1/Systems", "/redfish/v1/Systems/System.Embedded.1", "/redfish/v1/"]
+        with open(cache_path) as cache_file:
+            entry = json.load(cache_file)[module_params["baseuri"]]
+        assert entry["version"] == "1.6.0|4c4c4544" and list(entry["endpoints"]) == ["storage"]
+
+    @pytest.mark.parametrize("version,resolved", [("1.6.0", False), ("1.11.0", True)])
+    def test_discover_revalidates_expired_entry(self, version, resolved, service, tmpdir):
+        server, module_params = service
+        cache_path = str(tmpdir.join("discovery.json"))
+        obj = Redfish(module_params, discovery_cache=cache_path, discovery_ttl=-1)
+        obj.protocol = "http"
+        obj.discover("storage", resolve_storage)
+        del server.requests[:]
+        server.resources["/redfish/v1/"]["RedfishVersion"] = version
+        obj = Redfish(module_params, discovery_cache=cache_path)
+        obj.protocol = "http"
+        obj.discover("storage", resolve_storage)
+        assert server.requests[0] == "/redfish/v1/"
+        assert ("/redfish/v1/Systems" in server.requests) is resolved
+        assert obj.discovery_cache.get(module_params["baseuri"])["expires"] > time.time()
+
+    def test_discover_invalidated_on_not_found(self, service, tmpdir):
+        server, module_params = service
+        cache_path = str(tmpdir.join("discovery.json"))
+        obj = Redfish(module_params, discovery_cache=cache_path)
+        obj.protocol = "http"
+        obj.discover("storage", resolve_storage)
+        with pytest.raises(HTTPError):
+            obj.invoke_request("GET", "/redfish/v1/Managers/iDRAC.Embedded.1")
+        assert obj.discovery_cache.get(module_params["baseuri"]) is not None
+        with pytest.raises(HTTPError):
+            obj.invoke_request("GET", "/redfish/v1/Systems/System.Embedded.1/Storage/RAID.Slot.1-1")
+        assert obj.discovery_cache.get(module_params["baseuri"]) is None
+
+    def test_discover_does_not_cache_missing_endpoints(self, service, tmpdir, monkeypatch):
+        server, module_params = service
+        monkeypatch.setenv("REDFISH_DISCOVERY_CACHE", str(tmpdir.join("discovery.json")))
+        obj = Redfish(module_params)
+        obj.protocol = "http"
+        assert obj.discover("update_service", lambda redfish_obj: {}) == {}
+        assert obj.discovery_cache.get(module_params["baseuri"]) is None
+
+
+class TestGetMembers(object):
+
+    @pytest.fixture
+    def volumes(self, redfish_stand_in):
+        server, obj = redfish_stand_in
+        collection_uri = "/redfish/v1/Systems/System.Embedded.1/Storage/Volumes"
+        server.resources.update({"/redfish/v1/": {"RedfishVersion": "1.6.0"}, collection_uri: {"Members": []}})
+        for index in range(16):
+            uri = "{0}/Disk.Virtual.{1}".format(collection_uri, index)
+            server.resources[collection_uri]["Members"].append({"@odata.id": uri})
+            server.resources[uri] = {"@odata.id": uri, "Id": "Disk.Virtual.{0}".format(index)}
+        return server, obj, collection_uri
+
+    def test_get_members_expanded(self, volumes):
+        server, obj, collection_uri = volumes
+        server.resources["/redfish/v1/"]["ProtocolFeaturesSupported"] = {
+            "ExpandQuery": {"ExpandAll": True, "Levels": True, "MaxLevels": 3, "NoLinks": True}}
+        members = obj.get_members(collection_uri)
+        assert len(members) == 16 and members["Disk.Virtual.3"]["Id"] == "Disk.Virtual.3"
+        members = obj.get_members(collection_uri, member_ids=["Disk.Virtual.1", "Disk.Virtual.20"], levels=5)
+        assert list(members) == ["Disk.Virtual.1"]
+        assert server.requests == ["/redfish/v1/", collection_uri + "?%24expand=.%28%24levels%3D1%29",
+                                   collection_uri + "?%24expand=.%28%24levels%3D3%29"]
+
+    def test_get_members_without_expand(self, volumes):
+        server, obj, collection_uri = volumes
+        members = obj.get_members(collection_uri)
+        assert sorted(members) == sorted("Disk.Virtual.{0}".format(index) for index in range(16))
+        assert members["Disk.Virtual.15"]["@odata.id"] == collection_uri + "/Disk.Virtual.15"
+        assert server.requests[:2] == ["/redfish/v1/", collection_uri] and len(server.requests) == 18
+        del server.requests[:]
+        members = obj.get_members(collection_uri, member_ids=["Disk.Virtual.1", "Disk.Virtual.20"])
+        assert list(members) == ["Disk.Virtual.1"]
+        assert sorted(server.requests) == [collection_uri + "/Disk.Virtual.1", collection_uri + "/Disk.Virtual.20"]
+
+    def test_get_resources(self, volumes):
+        server, obj, collection_uri = volumes
+        server.resources["/redfish/v1/"]["ProtocolFeaturesSupported"] = {
+            "ExpandQuery": {"Levels": True, "MaxLevels": 3}}
+        uris = ["{0}/Disk.Virtual.{1}".format(collection_uri, index) for index in (1, 20, 2)]
+        bodies = obj.get_resources(uri for uri in uris)
+        assert [body and body["Id"] for body in bodies] == ["Disk.Virtual.1", None, "Disk.Virtual.2"]
+        assert sorted(server.requests) == sorted(uris)
+
+    def test_iter_members_follows_next_link(self, volumes):
+        server, obj, collection_uri = volumes
+        server.page_size = 5
+        members = list(obj.iter_members(collection_uri))
+        assert [member["@odata.id"] for member in members] == [
+            "{0}/Disk.Virtual.{1}".format(collection_uri, index) for index in range(16)]
+        assert server.requests == [collection_uri, collection_uri + "?%24skip=5", collection_uri + "?%24skip=10",
+                                   collection_uri + "?%24skip=15"]
+
+    def test_iter_members_skip_by_count(self, volumes):
+        server, obj, collection_uri = volumes
+        server.page_size, server.no_next_link = 10, True
+        server.resources["/redfish/v1/"]["ProtocolFeaturesSupported"] = {
+            "ExpandQuery": {"Levels": True, "MaxLevels": 1, "NoLinks": True}}
+        members = list(obj.iter_members(collection_uri, expand=True))
+        assert [member["Id"] for member in members] == ["Disk.Virtual.{0}".format(index) for index in range(16)]
+        assert server.requests == ["/redfish/v1/", collection_uri + "?%24expand=.%28%24levels%3D1%29",
+                                   collection_uri + "?%24expand=.%28%24levels%3D1%29&%24skip=10"]
+
+    def test_iter_members_prefetch(self, volumes):
+        server, obj, collection_uri = volumes
+        server.page_size = 4
+        members = obj.iter_members(collection_uri, expand=True, prefetch=True)
+        assert next(members)["Id"] == "Disk.Virtual.0"
+        deadline = time.time() + 5
+        while collection_uri + "?%24skip=4" not in server.requests and time.time() < deadline:
+            time.sleep(0.01)
+        assert collection_uri + "?%24skip=4" in server.requests
+        assert [member["Id"] for member in members][:4] == [
+            "Disk.Virtual.1", "Disk.Virtual.2", "Disk.Virtual.3", "Disk.Virtual.4"]
+        partial = obj.iter_members(collection_uri, prefetch=True)
+        next(partial)
+        partial.close()
+
+
+def test_retry_rewinds_streaming_body(mocker, tmpdir):
+    path = str(tmpdir.join("image.exe"))
+    with open(path, "wb") as image:
+        image.write(b"firmware" * 1000)
+    bodies = []
+
+    def open_url(url, data=None, **kwargs):
+        bodies.append(data.read())
+        if len(bodies) == 1:
+            raise URLError("connection reset")
+        resp = MagicMock()
+        resp.read.return_value = b"{}"
+        return resp
+    mocker.patch('ansible.module_utils.remote_management.dellemc.redfish.open_url', side_effect=open_url)
+    module_params = {"baseuri": "192.168.0.1", "username": "username", "password": "password"}
+    obj = Redfish(module_params, retry_policy=RetryPolicy(sleep=MagicMock()))
+    with open(path, "rb") as image:
+        data, content_type = multipart_file_body(image, "image.exe")
+        obj.invoke_request("PUT", "/redfish/v1/UpdateService/FirmwareInventory", data=data,
+                           headers={"Content-Type": content_type}, dump=False)
+    assert len(bodies) == 2 and bodies[0] == bodies[1]
+    assert bodies[1].count(b"firmware") == 1000
+
+
+def test_streaming_upload(redfish_stand_in, tmpdir):
+    server, obj = redfish_stand_in
+    path = str(tmpdir.join("image.exe"))
+    with open(path, "wb") as image:
+        image.write(b"firmware" * 100000)
+    with open(path, "rb") as image:
+        data, content_type = multipart_file_body(image, "image.exe")
+        headers = {"Content-Type": content_type, "Content-Length": str(len(data)), "If-Match": "etag"}
+        resp = obj.invoke_request("POST", "/redfish/v1/UpdateService/FirmwareInventory", data=data,
+                                  headers=headers, dump=False)
+    assert resp.status_code == 201
+    uri, sent_headers, body = server.uploads[0]
+    assert int(sent_headers["Content-Length"]) == len(body) == len(data)
+    assert body.count(b"firmware") == 100000 and body.startswith(b"--")
+    assert "Content-Length" not in obj._headers and obj._headers["Content-Type"] == "application/json"
@@ -0,0 +1,66 @@
+# -*- coding: utf-8 -*-
+
+#
+# Dell EMC OpenManage Ansible Modules
+# Version 2.0.7
+# Copyright (C) 2020 Dell Inc.
+
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+# All rights reserved. Dell, EMC, and other trademarks are trademarks of Dell Inc. or its subsidiaries.
+# Other trademarks may be trademarks of their respective owners.
+#
+
+from __future__ import absolute_import
+
+import time
+import pytest
+from email.utils import formatdate
+from ansible.module_utils.urls import ConnectionError, SSLValidationError
+from ansible.module_utils.six.moves.urllib.error import URLError, HTTPError
+from ansible.module_utils.remote_management.dellemc.retry import RetryPolicy, parse_retry_after
+
+
+class TestRetryPolicy(object):
+    @pytest.mark.parametrize("headers,expected", [({}, None), (None, None), ({"Retry-After": "7"}, 7),
+                                                  ({"Retry-After": "soon"}, None)])
+    def test_parse_retry_after(self, headers, expected):
+        assert parse_retry_after(headers) == expected
+
+    def test_parse_retry_after_http_date(self):
+        delay = parse_retry_after({"Retry-After": formatdate(time.time() + 60, usegmt=True)})
+        assert 55 <= delay <= 60
+
+    @pytest.mark.parametrize("method,err,retried", [
+        ("GET", HTTPError("http://testhost.com", 503, "Service Unavailable", {}, None), True),
+        ("get", HTTPError("http://testhost.com", 429, "Too Many Requests", {}, None), True),
+        ("DELETE", URLError("connection refused"), True),
+        ("PUT", ConnectionError("connection reset"), True),
+        ("GET", HTTPError("http://testhost.com", 500, "Internal Server Error", {}, None), False),
+        ("GET", HTTPError("http://testhost.com", 404, "Not Found", {}, None), False),
+        ("GET", SSLValidationError("certificate verify failed"), False),
+        ("POST", HTTPError("http://testhost.com", 503, "Service Unavailable", {}, None), False),
+    ])
+    def test_backoff_decision(self, method, err, retried):
+        delay = RetryPolicy().backoff(method, err, 0, time.time())
+        assert (delay is not None) is retried
+
+    def test_backoff_exponential_with_jitter(self):
+        policy = RetryPolicy(backoff_factor=2, backoff_max=10, retries=10, total_timeout=1000)
+        err = URLError("timed out")
+        for attempt, cap in enumerate([2, 4, 8, 10, 10]):
+            assert 0 <= policy.backoff("GET", err, attempt, time.time()) <= cap
+
+    def test_backoff_limits(self):
+        policy = RetryPolicy(retries=2, total_timeout=10)
+        busy = HTTPError("http://testhost.com", 503, "Service Unavailable", {"Retry-After": "3"}, None)
+        assert policy.backoff("GET", busy, 1, time.time()) == 3
+        assert policy.backoff("GET", busy, 2, time.time()) is None
+        assert policy.backoff("GET", busy, 0, time.time() - 8) is None
+        assert policy.backoff("POST", busy, 0, time.time(), force=True) == 3
+
+    def test_for_call(self):
+        policy, other = RetryPolicy(), RetryPolicy(retries=1)
+        assert policy.for_call() == (policy, False)
+        assert policy.for_call(True) == (policy, True)
+        assert policy.for_call(False) == (None, False)
+        assert policy.for_call(other) == (other, False)
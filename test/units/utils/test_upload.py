@@ -0,0 +1,113 @@
+# -*- coding: utf-8 -*-
+
+#
+# Dell EMC OpenManage Ansible Modules
+# Version 2.0.7
+# Copyright (C) 2020 Dell Inc.
+
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+# All rights reserved. Dell, EMC, and other trademarks are trademarks of Dell Inc. or its subsidiaries.
+# Other trademarks may be trademarks of their respective owners.
+#
+
+from __future__ import absolute_import
+
+import os
+import subprocess
+import sys
+import pytest
+from ansible.module_utils.remote_management.dellemc.upload import StreamingBody, multipart_file_body
+from units.compat.mock import MagicMock
+
+RSS_SCRIPT = """
+import resource, sys
+from ansible.module_utils.remote_management.dellemc.upload import multipart_file_body
+with open(sys.argv[1], "rb") as image:
+    if sys.argv[2] == "stream":
+        body, ctype = multipart_file_body(image, "image.exe")
+        while body.read(8192):
+            pass
+    else:
+        data = image.read()
+print(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss)
+"""
+
+
+def image_file(tmpdir, name, size):
+    path = str(tmpdir.join(name))
+    with open(path, "wb") as image:
+        image.truncate(size)
+    return path
+
+
+class TestStreamingBody(object):
+
+    def test_reads_parts_in_chunks(self, tmpdir):
+        path = str(tmpdir.join("image.exe"))
+        with open(path, "wb") as image:
+            image.write(b"0123456789" * 10)
+        progress = MagicMock()
+        with open(path, "rb") as image:
+            body = StreamingBody([b"head-", image, b"-tail"], progress=progress)
+            assert len(body) == 110
+            chunks = [body.read(30) for count in range(4)]
+            assert [len(chunk) for chunk in chunks] == [30, 30, 30, 20]
+            assert body.read(30) == b""
+        assert b"".join(chunks) == b"head-" + b"0123456789" * 10 + b"-tail"
+        assert progress.call_args_list[-1][0] == (110, 110)
+        assert progress.call_count == 4
+
+    def test_rewind(self, tmpdir):
+        path = str(tmpdir.join("image.exe"))
+        with open(path, "wb") as image:
+            image.write(b"0123456789")
+        with open(path, "rb") as image:
+            image.read(2)
+            body = StreamingBody([b"head-", image])
+            assert body.read(8) == b"head-234" and body.sent == 8
+            body.rewind()
+            assert body.sent == 0 and body.read() == b"head-23456789"
+
+    def test_multipart_file_body(self, tmpdir):
+        path = str(tmpdir.join("image.exe"))
+        with open(path, "wb") as image:
+            image.write(b"firmware")
+        with open(path, "rb") as image:
+            body, content_type = multipart_file_body(image, "image.exe", content_type="multipart/form-data",
+                                                     boundary="abc123")
+            data = body.read()
+        assert content_type == "multipart/form-data; boundary=abc123"
+        assert data == (b'--abc123\r\nContent-Disposition: form-data; name="file"; filename="image.exe"\r\n'
+                        b'Content-Type: multipart/form-data\r\n\r\nfirmware\r\n--abc123--\r\n')
+        assert len(body) == len(data)
+
+    def test_multipart_matches_urllib3(self, tmpdir):
+        filepost = pytest.importorskip("urllib3.filepost")
+        fields = pytest.importorskip("urllib3.fields")
+        path = str(tmpdir.join("image.exe"))
+        with open(path, "wb") as image:
+            image.write(os.urandom(1024))
+        with open(path, "rb") as image:
+            body, content_type = multipart_file_body(image, "image.exe", content_type="multipart/form-data",
+                                                     boundary="abc123")
+            data = body.read()
+            image.seek(0)
+            field = fields.RequestField(name="file", data=image.read(), filename="image.exe")
+        field.make_multipart(content_type="multipart/form-data")
+        assert (data, content_type) == filepost.encode_multipart_formdata([field], boundary="abc123")
+
+    def test_peak_rss_independent_of_image_size(self, tmpdir):
+        """Peak RSS of streaming an image stays flat, while reading it into memory grows with its size"""
+        pytest.importorskip("resource")
+        env = dict(os.environ, PYTHONPATH=os.pathsep.join(path for path in sys.path if path))
+
+        def peak_rss_kb(path, mode):
+            output = subprocess.check_output([sys.executable, "-c", RSS_SCRIPT, path, mode], env=env)
+            return int(output.strip().splitlines()[-1])
+
+        small = image_file(tmpdir, "small.exe", 8 * 1024 * 1024)
+        large = image_file(tmpdir, "large.exe", 128 * 1024 * 1024)
+        streamed = [peak_rss_kb(small, "stream"), peak_rss_kb(large, "stream")]
+        loaded = [peak_rss_kb(small, "read"), peak_rss_kb(large, "read")]
+        assert abs(streamed[1] - streamed[0]) < 8 * 1024
+        assert loaded[1] - loaded[0] > 64 * 1024
@@ -0,0 +1,68 @@
+# -*- coding: utf-8 -*-
+
+# Dell EMC OpenManage Ansible Modules
+# Version 2.0.7
+# Copyright (C) 2020 Dell Inc. or its subsidiaries. All Rights Reserved.
+
+# Redistribution and use in source and binary forms, with or without modification,
+# are permitted provided that the following conditions are met:
+
+#    * Redistributions of source code must retain the above copyright notice,
+#      this list of conditions and the following disclaimer.
+
+#    * Redistributions in binary form must reproduce the above copyright notice,
+#      this list of conditions and the following disclaimer in the documentation
+#      and/or other materials provided with the distribution.
+
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND
+# ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE DISCLAIMED.
+# IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT,
+# INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+# PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT
+# LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE
+# USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+import json
+import os
+import stat
+import tempfile
+
+
+class JSONFileCache(object):
+    """
+    Local JSON file, which only its owner can read, for state kept across module runs.
+    A cache file which is accessible by group or others is ignored and replaced.
+    Failures to read or write the cache are never fatal.
+    """
+
+    def __init__(self, path):
+        self.path = os.path.expanduser(path)
+
+    def _load(self):
+        try:
+            if os.stat(self.path).st_mode & (stat.S_IRWXG | stat.S_IRWXO):
+                return {}
+            with open(self.path) as cache_file:
+                data = json.load(cache_file)
+            return data if isinstance(data, dict) else {}
+        except (IOError, OSError, ValueError):
+            return {}
+
+    def _save(self, data):
+        """Writes to a temporary file created with mode 0600 and renames it over the cache"""
+        tmp_path = None
+        try:
+            fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(self.path)),
+                                            prefix=".dellemc_cache")
+            with os.fdopen(fd, 'w') as cache_file:
+                json.dump(data, cache_file)
+            os.rename(tmp_path, self.path)
+        except (IOError, OSError):
+            if tmp_path and os.path.exists(tmp_path):
+                os.remove(tmp_path)
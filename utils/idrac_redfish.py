@@ -29,18 +29,46 @@ from __future__ import (absolute_import, division, print_function)
 __metaclass__ = type
 
 import json
+import time
 from ansible.module_utils.urls import open_url, ConnectionError, SSLValidationError
 from ansible.module_utils.six.moves.urllib.error import URLError, HTTPError
+from ansible.module_utils.remote_management.dellemc.perf import RECORDER, add_timing
+from ansible.module_utils.remote_management.dellemc.retry import RetryPolicy
 
 
-class iDRACRedfishAPI(object):
-    """REST api for iDRAC modules."""
+class TimedResponse(object):
+    """Response of open_url which adds the time spent reading the body to a perf record"""
+
+    def __init__(self, resp, perf_record):
+        self._resp = resp
+        self._perf_record = perf_record
+
+    def read(self, *args):
+        start = time.time()
+        body = self._resp.read(*args)
+        add_timing(self._perf_record, "read_ms", start)
+        self._perf_record["received"] += len(body)
+        return body
+
+    def __getattr__(self, name):
+        return getattr(self._resp, name)
 
-    def __init__(self, module_params):
+
+class iDRACRedfishAPI(object):
+    """
+    REST api for iDRAC modules.
+    Requests which fail with a transient error, such as 503 while the Lifecycle Controller
+    is busy, are sent again according to I(retry_policy), by default a RetryPolicy which
+    retries idempotent methods.
+    """
+
+    def __init__(self, module_params, perf_recorder=None, retry_policy=None):
         self.ipaddress = module_params['idrac_ip']
         self.username = module_params['idrac_user']
         self.password = module_params['idrac_password']
         self.port = module_params['idrac_port']
+        self._perf = perf_recorder or RECORDER
+        self.retry_policy = retry_policy or RetryPolicy()
         self._headers = {'Content-Type': 'application/json', 'Accept': 'application/json'}
 
     def _get_url(self, uri):
@@ -56,13 +84,45 @@ class iDRACRedfishAPI(object):
         auth_kwargs['follow_redirects'] = 'all'
         return auth_kwargs
 
-    def invoke_request(self, uri, method, data={}):
+    def invoke_request(self, uri, method, data={}, retry=None):
+        """
+        Sends a request and returns the response of open_url
+        :arg retry: (optional) None for the retry policy of the object, False to not retry,
+            True to retry even if the method is not idempotent, or a RetryPolicy
+        """
+        policy, force = self.retry_policy.for_call(retry)
+        attempt, started = 0, time.time()
+        while True:
+            try:
+                return self._send_request(uri, method, data, attempt)
+            except (URLError, ConnectionError) as err:
+                delay = policy.backoff(method, err, attempt, started, force=force) if policy else None
+                if delay is None or (hasattr(data, "read") and not hasattr(data, "rewind")):
+                    raise err
+                attempt += 1
+                policy.sleep(delay)
+                if hasattr(data, "rewind"):
+                    data.rewind()
+
+    def _send_request(self, uri, method, data, retries=0):
         kwargs = self._auth_kwargs()
         path = self._get_url(uri)
         payload = json.dumps(data)
+        perf_record = self._perf.start("idrac", method, path, sent=len(payload))
+        if perf_record is not None:
+            perf_record["retries"] = retries
         try:
+            start = time.time()
             response = open_url(path, method=method, data=payload, headers=self._headers, **kwargs)
-        except (HTTPError, URLError, SSLValidationError, ConnectionError) as error:
+            add_timing(perf_record, "first_byte_ms", start)
+            if perf_record is not None:
+                perf_record["status"] = response.getcode()
+                response = TimedResponse(response, perf_record)
+        except HTTPError as error:
+            if perf_record is not None:
+                perf_record["status"] = error.code
+            raise error
+        except (URLError, SSLValidationError, ConnectionError) as error:
             raise error
         return response
 
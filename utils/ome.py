@@ -27,32 +27,101 @@
 from __future__ import (absolute_import, division, print_function)
 __metaclass__ = type
 
+import base64
 import json
+import os
+import re
+import socket
+import ssl
+import threading
+import time
+from io import BytesIO
+from multiprocessing.pool import ThreadPool
+from ansible.module_utils._text import to_bytes, to_text
 from ansible.module_utils.urls import open_url, ConnectionError, SSLValidationError
+from ansible.module_utils.six.moves import http_client
 from ansible.module_utils.six.moves.urllib.error import URLError, HTTPError
-from ansible.module_utils.six.moves.urllib.parse import urlencode
+from ansible.module_utils.six.moves.urllib.parse import urlencode, urlparse, quote_plus
+from ansible.module_utils.six.moves.urllib.request import getproxies, proxy_bypass
+from ansible.module_utils.remote_management.dellemc.cache import JSONFileCache
+from ansible.module_utils.remote_management.dellemc.perf import RECORDER, add_timing
+from ansible.module_utils.remote_management.dellemc.retry import RetryPolicy, IDEMPOTENT_METHODS
+
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
 
 SESSION_RESOURCE_COLLECTION = {
     "SESSION": "SessionService/Sessions",
     "SESSION_ID": "SessionService/Sessions('{Id}')",
 }
+POOL_SIZE = 4
+POOL_IDLE_TIMEOUT = 60
+MAX_WORKERS = 4
+PAGE_SIZE = 100
+SESSION_CACHE_ENV = "OME_SESSION_CACHE"
+SESSION_CACHE_TTL = 1800
+INVENTORY_CACHE_ENV = "OME_INVENTORY_CACHE"
+DEVICE_URI = "DeviceService/Devices"
+DEVICE_ENTITY_URI = "DeviceService/Devices({device_id})"
+DEVICE_ID_SELECT = ["Id", "DeviceServiceTag", "Type"]
+FILTER_MAX_LENGTH = 1500
+DEVICE_SWEEP_THRESHOLD = 200
+JOB_COLLECTION_URI = "JobService/Jobs"
+JOB_URI = "JobService/Jobs({job_id})"
+JOB_HISTORY_URI = "JobService/Jobs({job_id})/ExecutionHistories"
+JOB_HISTORY_DETAILS_URI = "JobService/Jobs({job_id})/ExecutionHistories({history_id})/ExecutionHistoryDetails"
+JOB_TERMINAL_STATES = ("Completed", "Failed", "Warning", "Aborted", "Stopped", "Canceled")
+JOB_WAIT_TIMEOUT = 3600
+JOB_POLL_MIN_INTERVAL = 2
+JOB_POLL_MAX_INTERVAL = 30
+JOB_POLL_GROWTH = 1.5
+JOB_STATUS_SELECT = ["Id", "JobName", "JobStatus", "LastRunStatus"]
+JOB_CURSOR_FIELDS = ("LastRun", "UpdatedDate")
+
+
+def json_loads(body):
+    """
+    Decodes a JSON document with orjson when it is importable, and with the
+    standard json module otherwise, or when orjson rejects the document.
+    """
+    if HAS_ORJSON:
+        try:
+            return orjson.loads(body)
+        except ValueError:
+            pass
+    return json.loads(body)
 
 
 class OpenURLResponse(object):
     """Handles HTTPResponse"""
 
-    def __init__(self, resp):
+    def __init__(self, resp, perf_record=None):
         self.body = None
         self.resp = resp
+        self._json_data = None
+        self._perf_record = perf_record
         if self.resp:
+            start = time.time()
             self.body = self.resp.read()
+            add_timing(perf_record, "read_ms", start)
+            if perf_record is not None and self.body:
+                perf_record["received"] = len(self.body)
 
     @property
     def json_data(self):
-        try:
-            return json.loads(self.body)
-        except ValueError:
-            raise ValueError("Unable to parse json")
+        """Decoded body, which is parsed once on first access"""
+        if self._json_data is None:
+            start = time.time()
+            try:
+                self._json_data = json_loads(self.body)
+            except ValueError:
+                raise ValueError("Unable to parse json")
+            finally:
+                add_timing(self._perf_record, "decode_ms", start)
+        return self._json_data
 
     @property
     def status_code(self):
@@ -66,11 +135,258 @@ class OpenURLResponse(object):
     def token_header(self):
         return self.resp.headers.get('X-Auth-Token')
 
+    def project(self, select):
+        """
+        Trims the decoded entity, or each record of a collection, to the properties in
+        I(select) and the OData annotations, for appliances which ignore $select.
+        Bodies which are not JSON are left untouched.
+        """
+        try:
+            data = self.json_data
+        except ValueError:
+            return
+        fields = set(select)
+
+        def trim(item):
+            if not isinstance(item, dict):
+                return item
+            return dict((key, val) for key, val in item.items() if key in fields or key.startswith("@odata."))
+        if isinstance(data, dict) and isinstance(data.get("value"), list):
+            data["value"] = [trim(item) for item in data["value"]]
+        elif isinstance(data, dict):
+            self._json_data = trim(data)
+
+
+class PooledResponse(object):
+    """HTTPResponse look-alike for a response read from a pooled connection"""
+
+    def __init__(self, resp, body):
+        self.status = resp.status
+        self.reason = resp.reason
+        self.headers = resp.msg
+        self.body = body
+
+    def read(self):
+        return self.body
+
+    def getcode(self):
+        return self.status
+
+
+class ConnectionPool(object):
+    """
+    Keeps idle HTTP/1.1 keep-alive connections to a single host, so that
+    consecutive requests do not pay for a new TCP and TLS handshake each.
+    """
+
+    def __init__(self, protocol, host, port, pool_size=POOL_SIZE, idle_timeout=POOL_IDLE_TIMEOUT):
+        self.protocol = protocol
+        self.host = host
+        self.port = port
+        self.pool_size = pool_size
+        self.idle_timeout = idle_timeout
+        self._idle = []
+        self._lock = threading.Lock()
+        self._ssl_context = None
+        if protocol == 'https':
+            self._ssl_context = ssl.create_default_context()
+            self._ssl_context.check_hostname = False
+            self._ssl_context.verify_mode = ssl.CERT_NONE
+
+    def _new_connection(self, timeout):
+        if self.protocol == 'https':
+            return http_client.HTTPSConnection(self.host, self.port, timeout=timeout,
+                                               context=self._ssl_context)
+        return http_client.HTTPConnection(self.host, self.port, timeout=timeout)
+
+    def _get(self, timeout):
+        """Returns an idle connection which is not expired, or a new one"""
+        now = time.time()
+        with self._lock:
+            while self._idle:
+                conn, last_used = self._idle.pop()
+                if now - last_used < self.idle_timeout:
+                    conn.timeout = timeout
+                    if conn.sock is not None:
+                        conn.sock.settimeout(timeout)
+                    return conn, True
+                conn.close()
+        return self._new_connection(timeout), False
+
+    def _put(self, conn):
+        with self._lock:
+            if len(self._idle) < self.pool_size:
+                self._idle.append((conn, time.time()))
+                return
+        conn.close()
+
+    @staticmethod
+    def _can_resend(method, err, sent, resp):
+        """
+        Whether a request which failed on a reused connection may be sent again on a new one.
+        Idempotent methods always may. Other methods may only when the connection turns out to
+        be stale, which is when sending the request fails, or when the appliance closes the
+        connection without a response, as it then did not process the request.
+        """
+        if method.upper() in IDEMPOTENT_METHODS:
+            return True
+        if resp is not None or isinstance(err, socket.timeout):
+            return False
+        return not sent or isinstance(err, http_client.BadStatusLine)
+
+    def urlopen(self, method, url, data=None, headers=None, timeout=30, perf_record=None):
+        """
+        Sends a request on a pooled connection.
+        A request which fails on a reused connection is sent once again on a new
+        connection when it is safe to, as the appliance may have closed the idle
+        connection meanwhile.
+        Raises HTTPError for error status codes, same as open_url. Redirects are returned
+        as they are, for the caller to follow.
+        Timings and retries are added to I(perf_record), if any.
+        :returns: PooledResponse
+        """
+        parsed = urlparse(url)
+        req_path = parsed.path
+        if parsed.query:
+            req_path += "?{0}".format(parsed.query)
+        while True:
+            conn, reused = self._get(timeout)
+            sent, resp = False, None
+            try:
+                if conn.sock is None:
+                    start = time.time()
+                    conn.connect()
+                    conn.sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+                    add_timing(perf_record, "connect_ms", start)
+                start = time.time()
+                conn.request(method, req_path, body=data, headers=headers or {})
+                sent = True
+                resp = conn.getresponse()
+                add_timing(perf_record, "first_byte_ms", start)
+                start = time.time()
+                body = resp.read()
+                add_timing(perf_record, "read_ms", start)
+            except (socket.error, http_client.HTTPException) as err:
+                conn.close()
+                if reused and self._can_resend(method, err, sent, resp):
+                    if perf_record is not None:
+                        perf_record["retries"] += 1
+                    if hasattr(data, "rewind"):
+                        data.rewind()
+                    continue
+                raise URLError(err)
+            if resp.will_close:
+                conn.close()
+            else:
+                self._put(conn)
+            if resp.status >= 400:
+                raise HTTPError(url, resp.status, resp.reason, resp.msg, BytesIO(body))
+            return PooledResponse(resp, body)
+
+    def close(self):
+        """Closes all the idle connections"""
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for conn, last_used in idle:
+            conn.close()
+
+
+class SessionCache(JSONFileCache):
+    """
+    Keeps OME session tokens keyed by user and appliance, so that later module runs
+    against the same appliance can reuse the session.
+    """
+
+    def get(self, key):
+        return self._load().get(key)
+
+    def put(self, key, entry):
+        sessions = self._load()
+        sessions[key] = entry
+        self._save(sessions)
+
+    def remove(self, key):
+        sessions = self._load()
+        if sessions.pop(key, None) is not None:
+            self._save(sessions)
+
+
+class InventoryCache(JSONFileCache):
+    """
+    Keeps a copy of the device collection of one appliance, as seen by one user, in
+    I(directory), along with the watermark of the latest inventory and status times.
+    """
+
+    def __init__(self, directory, key):
+        file_name = "ome_inventory_{0}.json".format(re.sub(r"[^A-Za-z0-9@._-]", "_", key))
+        super(InventoryCache, self).__init__(os.path.join(os.path.expanduser(directory), file_name))
+
+    def load(self):
+        return self._load()
+
+    def save(self, context, devices):
+        times = [device.get(field) for device in devices for field in ("LastInventoryTime", "LastStatusTime")]
+        watermark = max([time_stamp for time_stamp in times if time_stamp] or [None])
+        self._save({"Context": context, "Watermark": watermark, "Devices": devices})
+
+
+class JobCursorCache(JSONFileCache):
+    """
+    Keeps the cursor of an incremental job feed keyed by user, appliance and filter: the
+    newest LastRun or UpdatedDate seen and the ids of the jobs stamped with it.
+    """
+
+    def get(self, key):
+        return self._load().get(key) or {}
+
+    def put(self, key, entry):
+        cursors = self._load()
+        cursors[key] = entry
+        self._save(cursors)
+
+
+class DupUploadIndex(JSONFileCache):
+    """
+    Keeps the file tokens of the update packages uploaded to OME appliances, keyed by the
+    SHA-256 of the package and the appliance, along with the time of the upload.
+    """
+
+    def get(self, key):
+        return self._load().get(key)
+
+    def put(self, key, entry):
+        uploads = self._load()
+        uploads[key] = entry
+        self._save(uploads)
+
+    def remove(self, key):
+        uploads = self._load()
+        if uploads.pop(key, None) is not None:
+            self._save(uploads)
+
 
 class RestOME(object):
-    """Handles OME API requests"""
+    """
+    Handles OME API requests
 
-    def __init__(self, module_params=None, req_session=False):
+    When a session cache file is given, either as I(session_cache) or through the
+    OME_SESSION_CACHE environment variable, the session is not deleted on exit.
+    It is kept in the cache and reused by later invocations for the same user and
+    appliance until it is idle for more than I(session_ttl) seconds, the appliance
+    rejects it, or logout() is called.
+
+    When an inventory cache directory is given, either as I(inventory_cache) or
+    through the OME_INVENTORY_CACHE environment variable, the device collection is
+    kept on disk and refreshed incrementally, see get_device_inventory().
+
+    Requests which fail with a transient error are sent again according to
+    I(retry_policy), by default a RetryPolicy which retries idempotent methods.
+    """
+
+    def __init__(self, module_params=None, req_session=False, keep_alive=False,
+                 pool_size=POOL_SIZE, pool_idle_timeout=POOL_IDLE_TIMEOUT,
+                 session_cache=None, session_ttl=SESSION_CACHE_TTL, inventory_cache=None,
+                 perf_recorder=None, retry_policy=None):
         self.module_params = module_params
         self.hostname = self.module_params["hostname"]
         self.username = self.module_params["username"]
@@ -79,7 +395,20 @@ class RestOME(object):
         self.req_session = req_session
         self.session_id = None
         self.protocol = 'https'
+        self.keep_alive = keep_alive
+        self.pool_size = pool_size
+        self.pool_idle_timeout = pool_idle_timeout
+        self._pool = None
+        cache_path = session_cache or os.environ.get(SESSION_CACHE_ENV)
+        self.session_cache = SessionCache(cache_path) if cache_path else None
+        self.session_ttl = session_ttl
+        self._cached_session = False
+        self.inventory_cache = inventory_cache or os.environ.get(INVENTORY_CACHE_ENV)
+        self._inventory = None
+        self._perf = perf_recorder or RECORDER
+        self.retry_policy = retry_policy or RetryPolicy()
         self._headers = {'Content-Type': 'application/json', 'Accept': 'application/json'}
+        self._session_lock = threading.Lock()
 
     def _get_base_url(self):
         """builds base url"""
@@ -96,8 +425,8 @@ class RestOME(object):
         return url
 
     def _url_common_args_spec(self, method, api_timeout, headers=None):
-        """Creates an argument common spec"""
-        req_header = self._headers
+        """Creates an argument common spec, with I(headers) added to the headers of this request only"""
+        req_header = dict(self._headers)
         if headers:
             req_header.update(headers)
         url_kwargs = {
@@ -112,9 +441,6 @@ class RestOME(object):
 
     def _args_without_session(self, method, api_timeout=30, headers=None):
         """Creates an argument spec in case of basic authentication"""
-        req_header = self._headers
-        if headers:
-            req_header.update(headers)
         url_kwargs = self._url_common_args_spec(method, api_timeout, headers=headers)
         url_kwargs["url_username"] = self.username
         url_kwargs["url_password"] = self.password
@@ -127,74 +453,262 @@ class RestOME(object):
         url_kwargs["force_basic_auth"] = False
         return url_kwargs
 
+    def _open_pool(self):
+        """
+        Creates the keep-alive connection pool, unless a proxy is configured for the
+        appliance, in which case requests keep going through open_url.
+        """
+        if self.keep_alive and self.pool_size and self._pool is None:
+            if getproxies().get(self.protocol) and not proxy_bypass(self.hostname):
+                return
+            self._pool = ConnectionPool(self.protocol, self.hostname, self.port,
+                                        pool_size=self.pool_size, idle_timeout=self.pool_idle_timeout)
+
+    def _close_pool(self):
+        if self._pool is not None:
+            self._pool.close()
+            self._pool = None
+
+    def _pool_urlopen(self, url, data, url_kwargs, perf_record=None):
+        """
+        Sends a request through the connection pool with the same arguments as open_url.
+        A redirect is followed by sending the request again with open_url.
+        """
+        headers = dict(url_kwargs["headers"])
+        if url_kwargs.get("force_basic_auth"):
+            credentials = "{0}:{1}".format(url_kwargs["url_username"], url_kwargs["url_password"])
+            headers["Authorization"] = "Basic {0}".format(to_text(base64.b64encode(to_bytes(credentials))))
+        if data is not None:
+            data = to_bytes(data, nonstring='passthru')
+        resp = self._pool.urlopen(url_kwargs["method"], url, data=data, headers=headers,
+                                  timeout=url_kwargs["timeout"], perf_record=perf_record)
+        if 300 <= resp.status < 400:
+            if hasattr(data, "rewind"):
+                data.rewind()
+            resp = open_url(url, data=data, **url_kwargs)
+        return resp
+
     def invoke_request(self, method, path, data=None, query_param=None, headers=None,
-                       api_timeout=30, dump=True):
+                       api_timeout=30, dump=True, select=None, retry=None):
         """
-        Sends a request via open_url
+        Sends a request via the keep-alive connection pool when it is open, or via open_url
+        Transient failures are retried according to the retry policy.
         Returns :class:`OpenURLResponse` object.
         :arg method: HTTP verb to use for the request
         :arg path: path to request without query parameter
-        :arg data: (optional) Payload to send with the request
+        :arg data: (optional) Payload to send with the request, or with I(dump) false a
+            file-like body such as a StreamingBody, which is sent as it is read
         :arg query_param: (optional) Dictionary of query parameter to send with request
         :arg headers: (optional) Dictionary of HTTP Headers to send with the
             request
         :arg api_timeout: (optional) How long to wait for the server to send
             data before giving up
+        :arg select: (optional) list of properties, sent as $select; the response is
+            trimmed to them when the appliance does not honour $select
         :arg dump: (Optional) boolean value for dumping payload data.
+        :arg retry: (optional) None for the retry policy of the object, False to not retry,
+            True to retry even if the method is not idempotent, or a RetryPolicy
         :returns: OpenURLResponse
         """
+        policy, force = self.retry_policy.for_call(retry)
+        attempt, started = 0, time.time()
+        while True:
+            try:
+                return self._send_request(method, path, data, query_param, headers, api_timeout, dump,
+                                          select, attempt)
+            except (URLError, ConnectionError) as err:
+                delay = policy.backoff(method, err, attempt, started, force=force) if policy else None
+                if delay is None or (hasattr(data, "read") and not hasattr(data, "rewind")):
+                    raise err
+                attempt += 1
+                policy.sleep(delay)
+                if hasattr(data, "rewind"):
+                    data.rewind()
+
+    def _send_request(self, method, path, data, query_param, headers, api_timeout, dump, select, retries=0):
+        perf_record = None
+        token = self._headers.get("X-Auth-Token")
         try:
             if 'X-Auth-Token' in self._headers:
                 url_kwargs = self._args_with_session(method, api_timeout, headers=headers)
             else:
                 url_kwargs = self._args_without_session(method, api_timeout, headers=headers)
+            req_data = data
             if data and dump:
-                data = json.dumps(data)
+                req_data = json.dumps(data)
+            if select:
+                query_param = dict(query_param or {}, **{"$select": ",".join(select)})
             url = self._build_url(path, query_param=query_param)
-            resp = open_url(url, data=data, **url_kwargs)
-            resp_data = OpenURLResponse(resp)
-        except (HTTPError, URLError, SSLValidationError, ConnectionError) as err:
+            sent = (len(req_data) if hasattr(req_data, "read") else len(to_bytes(req_data))) if req_data else 0
+            perf_record = self._perf.start("ome", method, url, sent=sent)
+            if perf_record is not None:
+                perf_record["retries"] = retries
+            if self._pool is not None:
+                resp = self._pool_urlopen(url, req_data, url_kwargs, perf_record)
+            else:
+                start = time.time()
+                resp = open_url(url, data=req_data, **url_kwargs)
+                add_timing(perf_record, "first_byte_ms", start)
+            resp_data = OpenURLResponse(resp, perf_record=perf_record)
+            if perf_record is not None:
+                perf_record["status"] = resp_data.status_code
+            if select:
+                resp_data.project(select)
+        except HTTPError as err:
+            if perf_record is not None:
+                perf_record["status"] = err.code
+            if err.code == 401 and self._reauthenticate(path, token):
+                return self._send_request(method, path, data, query_param, headers, api_timeout, dump,
+                                          select, retries)
+            raise err
+        except (URLError, SSLValidationError, ConnectionError) as err:
             raise err
         return resp_data
 
-    def __enter__(self):
-        """Creates sessions by passing it to header"""
-        if self.req_session:
-            payload = {'UserName': self.username,
-                       'Password': self.password,
-                       'SessionType': 'API', }
-            path = SESSION_RESOURCE_COLLECTION["SESSION"]
-            resp = self.invoke_request('POST', path, data=payload)
-            if resp and resp.success:
-                self.session_id = resp.json_data.get("Id")
-                self._headers["X-Auth-Token"] = resp.token_header
+    def _session_key(self):
+        return "{0}@{1}:{2}".format(self.username, self.hostname, self.port)
+
+    def _cache_session(self):
+        if self.session_cache is not None and self.session_id:
+            self.session_cache.put(self._session_key(), {"Id": self.session_id,
+                                                         "Token": self._headers.get("X-Auth-Token"),
+                                                         "LastUsed": time.time()})
+
+    def _create_session(self):
+        """Creates a session and keeps it in the session cache, if any"""
+        self._headers.pop("X-Auth-Token", None)
+        self.session_id = None
+        payload = {'UserName': self.username,
+                   'Password': self.password,
+                   'SessionType': 'API', }
+        path = SESSION_RESOURCE_COLLECTION["SESSION"]
+        resp = self.invoke_request('POST', path, data=payload, retry=True)
+        if resp and resp.success:
+            self.session_id = resp.json_data.get("Id")
+            self._headers["X-Auth-Token"] = resp.token_header
+            self._cache_session()
+        else:
+            msg = "Could not create the session"
+            raise ConnectionError(msg)
+
+    def _reuse_cached_session(self):
+        """
+        Picks up the session of the session cache, after a cheap GET of the session
+        resource confirms that the appliance still accepts its token.
+        Sessions idle for longer than the TTL are deleted instead.
+        :returns: True when the cached session is in use
+        """
+        entry = self.session_cache.get(self._session_key())
+        if not isinstance(entry, dict) or not entry.get("Id") or not entry.get("Token"):
+            return False
+        self.session_id = entry["Id"]
+        self._headers["X-Auth-Token"] = entry["Token"]
+        path = SESSION_RESOURCE_COLLECTION["SESSION_ID"].format(Id=self.session_id)
+        try:
+            if time.time() - entry.get("LastUsed", 0) > self.session_ttl:
+                self.invoke_request('DELETE', path)
             else:
-                msg = "Could not create the session"
-                raise ConnectionError(msg)
+                self.invoke_request('GET', path)
+                self._cached_session = True
+        except HTTPError:
+            pass
+        if not self._cached_session:
+            self.session_id = None
+            self._headers.pop("X-Auth-Token", None)
+            self.session_cache.remove(self._session_key())
+        return self._cached_session
+
+    def _reauthenticate(self, path, token):
+        """
+        Replaces a cached session, which the appliance rejected, with a new session.
+        Requests rejected concurrently with the same I(token) create a single session,
+        the others find the token already replaced and are sent again with the new one.
+        :returns: True when the request is to be sent again
+        """
+        if path == SESSION_RESOURCE_COLLECTION["SESSION"]:
+            return False
+        with self._session_lock:
+            if self._headers.get("X-Auth-Token") != token:
+                return True
+            if not self._cached_session:
+                return False
+            self._cached_session = False
+            self._create_session()
+        return True
+
+    def logout(self):
+        """Deletes the session, including a session kept in the session cache"""
+        try:
+            if self.session_id:
+                path = SESSION_RESOURCE_COLLECTION["SESSION_ID"].format(Id=self.session_id)
+                self.invoke_request('DELETE', path)
+        finally:
+            self.session_id = None
+            self._cached_session = False
+            self._headers.pop("X-Auth-Token", None)
+            if self.session_cache is not None:
+                self.session_cache.remove(self._session_key())
+
+    def __enter__(self):
+        """Opens the connection pool and creates sessions by passing it to header"""
+        self._open_pool()
+        try:
+            if self.req_session:
+                if self.session_cache is None or not self._reuse_cached_session():
+                    self._create_session()
+        except Exception:
+            self._close_pool()
+            raise
         return self
 
     def __exit__(self, exc_type, exc_value, traceback):
-        """Deletes a session id, which is in use for request"""
-        if self.session_id:
-            path = SESSION_RESOURCE_COLLECTION["SESSION_ID"].format(Id=self.session_id)
-            self.invoke_request('DELETE', path)
+        """
+        Deletes a session id, which is in use for request, or keeps it in the session
+        cache for later invocations, and closes the connection pool
+        """
+        try:
+            if self.session_id and self.session_cache is not None:
+                self._cache_session()
+            elif self.session_id:
+                path = SESSION_RESOURCE_COLLECTION["SESSION_ID"].format(Id=self.session_id)
+                self.invoke_request('DELETE', path)
+        finally:
+            self._close_pool()
         return False
 
-    def get_all_report_details(self, uri):
+    def _get_report_page(self, uri, top, skip, select=None):
+        """Fetches a single $top/$skip window of a collection"""
+        return self.invoke_request('GET', uri, query_param={"$top": top, "$skip": skip}, select=select)
+
+    def get_all_report_details(self, uri, max_workers=1, select=None):
         """
         This implementation mainly dependent on '@odata.count' value.
         Currently first request without query string, always returns total number of available
         reports in '@odata.count'.
+        Once the count is known, the remaining $top/$skip windows are fetched on a thread pool
+        of at most I(max_workers) threads, and the reports are kept in server order.
+        I(select) restricts the reports to the given list of properties.
         """
         try:
-            resp = self.invoke_request('GET', uri)
+            resp = self.invoke_request('GET', uri, select=select)
             data = resp.json_data
             report_list = data["value"]
             total_count = data['@odata.count']
             remaining_count = total_count - len(report_list)
             first_page_count = len(report_list)
+            if max_workers > 1 and first_page_count and remaining_count > 0:
+                skips = list(range(first_page_count, total_count, first_page_count))
+                pool = ThreadPool(min(max_workers, len(skips)))
+                try:
+                    pages = pool.map(lambda skip: self._get_report_page(uri, first_page_count, skip, select), skips)
+                finally:
+                    pool.close()
+                    pool.join()
+                for resp in pages:
+                    report_list.extend(resp.json_data["value"])
+                remaining_count = 0
             while remaining_count > 0:
-                resp = self.invoke_request('GET', uri, query_param={"$top": first_page_count, "$skip": len(report_list)})
+                resp = self._get_report_page(uri, first_page_count, len(report_list), select)
                 data = resp.json_data
                 value = data["value"]
                 report_list.extend(value)
@@ -203,3 +717,348 @@ class RestOME(object):
         except (URLError, HTTPError, SSLValidationError, ConnectionError, TypeError, ValueError) as err:
             raise err
 
+    def _iter_pages(self, uri, page_size=PAGE_SIZE, select=None, query_param=None, max_items=None):
+        """Yields the response data of each $top/$skip page of a collection, up to I(max_items) records"""
+        skip = 0
+        while max_items is None or skip < max_items:
+            top = page_size if max_items is None else min(page_size, max_items - skip)
+            page_param = dict(query_param or {}, **{"$top": top, "$skip": skip})
+            data = self.invoke_request('GET', uri, query_param=page_param, select=select).json_data
+            value = data.get("value", [])
+            yield data
+            skip += len(value)
+            total_count = data.get("@odata.count")
+            if not value or (total_count is not None and skip >= total_count) or \
+                    (total_count is None and len(value) < top):
+                break
+
+    def iter_collection(self, uri, page_size=PAGE_SIZE, select=None, query_param=None):
+        """
+        Yields the records of a collection page by page using $top and $skip, so that
+        the caller can filter and drop records as they go instead of holding the whole
+        collection in memory.
+        :arg uri: collection path
+        :arg page_size: (optional) number of records requested per page
+        :arg select: (optional) list of properties, sent as $select
+        :arg query_param: (optional) additional query options, such as $filter
+        """
+        for data in self._iter_pages(uri, page_size, select, query_param):
+            for item in data.get("value", []):
+                yield item
+
+    def get_collection(self, uri, query_param=None, select=None, max_items=None, page_size=PAGE_SIZE):
+        """
+        Pages through a collection with $top and $skip and returns all of its records in the
+        shape of a single collection response. '@odata.count' is the count reported by the
+        appliance, which is the number of matching records even when I(max_items) truncates them.
+        :arg uri: collection path
+        :arg query_param: (optional) additional query options, such as $filter
+        :arg select: (optional) list of properties, sent as $select
+        :arg max_items: (optional) maximum number of records to return
+        :arg page_size: (optional) number of records requested per page
+        """
+        collection = {"value": []}
+        for data in self._iter_pages(uri, page_size, select, query_param, max_items):
+            if "@odata.context" not in collection:
+                collection["@odata.context"] = data.get("@odata.context")
+                collection["@odata.count"] = data.get("@odata.count")
+            collection["value"].extend(data.get("value", []))
+        if collection.get("@odata.count") is None:
+            collection["@odata.count"] = len(collection["value"])
+        return collection
+
+    @staticmethod
+    def _filter_chunks(clauses, max_length=FILTER_MAX_LENGTH):
+        """
+        Joins $filter clauses with 'or' into expressions whose URL encoded length stays
+        within I(max_length), so that the request line is accepted by the appliance.
+        """
+        chunks, chunk, length = [], [], 0
+        for clause in clauses:
+            clause_length = len(quote_plus(clause)) + len("+or+")
+            if chunk and length + clause_length > max_length:
+                chunks.append(" or ".join(chunk))
+                chunk, length = [], 0
+            chunk.append(clause)
+            length += clause_length
+        if chunk:
+            chunks.append(" or ".join(chunk))
+        return chunks
+
+    def resolve_devices(self, device_ids=None, service_tags=None, select=DEVICE_ID_SELECT,
+                        sweep_threshold=DEVICE_SWEEP_THRESHOLD):
+        """
+        Resolves device ids and service tags to their device records.
+        Up to I(sweep_threshold) identifiers are looked up with $filter queries of the form
+        "DeviceServiceTag eq 'A' or DeviceServiceTag eq 'B'", chunked to stay within URL length
+        limits. Larger requests sweep the device inventory once instead, stopping as soon as
+        every identifier is resolved.
+        :arg device_ids: (optional) list of device ids
+        :arg service_tags: (optional) list of device service tags
+        :arg select: (optional) list of device properties to fetch, None for all of them
+        :arg sweep_threshold: (optional) number of identifiers above which the inventory is swept
+        :returns: tuple of dict, which maps each resolved identifier as str to its device record,
+            and list of the identifiers which did not resolve, in the order requested
+        """
+        device_ids = [str(device_id) for device_id in device_ids or []]
+        service_tags = [str(tag) for tag in service_tags or []]
+        wanted = {"Id": set(device_ids), "DeviceServiceTag": set(service_tags)}
+        if select is not None:
+            select = list(select) + [field for field in wanted if field not in select]
+        wanted_count = len(wanted["Id"] | wanted["DeviceServiceTag"])
+        devices = {}
+        if self.inventory_cache and wanted_count:
+            for device in self.get_device_inventory()["value"]:
+                self._match_device(device, wanted, devices)
+        elif wanted_count > sweep_threshold:
+            for device in self.iter_collection(DEVICE_URI, select=select):
+                self._match_device(device, wanted, devices)
+                if len(devices) == wanted_count:
+                    break
+        elif wanted_count:
+            self._filter_devices(wanted, select, devices)
+        unresolved = [identifier for identifier in device_ids + service_tags if identifier not in devices]
+        return devices, unresolved
+
+    def get_device(self, device_id, select=DEVICE_ID_SELECT):
+        """
+        GETs the device entity DeviceService/Devices(<id>), whose latency does not depend on the
+        size of the inventory. Returns None when no device has the id.
+        """
+        if not str(device_id).isdigit():
+            return None
+        try:
+            return self.invoke_request("GET", DEVICE_ENTITY_URI.format(device_id=device_id), select=select).json_data
+        except HTTPError as err:
+            if err.code in (400, 404):
+                return None
+            raise err
+
+    def get_devices_by_id(self, device_ids, select=DEVICE_ID_SELECT, max_workers=MAX_WORKERS):
+        """
+        Looks up each device id with a GET of its device entity, on a thread pool of at most
+        I(max_workers) threads when there are several ids.
+        :returns: dict which maps each device id found, as str, to its device record
+        """
+        device_ids = list(dict.fromkeys(str(device_id) for device_id in device_ids))
+        if max_workers > 1 and len(device_ids) > 1:
+            pool = ThreadPool(min(max_workers, len(device_ids)))
+            try:
+                records = pool.map(lambda device_id: self.get_device(device_id, select), device_ids)
+            finally:
+                pool.close()
+                pool.join()
+        else:
+            records = [self.get_device(device_id, select) for device_id in device_ids]
+        return dict((device_id, record) for device_id, record in zip(device_ids, records) if record)
+
+    def get_devices_by_tag(self, service_tags, select=DEVICE_ID_SELECT):
+        """
+        Looks up the service tags with chunked "DeviceServiceTag eq 'A' or ..." $filter queries.
+        :returns: dict which maps each service tag found to its device record
+        """
+        wanted = {"Id": set(), "DeviceServiceTag": set(str(tag) for tag in service_tags)}
+        if select is not None:
+            select = list(select) + [field for field in wanted if field not in select]
+        devices = {}
+        if wanted["DeviceServiceTag"]:
+            self._filter_devices(wanted, select, devices)
+        return devices
+
+    def _filter_devices(self, wanted, select, devices):
+        """Looks up the wanted device ids and service tags with chunked $filter queries"""
+        clauses = ["Id eq {0}".format(device_id) for device_id in sorted(wanted["Id"]) if device_id.isdigit()]
+        clauses.extend("DeviceServiceTag eq '{0}'".format(tag.replace("'", "''"))
+                       for tag in sorted(wanted["DeviceServiceTag"]))
+        for query in self._filter_chunks(clauses):
+            for device in self.iter_collection(DEVICE_URI, select=select, query_param={"$filter": query}):
+                self._match_device(device, wanted, devices)
+
+    @staticmethod
+    def _match_device(device, wanted, devices):
+        for field, identifiers in wanted.items():
+            identifier = str(device.get(field))
+            if identifier in identifiers:
+                devices[identifier] = device
+
+    def get_device_inventory(self):
+        """
+        Returns the device collection as a dict with '@odata.context', '@odata.count' and 'value'.
+        Without an inventory cache the whole collection is fetched.
+        With an inventory cache, the first call sweeps the collection and stores it. Later
+        calls, also from later module runs, fetch only the devices whose LastInventoryTime or
+        LastStatusTime is at or after the cache watermark. When the device count of the
+        appliance then differs from the cache, the device ids are listed to drop deleted
+        devices and to fetch devices which are missing from the cache.
+        """
+        if self._inventory is not None:
+            return self._inventory
+        if not self.inventory_cache:
+            report = self.get_all_report_details(DEVICE_URI, max_workers=MAX_WORKERS)
+            return {"@odata.context": report["resp_obj"].json_data.get("@odata.context"),
+                    "@odata.count": len(report["report_list"]),
+                    "value": report["report_list"]}
+        cache = InventoryCache(self.inventory_cache, self._session_key())
+        cached = cache.load()
+        context, watermark = cached.get("Context"), cached.get("Watermark")
+        devices = dict((str(device["Id"]), device) for device in cached.get("Devices") or [])
+        if not devices or not watermark:
+            report = self.get_all_report_details(DEVICE_URI, max_workers=MAX_WORKERS)
+            context = report["resp_obj"].json_data.get("@odata.context")
+            devices = dict((str(device["Id"]), device) for device in report["report_list"])
+        else:
+            query = "LastInventoryTime ge '{0}' or LastStatusTime ge '{0}'".format(watermark)
+            for device in self.iter_collection(DEVICE_URI, query_param={"$filter": query}):
+                devices[str(device["Id"])] = device
+            count = self.invoke_request('GET', DEVICE_URI, query_param={"$top": 1},
+                                        select=["Id"]).json_data.get("@odata.count")
+            if count != len(devices):
+                live_ids = set(str(device["Id"]) for device in self.iter_collection(DEVICE_URI, select=["Id"]))
+                for device_id in set(devices) - live_ids:
+                    del devices[device_id]
+                missing_ids = live_ids - set(devices)
+                if missing_ids:
+                    self._filter_devices({"Id": missing_ids, "DeviceServiceTag": set()}, None, devices)
+        device_list = sorted(devices.values(), key=lambda device: device["Id"])
+        cache.save(context, device_list)
+        self._inventory = {"@odata.context": context, "@odata.count": len(device_list), "value": device_list}
+        return self._inventory
+
+
+class JobTracker(object):
+    """Polls an OME job within an existing RestOME session until it reaches a terminal state.
+
+    The first poll is immediate and the interval then grows geometrically from
+    ``min_interval`` up to ``max_interval``, so short jobs finish quickly while long
+    running jobs such as firmware updates do not flood the appliance with GETs.
+    """
+
+    def __init__(self, rest_obj, min_interval=JOB_POLL_MIN_INTERVAL, max_interval=JOB_POLL_MAX_INTERVAL,
+                 growth=JOB_POLL_GROWTH, sleep=time.sleep):
+        self.rest_obj = rest_obj
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.growth = growth
+        self.sleep = sleep
+
+    @staticmethod
+    def job_status(job):
+        return (job.get("LastRunStatus") or {}).get("Name")
+
+    def get_job(self, job_id):
+        return self.rest_obj.invoke_request("GET", JOB_URI.format(job_id=job_id)).json_data
+
+    def get_execution_history(self, job_id):
+        """Returns the execution histories of a job, the latest run carrying its per-target details."""
+        resp = self.rest_obj.invoke_request("GET", JOB_HISTORY_URI.format(job_id=job_id))
+        histories = sorted(resp.json_data.get("value", []), key=lambda history: history.get("Id"), reverse=True)
+        if histories:
+            details = self.rest_obj.invoke_request(
+                "GET", JOB_HISTORY_DETAILS_URI.format(job_id=job_id, history_id=histories[0]["Id"]))
+            histories[0]["ExecutionHistoryDetails"] = details.json_data.get("value", [])
+        return histories
+
+    def get_jobs(self, job_ids, select=None):
+        """Fetches several jobs with chunked "Id eq 1 or Id eq 2" $filter queries, keyed by job id."""
+        jobs = {}
+        clauses = ["Id eq {0}".format(job_id) for job_id in job_ids]
+        for query in RestOME._filter_chunks(clauses):
+            for job in self.rest_obj.iter_collection(JOB_COLLECTION_URI, select=select,
+                                                     query_param={"$filter": query}):
+                jobs[job["Id"]] = job
+        return jobs
+
+    @classmethod
+    def summarize(cls, job_ids, jobs):
+        """Aggregates the outcome of the requested jobs by their last run status."""
+        summary = {"total": len(job_ids), "status_counts": {}, "missing": [], "pending": [], "failed": []}
+        for job_id in job_ids:
+            if job_id not in jobs:
+                summary["missing"].append(job_id)
+                continue
+            status = cls.job_status(jobs[job_id])
+            summary["status_counts"][status] = summary["status_counts"].get(status, 0) + 1
+            if status not in JOB_TERMINAL_STATES:
+                summary["pending"].append(job_id)
+            elif status != "Completed":
+                summary["failed"].append(job_id)
+        return summary
+
+    @staticmethod
+    def job_stamp(job):
+        """Returns the newest of the job's LastRun and UpdatedDate, None if neither is set."""
+        return max([job.get(field) for field in JOB_CURSOR_FIELDS if job.get(field)] or [None])
+
+    def get_changed_jobs(self, cursor_path, query_filter=None):
+        """
+        Fetches the jobs which ran or changed since the cursor persisted in I(cursor_path) by the
+        previous call, paging through the job collection, and advances the cursor. The first call
+        returns every job. Jobs already returned at the cursor time stamp are not returned again.
+        :arg cursor_path: path of the cursor state file
+        :arg query_filter: (optional) $filter expression which the jobs must also match
+        :returns: tuple of list of the changed jobs and dict with the previous and current cursor
+        """
+        cache = JobCursorCache(cursor_path)
+        key = self.rest_obj._session_key() if not query_filter else \
+            "{0}|{1}".format(self.rest_obj._session_key(), query_filter)
+        state = cache.get(key)
+        cursor, cursor_ids = state.get("Cursor"), set(state.get("CursorIds") or [])
+        clauses = [query_filter] if query_filter else []
+        if cursor:
+            clauses.append(" or ".join("{0} ge '{1}'".format(field, cursor) for field in JOB_CURSOR_FIELDS))
+        query_param = None
+        if clauses:
+            query_param = {"$filter": " and ".join("({0})".format(clause) for clause in clauses)}
+        jobs = []
+        for job in self.rest_obj.iter_collection(JOB_COLLECTION_URI, query_param=query_param):
+            if cursor and job["Id"] in cursor_ids and self.job_stamp(job) == cursor:
+                continue
+            jobs.append(job)
+        new_cursor = max([stamp for stamp in [cursor] + [self.job_stamp(job) for job in jobs] if stamp] or [None])
+        new_ids = set(job["Id"] for job in jobs if self.job_stamp(job) == new_cursor)
+        if new_cursor == cursor:
+            new_ids.update(cursor_ids)
+        cache.put(key, {"Cursor": new_cursor, "CursorIds": sorted(new_ids)})
+        return jobs, {"previous": cursor, "current": new_cursor, "changed": len(jobs)}
+
+    def wait_all(self, job_ids, timeout=JOB_WAIT_TIMEOUT):
+        """
+        Waits for all the jobs to reach a terminal state. Each poll only fetches the status of the jobs
+        which are still pending and the full job details are fetched once at the end.
+        :returns: tuple of dict, which maps each job id to its details, and the summary of the wait
+        """
+        started, interval, polls = time.time(), self.min_interval, 0
+        pending, found = set(job_ids), set()
+        while True:
+            jobs = self.get_jobs(sorted(pending), select=JOB_STATUS_SELECT)
+            polls += 1
+            found.update(jobs)
+            pending = set(job_id for job_id, job in jobs.items() if self.job_status(job) not in JOB_TERMINAL_STATES)
+            remaining = timeout - (time.time() - started)
+            if not pending or remaining <= 0:
+                break
+            self.sleep(min(interval, remaining))
+            interval = min(interval * self.growth, self.max_interval)
+        jobs = self.get_jobs(sorted(found))
+        summary = self.summarize(job_ids, jobs)
+        summary.update({"timed_out": bool(summary["pending"]), "polls": polls,
+                        "elapsed_seconds": round(time.time() - started, 1)})
+        return jobs, summary
+
+    def wait(self, job_id, timeout=JOB_WAIT_TIMEOUT, history=True):
+        """Waits for the job to finish and returns the final job with a summary of the wait."""
+        started, interval, polls = time.time(), self.min_interval, 0
+        while True:
+            job = self.get_job(job_id)
+            polls += 1
+            status = self.job_status(job)
+            remaining = timeout - (time.time() - started)
+            if status in JOB_TERMINAL_STATES or remaining <= 0:
+                break
+            self.sleep(min(interval, remaining))
+            interval = min(interval * self.growth, self.max_interval)
+        tracking = {"job_id": job_id, "status": status, "timed_out": status not in JOB_TERMINAL_STATES,
+                    "polls": polls, "elapsed_seconds": round(time.time() - started, 1)}
+        if history:
+            tracking["execution_history"] = self.get_execution_history(job_id)
+        return job, tracking
@@ -0,0 +1,142 @@
+# -*- coding: utf-8 -*-
+
+# Dell EMC OpenManage Ansible Modules
+# Version 2.0.7
+# Copyright (C) 2020 Dell Inc. or its subsidiaries. All Rights Reserved.
+
+# Redistribution and use in source and binary forms, with or without modification,
+# are permitted provided that the following conditions are met:
+
+#    * Redistributions of source code must retain the above copyright notice,
+#      this list of conditions and the following disclaimer.
+
+#    * Redistributions in binary form must reproduce the above copyright notice,
+#      this list of conditions and the following disclaimer in the documentation
+#      and/or other materials provided with the distribution.
+
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND
+# ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE DISCLAIMED.
+# IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT,
+# INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+# PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT
+# LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE
+# USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+import json
+import os
+import threading
+import time
+from ansible.module_utils.basic import AnsibleModule
+from ansible.module_utils.six.moves.urllib.parse import urlparse
+
+PERF_ENV = "DELLEMC_PERF"
+PERF_TRACE_ENV = "DELLEMC_PERF_TRACE"
+SLOWEST_CALLS = 5
+TIMINGS = ("connect_ms", "first_byte_ms", "read_ms", "decode_ms")
+
+
+def elapsed_ms(start):
+    """Milliseconds elapsed since I(start), a time.time() value"""
+    return round((time.time() - start) * 1000, 3)
+
+
+def add_timing(record, key, start):
+    """Adds the time elapsed since I(start) to the I(key) timing of I(record), if any"""
+    if record is not None:
+        record[key] = round(record[key] + elapsed_ms(start), 3)
+
+
+class PerfRecorder(object):
+    """
+    Collects one record per HTTP request made by the OME, Redfish and iDRAC clients,
+    with the time spent connecting, waiting for the first byte, reading and decoding
+    the body, the bytes sent and received, the status code and the number of retries.
+    Connect time is only known for keep-alive pooled connections; for requests sent
+    through open_url it is part of the first byte time.
+    Recording is off unless I(enabled) or I(trace_path) is given.
+    """
+
+    def __init__(self, enabled=False, trace_path=None, slowest=SLOWEST_CALLS):
+        self.trace_path = trace_path
+        self.enabled = bool(enabled or trace_path)
+        self.slowest = slowest
+        self.records = []
+        self._flushed = 0
+        self._lock = threading.Lock()
+
+    def start(self, client, method, url, sent=0):
+        """
+        Starts the record of a request.
+        :returns: the record dict to fill in, or None when recording is disabled
+        """
+        if not self.enabled:
+            return None
+        parsed = urlparse(url)
+        path = parsed.path + ("?{0}".format(parsed.query) if parsed.query else "")
+        record = {"client": client, "host": parsed.hostname, "method": method, "path": path,
+                  "status": None, "sent": sent, "received": 0, "retries": 0, "start": time.time()}
+        record.update(dict((key, 0.0) for key in TIMINGS))
+        with self._lock:
+            self.records.append(record)
+        return record
+
+    @staticmethod
+    def total_ms(record):
+        return round(sum(record[key] for key in TIMINGS), 3)
+
+    def summary(self):
+        """Totals over all the requests and the slowest of them"""
+        with self._lock:
+            records = list(self.records)
+        summary = {"requests": len(records),
+                   "retries": sum(record["retries"] for record in records),
+                   "bytes_sent": sum(record["sent"] for record in records),
+                   "bytes_received": sum(record["received"] for record in records)}
+        for key in TIMINGS:
+            summary[key] = round(sum(record[key] for record in records), 3)
+        summary["total_ms"] = round(sum(summary[key] for key in TIMINGS), 3)
+        slowest = sorted(records, key=self.total_ms, reverse=True)[:self.slowest]
+        summary["slowest"] = [dict(record, total_ms=self.total_ms(record)) for record in slowest]
+        return summary
+
+    def flush_trace(self):
+        """Appends the records which are not yet written to the JSONL trace file"""
+        if not self.trace_path:
+            return
+        with self._lock:
+            records, self._flushed = self.records[self._flushed:], len(self.records)
+        if records:
+            with open(os.path.expanduser(self.trace_path), 'a') as trace_file:
+                for record in records:
+                    trace_file.write(json.dumps(dict(record, total_ms=self.total_ms(record)), sort_keys=True) + "\n")
+
+
+RECORDER = PerfRecorder(enabled=os.environ.get(PERF_ENV, "").lower() in ("1", "true", "yes"),
+                        trace_path=os.environ.get(PERF_TRACE_ENV))
+
+
+class PerfAnsibleModule(AnsibleModule):
+    """
+    AnsibleModule which adds the C(perf) summary of I(perf_recorder) to the result of
+    exit_json and fail_json, and writes the trace file, when recording is enabled through
+    the DELLEMC_PERF or DELLEMC_PERF_TRACE environment variables.
+    """
+    perf_recorder = RECORDER
+
+    def _with_perf(self, result):
+        if self.perf_recorder.enabled:
+            self.perf_recorder.flush_trace()
+            result["perf"] = self.perf_recorder.summary()
+        return result
+
+    def exit_json(self, **kwargs):
+        super(PerfAnsibleModule, self).exit_json(**self._with_perf(kwargs))
+
+    def fail_json(self, **kwargs):
+        super(PerfAnsibleModule, self).fail_json(**self._with_perf(kwargs))
@@ -28,31 +28,137 @@ from __future__ import (absolute_import, division, print_function)
 __metaclass__ = type
 
 import json
+import os
+import socket
+import time
+from multiprocessing.pool import ThreadPool
+from ansible.module_utils._text import to_bytes, to_text
 from ansible.module_utils.urls import open_url, ConnectionError, SSLValidationError
+from ansible.module_utils.six import string_types
+from ansible.module_utils.six.moves import http_client
 from ansible.module_utils.six.moves.urllib.error import URLError, HTTPError
-from ansible.module_utils.six.moves.urllib.parse import urlencode
+from ansible.module_utils.six.moves.urllib.parse import urlencode, urlparse, parse_qsl
+from ansible.module_utils.remote_management.dellemc.cache import JSONFileCache
+from ansible.module_utils.remote_management.dellemc.perf import RECORDER, add_timing
+from ansible.module_utils.remote_management.dellemc.retry import RetryPolicy, parse_retry_after
+
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
 
 SESSION_RESOURCE_COLLECTION = {
     "SESSION": "/redfish/v1/Sessions",
     "SESSION_ID": "/redfish/v1/Sessions/{Id}",
 }
+TASK_URI = "/redfish/v1/TaskService/Tasks/{task_id}"
+TASK_TERMINAL_STATES = ("Completed", "Exception", "Killed", "Cancelled", "Interrupted")
+TASK_WAIT_TIMEOUT = 3600
+TASK_POLL_MIN_INTERVAL = 2
+TASK_POLL_MAX_INTERVAL = 30
+TASK_POLL_GROWTH = 1.5
+EVENT_SERVICE_URI = "/redfish/v1/EventService"
+TASK_EVENTS_ENV = "REDFISH_TASK_EVENTS"
+DISCOVERY_CACHE_ENV = "REDFISH_DISCOVERY_CACHE"
+DISCOVERY_CACHE_TTL = 86400
+MAX_WORKERS = 4
+
+
+def json_loads(body):
+    """
+    Decodes a JSON document with orjson when it is importable, and with the
+    standard json module otherwise, or when orjson rejects the document.
+    """
+    if HAS_ORJSON:
+        try:
+            return orjson.loads(body)
+        except ValueError:
+            pass
+    return json.loads(body)
+
+
+def iter_sse_events(stream):
+    """
+    Yields the decoded JSON data of each event read from a Server-Sent Events stream.
+    Comments, such as keep-alives, and events whose data is not JSON are skipped.
+    """
+    data = []
+    while True:
+        line = stream.readline()
+        if not line:
+            return
+        line = to_text(line).rstrip("\r\n")
+        if not line and data:
+            try:
+                yield json_loads("\n".join(data))
+            except ValueError:
+                pass
+            data = []
+        elif line.startswith("data:"):
+            data.append(line[6:] if line.startswith("data: ") else line[5:])
+
+
+def _resolve_protocol_features(redfish_obj):
+    """Looks up the $expand levels the service supports, 0 when it does not support $expand=."""
+    root = redfish_obj.invoke_request("GET", redfish_obj.root_uri).json_data
+    expand = root.get("ProtocolFeaturesSupported", {}).get("ExpandQuery", {})
+    levels = expand.get("MaxLevels", 1) if expand.get("NoLinks") and expand.get("Levels") else 0
+    return {"expand_levels": levels}
+
+
+def member_id(member):
+    """Last segment of the URI of a collection member"""
+    return member["@odata.id"].rstrip("/").split("/")[-1]
+
+
+class DiscoveryCache(JSONFileCache):
+    """
+    Keeps the endpoint URIs discovered on Redfish services keyed by host, along with the
+    version of the service they were discovered on and the time they expire.
+    """
+
+    def get(self, host):
+        return self._load().get(host)
+
+    def put(self, host, entry):
+        services = self._load()
+        services[host] = entry
+        self._save(services)
+
+    def remove(self, host):
+        services = self._load()
+        if services.pop(host, None) is not None:
+            self._save(services)
 
 
 class OpenURLResponse(object):
     """Handles HTTPResponse"""
 
-    def __init__(self, resp):
+    def __init__(self, resp, perf_record=None):
         self.body = None
         self.resp = resp
+        self._json_data = None
+        self._perf_record = perf_record
         if self.resp:
+            start = time.time()
             self.body = self.resp.read()
+            add_timing(perf_record, "read_ms", start)
+            if perf_record is not None and self.body:
+                perf_record["received"] = len(self.body)
 
     @property
     def json_data(self):
-        try:
-            return json.loads(self.body)
-        except ValueError:
-            raise ValueError("Unable to parse json")
+        """Decoded body, which is parsed once on first access"""
+        if self._json_data is None:
+            start = time.time()
+            try:
+                self._json_data = json_loads(self.body)
+            except ValueError:
+                raise ValueError("Unable to parse json")
+            finally:
+                add_timing(self._perf_record, "decode_ms", start)
+        return self._json_data
 
     @property
     def status_code(self):
@@ -71,11 +177,28 @@ class OpenURLResponse(object):
     def reason(self):
         return self.resp.reason
 
+    @property
+    def url(self):
+        """URL of the response, which differs from the requested one after a redirect"""
+        return self.resp.geturl()
+
 
 class Redfish(object):
-    """Handles iDRAC Redfish API requests"""
+    """
+    Handles iDRAC Redfish API requests
+    Requests which fail with a transient error are sent again according to
+    I(retry_policy), by default a RetryPolicy which retries idempotent methods.
+
+    When a discovery cache file is given, either as I(discovery_cache) or through the
+    REDFISH_DISCOVERY_CACHE environment variable, the endpoint URIs looked up with
+    L(discover) are kept for I(discovery_ttl) seconds and reused by later module runs.
+    Once they expire, they are kept for another I(discovery_ttl) seconds as long as the
+    service root reports the same Redfish version and UUID, that is until the firmware of
+    the service changes. A 404 on any URI below a cached endpoint drops the entry of the host.
+    """
 
-    def __init__(self, module_params=None, req_session=False):
+    def __init__(self, module_params=None, req_session=False, perf_recorder=None, retry_policy=None,
+                 discovery_cache=None, discovery_ttl=DISCOVERY_CACHE_TTL):
         self.module_params = module_params
         self.hostname = self.module_params["baseuri"]
         self.username = self.module_params["username"]
@@ -86,7 +209,14 @@ class Redfish(object):
         self.session_id = None
         self.protocol = 'https'
         self.root_uri = '/redfish/v1/'
+        self._perf = perf_recorder or RECORDER
+        self.retry_policy = retry_policy or RetryPolicy()
         self._headers = {'Content-Type': 'application/json', 'Accept': 'application/json'}
+        cache_path = discovery_cache or os.environ.get(DISCOVERY_CACHE_ENV)
+        self.discovery_cache = DiscoveryCache(cache_path) if cache_path else None
+        self.discovery_ttl = discovery_ttl
+        self._discovered = None
+        self._expand_levels = None
 
     def _get_base_url(self):
         """builds base url"""
@@ -103,8 +233,8 @@ class Redfish(object):
         return url
 
     def _url_common_args_spec(self, method, api_timeout, headers=None):
-        """Creates an argument common spec"""
-        req_header = self._headers
+        """Creates an argument common spec, with I(headers) added to the headers of this request only"""
+        req_header = dict(self._headers)
         if headers:
             req_header.update(headers)
         url_kwargs = {
@@ -119,9 +249,6 @@ class Redfish(object):
 
     def _args_without_session(self, path, method, api_timeout=30, headers=None):
         """Creates an argument spec in case of basic authentication"""
-        req_header = self._headers
-        if headers:
-            req_header.update(headers)
         url_kwargs = self._url_common_args_spec(method, api_timeout, headers=headers)
         if not (path == SESSION_RESOURCE_COLLECTION["SESSION"] and method == 'POST'):
             url_kwargs["url_username"] = self.username
@@ -136,21 +263,40 @@ class Redfish(object):
         return url_kwargs
 
     def invoke_request(self, method, path, data=None, query_param=None, headers=None,
-                       api_timeout=30, dump=True):
+                       api_timeout=30, dump=True, retry=None):
         """
         Sends a request via open_url
         Returns :class:`OpenURLResponse` object.
         :arg method: HTTP verb to use for the request
         :arg path: path to request without query parameter
-        :arg data: (optional) Payload to send with the request
+        :arg data: (optional) Payload to send with the request, or with I(dump) false a
+            file-like body such as a StreamingBody, which is sent as it is read
         :arg query_param: (optional) Dictionary of query parameter to send with request
         :arg headers: (optional) Dictionary of HTTP Headers to send with the
             request
         :arg api_timeout: (optional) How long to wait for the server to send
             data before giving up
         :arg dump: (Optional) boolean value for dumping payload data.
+        :arg retry: (optional) None for the retry policy of the object, False to not retry,
+            True to retry even if the method is not idempotent, or a RetryPolicy
         :returns: OpenURLResponse
         """
+        policy, force = self.retry_policy.for_call(retry)
+        attempt, started = 0, time.time()
+        while True:
+            try:
+                return self._send_request(method, path, data, query_param, headers, api_timeout, dump, attempt)
+            except (URLError, ConnectionError) as err:
+                delay = policy.backoff(method, err, attempt, started, force=force) if policy else None
+                if delay is None or (hasattr(data, "read") and not hasattr(data, "rewind")):
+                    raise err
+                attempt += 1
+                policy.sleep(delay)
+                if hasattr(data, "rewind"):
+                    data.rewind()
+
+    def _send_request(self, method, path, data, query_param, headers, api_timeout, dump, retries=0):
+        perf_record = None
         try:
             if 'X-Auth-Token' in self._headers:
                 url_kwargs = self._args_with_session(method, api_timeout, headers=headers)
@@ -159,19 +305,227 @@ class Redfish(object):
             if data and dump:
                 data = json.dumps(data)
             url = self._build_url(path, query_param=query_param)
+            sent = (len(data) if hasattr(data, "read") else len(to_bytes(data))) if data else 0
+            perf_record = self._perf.start("redfish", method, url, sent=sent)
+            if perf_record is not None:
+                perf_record["retries"] = retries
+            start = time.time()
             resp = open_url(url, data=data, **url_kwargs)
-            resp_data = OpenURLResponse(resp)
-        except (HTTPError, URLError, SSLValidationError, ConnectionError) as err:
+            add_timing(perf_record, "first_byte_ms", start)
+            resp_data = OpenURLResponse(resp, perf_record=perf_record)
+            if perf_record is not None:
+                perf_record["status"] = resp_data.status_code
+        except HTTPError as err:
+            if perf_record is not None:
+                perf_record["status"] = err.code
+            if err.code == 404:
+                self._invalidate_discovery(path)
+            raise err
+        except (URLError, SSLValidationError, ConnectionError) as err:
             raise err
         return resp_data
 
+    def _service_version(self):
+        """Redfish version and UUID reported by the service root, which change with the firmware"""
+        root = self.invoke_request("GET", self.root_uri).json_data
+        return "{0}|{1}".format(root.get("RedfishVersion"), root.get("UUID"))
+
+    def _discovery_entry(self):
+        if self._discovered is None:
+            entry = self.discovery_cache.get(self.hostname)
+            if not isinstance(entry, dict) or not isinstance(entry.get("endpoints"), dict):
+                entry = None
+            elif entry.get("expires", 0) <= time.time():
+                if entry.get("version") == self._service_version():
+                    entry["expires"] = time.time() + self.discovery_ttl
+                    self.discovery_cache.put(self.hostname, entry)
+                else:
+                    entry = None
+            self._discovered = entry or {"version": None, "endpoints": {}}
+        return self._discovered
+
+    def discover(self, name, resolve):
+        """
+        Returns the endpoint URIs named I(name), which are looked up by I(resolve) with this
+        object on a miss of the discovery cache, or on every call when there is no cache.
+        :arg name: name of the endpoints in the cache entry of the host
+        :arg resolve: callable which returns the endpoints as a JSON serializable dict, which
+            is empty when the service does not provide them and then is not cached
+        :returns: dict of endpoints
+        """
+        if self.discovery_cache is None:
+            return resolve(self)
+        entry = self._discovery_entry()
+        if name not in entry["endpoints"]:
+            endpoints = resolve(self)
+            if not endpoints:
+                return endpoints
+            if entry["version"] is None:
+                entry["version"] = self._service_version()
+            entry["endpoints"][name] = endpoints
+            entry["expires"] = time.time() + self.discovery_ttl
+            self.discovery_cache.put(self.hostname, entry)
+        return entry["endpoints"][name]
+
+    def _invalidate_discovery(self, path):
+        """Drops the cached endpoints of the host when I(path) is one of them or below one"""
+        if self.discovery_cache is None or not self._discovered:
+            return
+        uris = [uri for endpoints in self._discovered["endpoints"].values() for uri in endpoints.values()
+                if isinstance(uri, string_types) and uri.startswith("/")]
+        path = urlparse(path).path
+        if any(path == uri or path.startswith(uri.rstrip("/") + "/") for uri in uris):
+            self.discovery_cache.remove(self.hostname)
+            self._discovered = None
+
+    def expand_levels(self):
+        """Maximum I($levels) of C($expand=.) the service supports, 0 when it does not support it"""
+        if self._expand_levels is None:
+            features = self.discover("protocol_features", _resolve_protocol_features)
+            self._expand_levels = features.get("expand_levels", 0)
+        return self._expand_levels
+
+    def _get_member(self, uri):
+        """Body of the resource at I(uri), or None when it does not exist"""
+        try:
+            return self.invoke_request("GET", uri).json_data
+        except HTTPError as err:
+            if err.code == 404:
+                return None
+            raise err
+
+    def _get_members_concurrently(self, uris, max_workers):
+        if max_workers <= 1 or len(uris) <= 1:
+            return [self._get_member(uri) for uri in uris]
+        pool = ThreadPool(min(max_workers, len(uris)))
+        try:
+            return pool.map(self._get_member, uris)
+        finally:
+            pool.close()
+            pool.join()
+
+    def get_resources(self, uris, max_workers=MAX_WORKERS):
+        """
+        Reads the resources at I(uris) with concurrent GETs on a thread pool of at most
+        I(max_workers) threads.
+        :arg uris: URIs of the resources
+        :arg max_workers: (optional) maximum number of concurrent GETs
+        :returns: list of resource bodies in the order of I(uris), None for a resource which does not exist
+        """
+        return self._get_members_concurrently(list(uris), max_workers)
+
+    def _get_members_page(self, uri, query_param, fetch_members, max_workers):
+        """
+        Fetches one page of a collection, along with the bodies of the members the service
+        did not expand with I(fetch_members)
+        """
+        data = self.invoke_request("GET", uri, query_param=query_param or None).json_data
+        members = list(data.get("Members", []))
+        if fetch_members:
+            partial = [index for index, member in enumerate(members) if set(member) <= set(["@odata.id"])]
+            bodies = self._get_members_concurrently([members[index]["@odata.id"] for index in partial], max_workers)
+            for index, body in zip(partial, bodies):
+                members[index] = body
+            members = [member for member in members if member is not None]
+        return data, members
+
+    @staticmethod
+    def _next_page(uri, query_param, data, fetched):
+        """URI and query of the page after I(data), or None on the last page"""
+        if not data.get("Members"):
+            return None
+        next_link = data.get("Members@odata.nextLink")
+        if next_link:
+            parsed = urlparse(next_link)
+            return parsed.path, dict(query_param, **dict(parse_qsl(parsed.query)))
+        count = data.get("Members@odata.count")
+        if isinstance(count, int) and fetched < count:
+            return uri, dict(query_param, **{"$skip": fetched})
+        return None
+
+    def iter_members(self, uri, expand=False, levels=1, prefetch=False, max_workers=MAX_WORKERS):
+        """
+        Yields the members of the collection at I(uri) page by page. The next page is taken from
+        Members@odata.nextLink, or else from C($skip) while fewer than Members@odata.count members
+        were read, so that collections which the service splits into pages are read in full.
+        :arg uri: URI of the collection
+        :arg expand: (optional) yield the bodies of the members instead of their links. They are
+            expanded with C($expand=.($levels=n)) when the service supports it, and otherwise
+            fetched with concurrent GETs on a thread pool of at most I(max_workers) threads.
+        :arg levels: (optional) levels of navigation properties to expand
+        :arg prefetch: (optional) fetch the next page on a background thread while the members
+            of the current page are consumed
+        :arg max_workers: (optional) maximum number of concurrent GETs of members
+        """
+        levels = min(levels, self.expand_levels()) if expand else 0
+        query_param = {"$expand": ".($levels={0})".format(levels)} if levels else {}
+        pool = ThreadPool(1) if prefetch else None
+        try:
+            data, members = self._get_members_page(uri, query_param, expand, max_workers)
+            fetched = 0
+            while True:
+                fetched += len(data.get("Members", []))
+                next_page = self._next_page(uri, query_param, data, fetched)
+                pending = None
+                if pool is not None and next_page is not None:
+                    pending = pool.apply_async(self._get_members_page, next_page + (expand, max_workers))
+                for member in members:
+                    yield member
+                if next_page is None:
+                    return
+                if pending is not None:
+                    data, members = pending.get()
+                else:
+                    data, members = self._get_members_page(next_page[0], next_page[1], expand, max_workers)
+        finally:
+            if pool is not None:
+                pool.terminate()
+                pool.join()
+
+    def get_members(self, collection_uri, member_ids=None, levels=1, max_workers=MAX_WORKERS):
+        """
+        Reads the members of the collection at I(collection_uri) with L(iter_members). When the
+        service supports C($expand=.($levels=n)), each page of the collection is fetched along
+        with its members in one request. Otherwise, and for any member the service left
+        unexpanded, the members are fetched with concurrent GETs on a thread pool of at most
+        I(max_workers) threads.
+        :arg collection_uri: URI of the collection
+        :arg member_ids: (optional) ids of the members to read, the last segments of their URIs.
+            Without $expand, only these members are fetched and the collection itself is not.
+        :arg levels: (optional) levels of navigation properties to expand
+        :arg max_workers: (optional) maximum number of concurrent GETs
+        :returns: dict of member bodies keyed by member id, without the members which do not exist
+        """
+        levels = min(levels, self.expand_levels())
+        if member_ids is not None and not levels:
+            uris = ["{0}/{1}".format(collection_uri.rstrip("/"), mid) for mid in member_ids]
+            bodies = self._get_members_concurrently(uris, max_workers)
+            return dict((mid, body) for mid, body in zip(member_ids, bodies) if body is not None)
+        members = dict((member_id(member), member) for member in
+                       self.iter_members(collection_uri, expand=True, levels=levels, max_workers=max_workers))
+        if member_ids is not None:
+            members = dict((mid, members[mid]) for mid in member_ids if mid in members)
+        return members
+
+    def open_stream(self, path, query_param=None, api_timeout=30):
+        """
+        Opens a long lived GET request, such as a Server-Sent Events stream, and returns
+        the raw response to be read incrementally. I(api_timeout) bounds each read.
+        """
+        if 'X-Auth-Token' in self._headers:
+            url_kwargs = self._args_with_session("GET", api_timeout)
+        else:
+            url_kwargs = self._args_without_session(path, "GET", api_timeout)
+        url_kwargs["headers"] = dict(url_kwargs["headers"], Accept="text/event-stream")
+        return open_url(self._build_url(path, query_param=query_param), **url_kwargs)
+
     def __enter__(self):
         """Creates sessions by passing it to header"""
         if self.req_session:
             payload = {'UserName': self.username,
                        'Password': self.password}
             path = SESSION_RESOURCE_COLLECTION["SESSION"]
-            resp = self.invoke_request('POST', path, data=payload)
+            resp = self.invoke_request('POST', path, data=payload, retry=True)
             if resp and resp.success:
                 self.session_id = resp.json_data.get("Id")
                 self._headers["X-Auth-Token"] = resp.headers.get('X-Auth-Token')
@@ -186,3 +540,144 @@ class Redfish(object):
             path = SESSION_RESOURCE_COLLECTION["SESSION_ID"].format(Id=self.session_id)
             self.invoke_request('DELETE', path)
         return False
+
+
+class TaskMonitor(object):
+    """
+    Follows the task monitor returned in the Location header of an asynchronous Redfish
+    operation within an existing Redfish session until the task reaches a terminal state.
+
+    The monitor is polled immediately and then with an interval which grows geometrically
+    from ``min_interval`` up to ``max_interval``, unless the service asks for a different
+    delay with Retry-After. Once the task completes, the task monitor may answer with the
+    response of the operation itself, possibly redirecting to the resource it created, and
+    services which remove the task monitor are polled at ``TaskService/Tasks/<id>`` instead.
+
+    With ``events``, which defaults to whether the REDFISH_TASK_EVENTS environment variable
+    is set, the monitor subscribes to the ServerSentEventUri of the EventService instead and
+    only fetches the task when an event refers to it, or when the stream stays idle for
+    ``idle_timeout`` seconds. It falls back to polling when the service does not advertise
+    a stream or the stream drops.
+    """
+
+    def __init__(self, redfish_obj, min_interval=TASK_POLL_MIN_INTERVAL, max_interval=TASK_POLL_MAX_INTERVAL,
+                 growth=TASK_POLL_GROWTH, sleep=time.sleep, events=None, idle_timeout=None):
+        self.redfish_obj = redfish_obj
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.growth = growth
+        self.sleep = sleep
+        self.events = bool(os.environ.get(TASK_EVENTS_ENV)) if events is None else events
+        self.idle_timeout = idle_timeout or max_interval
+
+    def _poll(self, uri, task_uri):
+        try:
+            return self.redfish_obj.invoke_request("GET", uri), uri
+        except HTTPError as err:
+            if err.code != 404 or uri == task_uri:
+                raise err
+        return self.redfish_obj.invoke_request("GET", task_uri), task_uri
+
+    def _refresh(self, ctx, result):
+        """Fetches the task once and records its state in I(result)"""
+        resp, ctx["uri"] = self._poll(ctx["uri"], ctx["task_uri"])
+        result["polls"] += 1
+        data = resp.json_data if resp.body else {}
+        if "TaskState" in data:
+            result.update({"state": data.get("TaskState"), "status": data.get("TaskStatus"),
+                           "percent_complete": data.get("PercentComplete"),
+                           "messages": data.get("Messages", [])})
+        else:
+            # the task monitor answered with the outcome of the completed operation
+            resource_uri = data.get("@odata.id") or urlparse(resp.url).path
+            result.update({"state": "Completed", "status": result["status"] or "OK", "percent_complete": 100,
+                           "resource_uri": resource_uri if resource_uri != ctx["uri"] else None})
+        return resp
+
+    @staticmethod
+    def _remaining(ctx):
+        return ctx["timeout"] - (time.time() - ctx["started"])
+
+    @staticmethod
+    def _is_task_event(event, task_id):
+        """Whether any record of an Event refers to the task by its origin or its message arguments"""
+        records = event.get("Events", [event]) if isinstance(event, dict) else []
+        for record in records:
+            origin = record.get("OriginOfCondition")
+            if isinstance(origin, dict):
+                origin = origin.get("@odata.id")
+            if (origin and str(origin).rstrip("/").split("/")[-1] == task_id) or \
+                    task_id in (record.get("MessageArgs") or []):
+                return True
+        return False
+
+    def _wait_polling(self, ctx, result):
+        interval = self.min_interval
+        while True:
+            resp = self._refresh(ctx, result)
+            remaining = self._remaining(ctx)
+            if result["state"] in ctx["stop_states"] or remaining <= 0:
+                return
+            self.sleep(min(parse_retry_after(resp.headers) or interval, remaining))
+            interval = min(interval * self.growth, self.max_interval)
+
+    def _wait_for_events(self, ctx, result):
+        """Returns False when the service has no event stream or the stream drops, to fall back to polling"""
+        try:
+            sse_uri = self.redfish_obj.invoke_request("GET", EVENT_SERVICE_URI).json_data.get("ServerSentEventUri")
+        except (HTTPError, URLError, SSLValidationError, ConnectionError, ValueError):
+            return False
+        if not sse_uri:
+            return False
+        while True:
+            # subscribe before fetching the task, so that no state change is missed in between
+            try:
+                read_timeout = max(min(self.idle_timeout, self._remaining(ctx)), 0.1)
+                stream = self.redfish_obj.open_stream(urlparse(sse_uri).path, api_timeout=read_timeout)
+            except (URLError, SSLValidationError, ConnectionError, socket.error, http_client.HTTPException):
+                return False
+            try:
+                self._refresh(ctx, result)
+                if result["state"] in ctx["stop_states"] or self._remaining(ctx) <= 0:
+                    return True
+                events = iter_sse_events(stream)
+                while True:
+                    try:
+                        event = next(events)
+                    except socket.timeout:
+                        break
+                    except (StopIteration, socket.error, http_client.HTTPException):
+                        return False
+                    if self._is_task_event(event, result["id"]):
+                        result["events"] += 1
+                        self._refresh(ctx, result)
+                        if result["state"] in ctx["stop_states"]:
+                            return True
+                    if self._remaining(ctx) <= 0:
+                        return True
+            finally:
+                stream.close()
+
+    def wait(self, location, timeout=TASK_WAIT_TIMEOUT, stop_states=()):
+        """
+        Waits for the task behind I(location) to reach a terminal state, or one of I(stop_states).
+        :arg location: task monitor URI, as returned in the Location header
+        :arg timeout: (optional) maximum time to wait in seconds
+        :arg stop_states: (optional) additional task states which end the wait
+        :returns: dict with the task id and URI, its last TaskState, TaskStatus, PercentComplete and
+            Messages, the URI of the resource the completed task redirected to if any, whether
+            the wait timed out and whether it was driven by events or by polling
+        """
+        uri = urlparse(location).path
+        task_id = uri.rstrip("/").split("/")[-1]
+        ctx = {"uri": uri, "task_uri": TASK_URI.format(task_id=task_id), "timeout": timeout,
+               "started": time.time(), "stop_states": TASK_TERMINAL_STATES + tuple(stop_states)}
+        result = {"id": task_id, "uri": uri, "state": None, "status": None, "percent_complete": None,
+                  "messages": [], "resource_uri": None, "polls": 0, "events": 0, "wait_mode": "polling"}
+        if self.events and self._wait_for_events(ctx, result):
+            result["wait_mode"] = "events"
+        else:
+            self._wait_polling(ctx, result)
+        result.update({"timed_out": result["state"] not in ctx["stop_states"],
+                       "elapsed_seconds": round(time.time() - ctx["started"], 1)})
+        return result
@@ -0,0 +1,117 @@
+# -*- coding: utf-8 -*-
+
+# Dell EMC OpenManage Ansible Modules
+# Version 2.0.7
+# Copyright (C) 2020 Dell Inc. or its subsidiaries. All Rights Reserved.
+
+# Redistribution and use in source and binary forms, with or without modification,
+# are permitted provided that the following conditions are met:
+
+#    * Redistributions of source code must retain the above copyright notice,
+#      this list of conditions and the following disclaimer.
+
+#    * Redistributions in binary form must reproduce the above copyright notice,
+#      this list of conditions and the following disclaimer in the documentation
+#      and/or other materials provided with the distribution.
+
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND
+# ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE DISCLAIMED.
+# IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT,
+# INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+# PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT
+# LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE
+# USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+import random
+import time
+from email.utils import parsedate_tz, mktime_tz
+from ansible.module_utils.urls import SSLValidationError
+from ansible.module_utils.six.moves.urllib.error import HTTPError
+
+RETRY_STATUS_CODES = (429, 502, 503, 504)
+IDEMPOTENT_METHODS = ("GET", "HEAD", "OPTIONS", "PUT", "DELETE")
+MAX_RETRIES = 4
+BACKOFF_FACTOR = 1
+BACKOFF_MAX = 30
+RETRY_TOTAL_TIMEOUT = 120
+
+
+def parse_retry_after(headers):
+    """
+    Seconds to wait according to the Retry-After header, which is either a number
+    of seconds or an HTTP date, or None when the header is absent or invalid.
+    """
+    value = headers.get("Retry-After") if headers is not None else None
+    if not value:
+        return None
+    value = str(value).strip()
+    if value.isdigit():
+        return int(value)
+    date = parsedate_tz(value)
+    if date is None:
+        return None
+    return max(0, mktime_tz(date) - time.time())
+
+
+class RetryPolicy(object):
+    """
+    Decides whether a failed request is sent again, and after how long.
+    Requests are retried on connection errors and on the I(status_codes) which signal
+    a transient overload, up to I(retries) times, waiting for the Retry-After of the
+    response or else for an exponential backoff with full jitter. A retry which would
+    end after I(total_timeout) seconds since the first attempt is not made.
+    Only I(methods) are retried, unless the caller forces it for a request which is
+    known to be safe to repeat.
+    """
+
+    def __init__(self, retries=MAX_RETRIES, backoff_factor=BACKOFF_FACTOR, backoff_max=BACKOFF_MAX,
+                 total_timeout=RETRY_TOTAL_TIMEOUT, status_codes=RETRY_STATUS_CODES,
+                 methods=IDEMPOTENT_METHODS, sleep=time.sleep):
+        self.retries = retries
+        self.backoff_factor = backoff_factor
+        self.backoff_max = backoff_max
+        self.total_timeout = total_timeout
+        self.status_codes = status_codes
+        self.methods = methods
+        self.sleep = sleep
+
+    def for_call(self, retry=None):
+        """
+        Resolves the per call override of I(invoke_request)
+        :arg retry: None for this policy, False to never retry, True to also retry a
+            method which is not idempotent, or another RetryPolicy
+        :returns: tuple of the policy, or None, and whether the method check is skipped
+        """
+        if retry is False:
+            return None, False
+        if isinstance(retry, RetryPolicy):
+            return retry, False
+        return self, retry is True
+
+    def backoff(self, method, err, attempt, started, force=False):
+        """
+        :arg attempt: number of retries made so far
+        :arg started: time.time() of the first attempt
+        :returns: seconds to wait before the next attempt, or None to give up
+        """
+        if attempt >= self.retries or (not force and method.upper() not in self.methods):
+            return None
+        retry_after = None
+        if isinstance(err, HTTPError):
+            if err.code not in self.status_codes:
+                return None
+            retry_after = parse_retry_after(getattr(err, "headers", None) or getattr(err, "hdrs", None))
+        elif isinstance(err, SSLValidationError):
+            return None
+        delay = retry_after
+        if delay is None:
+            delay = random.uniform(0, min(self.backoff_max, self.backoff_factor * (2 ** attempt)))
+        if time.time() - started + delay > self.total_timeout:
+            return None
+        return delay
@@ -0,0 +1,107 @@
+# -*- coding: utf-8 -*-
+
+# Dell EMC OpenManage Ansible Modules
+# Version 2.0.7
+# Copyright (C) 2020 Dell Inc. or its subsidiaries. All Rights Reserved.
+
+# Redistribution and use in source and binary forms, with or without modification,
+# are permitted provided that the following conditions are met:
+
+#    * Redistributions of source code must retain the above copyright notice,
+#      this list of conditions and the following disclaimer.
+
+#    * Redistributions in binary form must reproduce the above copyright notice,
+#      this list of conditions and the following disclaimer in the documentation
+#      and/or other materials provided with the distribution.
+
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND
+# ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE DISCLAIMED.
+# IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT,
+# INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+# PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT
+# LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE
+# USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+import binascii
+import os
+from ansible.module_utils._text import to_bytes, to_text
+
+
+class StreamingBody(object):
+    """
+    File-like request body which reads its parts, byte strings and files opened in binary
+    mode, one chunk at a time as the request is sent, so that large files are uploaded
+    without holding them in memory. Its length, which is sent as Content-Length, is known
+    up front from the sizes of the files.
+    I(progress), when given, is called with the number of bytes read so far and the length.
+    """
+
+    def __init__(self, parts, progress=None):
+        self._parts = list(parts)
+        self._positions = [part.tell() if hasattr(part, "read") else None for part in self._parts]
+        self._index = 0
+        self._offset = 0
+        self.progress = progress
+        self.sent = 0
+        self.length = sum(self._part_length(part) for part in self._parts)
+
+    @staticmethod
+    def _part_length(part):
+        if hasattr(part, "read"):
+            return os.fstat(part.fileno()).st_size - part.tell()
+        return len(part)
+
+    def __len__(self):
+        return self.length
+
+    def read(self, size=-1):
+        wanted = size if size is not None and size >= 0 else self.length - self.sent
+        chunks = []
+        while wanted > 0 and self._index < len(self._parts):
+            part = self._parts[self._index]
+            if hasattr(part, "read"):
+                chunk = part.read(wanted)
+            else:
+                chunk = part[self._offset:self._offset + wanted]
+                self._offset += len(chunk)
+            if not chunk:
+                self._index, self._offset = self._index + 1, 0
+                continue
+            chunks.append(chunk)
+            wanted -= len(chunk)
+        data = b"".join(chunks)
+        self.sent += len(data)
+        if self.progress is not None and data:
+            self.progress(self.sent, self.length)
+        return data
+
+    def rewind(self):
+        """Starts reading the body over, to send it again"""
+        for part, position in zip(self._parts, self._positions):
+            if position is not None:
+                part.seek(position)
+        self._index, self._offset, self.sent = 0, 0, 0
+
+
+def multipart_file_body(file_obj, file_name, field_name="file", content_type="application/octet-stream",
+                        boundary=None, progress=None):
+    """
+    Builds a multipart/form-data body with a single file field, which streams the file.
+    :arg file_obj: file opened in binary mode
+    :arg file_name: file name sent in the Content-Disposition of the field
+    :returns: tuple of the StreamingBody and the Content-Type header of the request
+    """
+    boundary = to_bytes(boundary or binascii.hexlify(os.urandom(16)))
+    head = b"".join([b"--", boundary, b"\r\n",
+                     b'Content-Disposition: form-data; name="', to_bytes(field_name),
+                     b'"; filename="', to_bytes(file_name), b'"\r\n',
+                     b"Content-Type: ", to_bytes(content_type), b"\r\n\r\n"])
+    tail = b"".join([b"\r\n--", boundary, b"--\r\n"])
+    content_type = "multipart/form-data; boundary={0}".format(to_text(boundary))
+    return StreamingBody([head, file_obj, tail], progress=progress), content_type